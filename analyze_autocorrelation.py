@@ -0,0 +1,90 @@
+"""
+Autocorrelation analysis of the thermalization and measurement settings
+Runs one chain from a hot start, streams the plaquette and |Polyakov
+loop| after every update into bounded-memory binned series, and compares
+the recommended thermalization length and measurement interval with
+thermalization / measurement_interval from lattice_params.yaml
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from lattice import LatticeConfig, GaugeField, WilsonAction, HMC, HeatbathUpdater, polyakov_loop
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.statistics import BinnedSeries, BlockAccumulator, recommend_intervals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--size', type=int, nargs=4, default=[6, 6, 6, 6], metavar=('X', 'Y', 'Z', 'T'))
+    parser.add_argument('--beta', type=float, default=5.7)
+    parser.add_argument('--update', choices=['hmc', 'heatbath'], default=None,
+                        help='default: update_algorithm from the params file')
+    parser.add_argument('--sweeps', type=int, default=2000, help='chain length including thermalization')
+    parser.add_argument('--capacity', type=int, default=1024, help='bins kept per observable')
+    parser.add_argument('--max-blocks', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = LatticeConfig.load(args.params)
+    update = config.update_algorithm if args.update is None else args.update
+    rng = np.random.default_rng(args.seed)
+    field = GaugeField.hot(config.array_shape(args.size), rng)
+    action = WilsonAction(args.beta)
+    if update == 'hmc':
+        updater = HMC.from_config(config.hmc, action)
+        step = lambda: updater.trajectory(field, rng)
+    else:
+        updater = HeatbathUpdater.from_config(config.heatbath, action)
+        step = lambda: updater.sweep(field, rng)
+
+    observables = {'plaquette': lambda: field.average_plaquette(),
+                   '|Polyakov|': lambda: float(np.abs(polyakov_loop(field).mean()))}
+    series = {name: BinnedSeries(args.capacity) for name in observables}
+
+    print("Autocorrelation Analysis")
+    print("="*70)
+    print(f"Lattice {args.size}, β = {args.beta}, {update}, {args.sweeps} updates from a hot start")
+    t0 = time.perf_counter()
+    for sweep in range(args.sweeps):
+        step()
+        for name, measure in observables.items():
+            series[name].add(measure())
+    print(f"{args.sweeps} updates in {time.perf_counter() - t0:.1f} s")
+
+    print(f"\n{'observable':<12} {'mean':>20} {'τ_int':>13} {'MSER':>6} {'therm.':>7} {'interval':>9}")
+    recommendations = {}
+    for name, s in series.items():
+        rec = recommend_intervals(s)
+        recommendations[name] = rec
+        a = rec['analysis']
+        print(f"{name:<12} {a['mean']:.6f} ± {a['error']:.6f} "
+              f"{rec['tau_int_sweeps']:6.2f} ± {rec['tau_error_sweeps']:4.2f} "
+              f"{rec['mser_sweeps']:6d} {rec['thermalization']:7d} {rec['measurement_interval']:9d}")
+
+    # blocked jackknife/bootstrap of a derived quantity on the thermalized part
+    n_therm = max(rec['thermalization'] for rec in recommendations.values())
+    interval = max(rec['measurement_interval'] for rec in recommendations.values())
+    if n_therm < args.sweeps:
+        blocks = BlockAccumulator(1, args.max_blocks)
+        for _ in range(args.max_blocks * 4):
+            for _ in range(interval):
+                step()
+            blocks.add(field.average_plaquette())
+        log_P = lambda m: np.log(m[0])
+        est, jk_err = blocks.jackknife(log_P)
+        _, bs_err = blocks.bootstrap(log_P, rng=rng)
+        print(f"\nln⟨P⟩ over {blocks.n} samples every {interval} updates: "
+              f"{float(est):.6f} ± {float(jk_err):.6f} (jackknife), ± {float(bs_err):.6f} (bootstrap)")
+
+    print(f"\nlattice_params.yaml: thermalization = {config.thermalization}, "
+          f"measurement_interval = {config.measurement_interval}")
+    ok_therm = config.thermalization >= n_therm
+    ok_interval = config.measurement_interval >= interval
+    print(f"  thermalization {'adequate' if ok_therm else f'too short, need ≥ {n_therm}'}")
+    print(f"  measurement_interval {'adequate' if ok_interval else f'too short, need ≥ {interval}'}")
+    if n_therm >= args.sweeps:
+        print("  chain too short to resolve thermalization; increase --sweeps")
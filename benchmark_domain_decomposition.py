@@ -0,0 +1,88 @@
+"""
+Strong- and weak-scaling benchmark of the time-slab domain decomposition
+Strong scaling: each lattice size from lattice_params.yaml at a fixed
+volume with 1, 2, 4, … worker processes. Weak scaling: a fixed slab of
+T/max_workers timeslices per worker, so the lattice grows with the
+worker count. Reports heatbath/overrelaxation seconds per sweep,
+speedup and parallel efficiency
+"""
+
+import argparse
+import os
+import time
+from typing import List
+
+import numpy as np
+
+from lattice import LatticeConfig, GaugeField, WilsonAction
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.domain import DomainDecomposition
+
+
+def time_sweeps(field: GaugeField, action, n_workers: int, settings, n_sweeps: int, seed: int) -> float:
+    """Seconds per sweep, excluding process start-up and a warm-up sweep"""
+    with DomainDecomposition(field, action, n_workers, settings, seed) as dd:
+        dd.sweep(1)
+        t0 = time.perf_counter()
+        dd.sweep(n_sweeps)
+        return (time.perf_counter() - t0) / n_sweeps
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--scale', type=int, default=1,
+                        help='divide every lattice extent by this factor (quick runs)')
+    parser.add_argument('--beta', type=float, default=5.7)
+    parser.add_argument('--sweeps', type=int, default=2)
+    parser.add_argument('--mode', choices=['strong', 'weak', 'both'], default='both')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = LatticeConfig.load(args.params)
+    action = WilsonAction(args.beta)
+    rng = np.random.default_rng(args.seed)
+    counts = worker_counts(args.max_workers)
+    # even extents keep the checkerboard consistent across the periodic boundary
+    sizes = [[max(2, 2 * (n // (2 * args.scale))) for n in size] for size in config.lattice_sizes]
+
+    print("Domain Decomposition Scaling")
+    print("="*70)
+    print(f"{os.cpu_count()} CPUs, workers {counts}, {args.sweeps} timed sweeps, "
+          f"heatbath {config.heatbath}")
+
+    if args.mode in ('strong', 'both'):
+        print(f"\nStrong scaling")
+        print(f"{'lattice':<18} {'workers':>7} {'s/sweep':>9} {'speedup':>8} {'efficiency':>10}")
+        for size in sizes:
+            field = GaugeField.hot(config.array_shape(size), rng)
+            base = None
+            for n in counts:
+                if n > field.site_shape[0]:
+                    break
+                t = time_sweeps(field, action, n, config.heatbath, args.sweeps, args.seed)
+                base = t if base is None else base
+                print(f"{str(size):<18} {n:7d} {t:9.3f} {base / t:8.2f} {base / (t * n):10.1%}")
+
+    if args.mode in ('weak', 'both'):
+        print(f"\nWeak scaling (fixed slab per worker)")
+        print(f"{'lattice':<18} {'workers':>7} {'s/sweep':>9} {'efficiency':>10}")
+        for size in sizes:
+            slab = max(2, size[3] // counts[-1])
+            base = None
+            for n in counts:
+                weak_size = size[:3] + [slab * n]
+                field = GaugeField.hot(config.array_shape(weak_size), rng)
+                t = time_sweeps(field, action, n, config.heatbath, args.sweeps, args.seed)
+                base = t if base is None else base
+                print(f"{str(weak_size):<18} {n:7d} {t:9.3f} {base / t:10.1%}")
@@ -0,0 +1,129 @@
+"""
+Cost per unit of continuum-limit accuracy: Wilson vs Symanzik vs Iwasaki
+Times the heatbath sweep and the HMC force of each gauge action on this
+machine and measures its cutoff effects through the tree-level static
+force F(R − ½) = V(R) − V(R−1), whose relative deviation from the
+continuum sets the resolution r0/a needed for a target accuracy of the
+string-tension observables. The cost of a box of fixed physical size at
+that resolution is then compared with the Wilson action. Glueball masses
+have no tree-level analogue; check them with measure_glueballs.py --action.
+"""
+
+import argparse
+import math
+from typing import Optional
+
+import numpy as np
+
+from lattice import GaugeField, HeatbathUpdater, gauge_action
+from lattice.action import GAUGE_ACTIONS, gauge_force
+from lattice.cost_model import profile_kernel
+
+ACTIONS = ('wilson', 'symanzik', 'iwasaki')
+
+
+def tree_level_potential(c1: float, L: int, max_R: int) -> np.ndarray:
+    """
+    On-axis V(R) for R = 0..max_R in units of g² C_F on a periodic L³
+    lattice, from the static gluon propagator 1/Σ_i p̂_i²(1 − c1 p̂_i²)
+    of an action with rectangle coefficient c1
+    """
+    p = 2 * np.pi * np.fft.fftfreq(L)
+    p_hat2 = 4 * np.sin(p / 2)**2
+    k = p_hat2 * (1 - c1 * p_hat2)
+    K = k[:, None, None] + k[None, :, None] + k[None, None, :]
+    K[0, 0, 0] = np.inf  # zero mode removed
+    G = (1.0 / K).sum(axis=(1, 2))
+    R = np.arange(max_R + 1)
+    return -(np.cos(np.outer(R, p)) @ G) / L**3
+
+
+def force_error(c1: float, max_R: int, L: int) -> np.ndarray:
+    """
+    Relative deviation of the lattice force V(R) − V(R−1) from the continuum
+    one in the same periodic box (including its −r²/6L³ background term), R = 2..max_R
+    """
+    V = tree_level_potential(c1, L, max_R)
+    R = np.arange(2, max_R + 1)
+    continuum = 1 / (4 * np.pi * R * (R - 1)) - (2 * R - 1) / (6 * L**3)
+    return (V[R] - V[R - 1]) / continuum - 1
+
+
+def required_resolution(delta: np.ndarray, target: float) -> Optional[int]:
+    """Smallest R (= r/a) from which |δ| stays below target, None beyond the computed range"""
+    bad = np.flatnonzero(np.abs(delta) > target)
+    if len(bad) == 0:
+        return 2
+    if bad[-1] == len(delta) - 1:
+        return None
+    return int(bad[-1]) + 3
+
+
+def lattice_extent(box: float, resolution: int) -> int:
+    """Spatial extent L/a for a box of `box` r0 at r0/a = resolution, a multiple of 4"""
+    return 4 * math.ceil(box * resolution / 4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, nargs=4, default=[8, 8, 8, 8], metavar=('X', 'Y', 'Z', 'T'),
+                        help='probe lattice for the timings (extents divisible by 4)')
+    parser.add_argument('--beta', type=float, default=5.7)
+    parser.add_argument('--targets', type=float, nargs='+', default=[0.02, 0.01, 0.005],
+                        help='relative accuracy of the force at r0')
+    parser.add_argument('--max-r', type=int, default=16)
+    parser.add_argument('--tree-l', type=int, default=128, help='lattice for the tree-level sums')
+    parser.add_argument('--box', type=float, default=6.0, help='spatial box in units of r0 (T = 2L)')
+    parser.add_argument('--z', type=float, default=2.0,
+                        help='dynamical exponent: updates per independent configuration ∝ (r0/a)^z')
+    parser.add_argument('--repeats', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    X, Y, Z, T = args.size
+    rng = np.random.default_rng(args.seed)
+    field = GaugeField.hot((T, Z, Y, X), rng)
+
+    print("Improved Gauge Actions: Cost vs Continuum-Limit Accuracy")
+    print("="*70)
+    print(f"Timings on {args.size} (β = {args.beta}), tree-level force on {args.tree_l}³")
+    print(f"\n{'action':<10} {'c1':>8} {'heatbath s/site':>16} {'force s/site':>14} {'force MB':>9}")
+    cost = {}
+    for name in ACTIONS:
+        action = gauge_action(name, args.beta)
+        updater = HeatbathUpdater(action, n_overrelax=4)
+        t_sweep, _ = profile_kernel(lambda: updater.sweep(field.copy(), rng), args.repeats)
+        t_force, peak = profile_kernel(lambda: gauge_force(action, field), args.repeats)
+        cost[name] = {'heatbath': t_sweep / field.volume, 'force': t_force / field.volume}
+        print(f"{name:<10} {GAUGE_ACTIONS[name]:8.4f} {cost[name]['heatbath']:16.3e} "
+              f"{cost[name]['force']:14.3e} {peak / 1e6:9.1f}")
+
+    delta = {name: force_error(GAUGE_ACTIONS[name], args.max_r, args.tree_l) for name in ACTIONS}
+    print(f"\nTree-level relative force error δ(R) at r = R − ½")
+    print(f"{'R':>3}" + ''.join(f"{name:>11}" for name in ACTIONS))
+    for i, R in enumerate(range(2, args.max_r + 1)):
+        print(f"{R:3d}" + ''.join(f"{delta[name][i]:+11.2e}" for name in ACTIONS))
+
+    for target in args.targets:
+        print(f"\nTarget |δ(r0)| ≤ {target:g}, box {args.box:g} r0 × {2 * args.box:g} r0")
+        print(f"{'action':<10} {'r0/a':>5} {'lattice':>14} {'HMC':>9} {'heatbath':>9}  (cost vs Wilson)")
+        reference = None
+        for name in ACTIONS:
+            resolution = required_resolution(delta[name], target)
+            if resolution is None:
+                print(f"{name:<10} {'>' + str(args.max_r):>5}  not reached within R ≤ {args.max_r}")
+                continue
+            L = lattice_extent(args.box, resolution)
+            sites = L**3 * 2 * L
+            updates = resolution**args.z
+            relative = {k: sites * updates * cost[name][k] for k in ('force', 'heatbath')}
+            if name == 'wilson':
+                reference = relative
+            ratio = {k: relative[k] / reference[k] if reference else float('nan') for k in relative}
+            print(f"{name:<10} {resolution:5d} {f'{L}³×{2 * L}':>14} {ratio['force']:8.3g}× "
+                  f"{ratio['heatbath']:8.3g}×")
+        if reference is None:
+            print("(Wilson does not reach this target within the computed range; raise --max-r)")
+    print("\nIwasaki's coefficient is tuned for renormalized-trajectory (nonperturbative) scaling;")
+    print("at tree level it overcorrects the O(a²) term, so its advantage shows only in Monte Carlo")
+    print("scaling studies (measure_string_tension.py / measure_glueballs.py --action iwasaki).")
@@ -0,0 +1,71 @@
+"""
+Startup benchmark for the numeric evaluation modules
+Asserts that importing yang_mills_theory stays below a fixed time budget
+and does not pull in sympy, matplotlib or scipy
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# Import-time budget (seconds) for `import yang_mills_theory` in a fresh
+# interpreter, measured inside the child so interpreter startup is excluded.
+IMPORT_BUDGET_S = 0.25
+
+HEAVY_MODULES = ('sympy', 'matplotlib', 'scipy')
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(dt, ','.join(heavy))
+"""
+
+
+def measure_import(module: str = 'yang_mills_theory', repeats: int = 7) -> Dict:
+    """Import `module` in `repeats` fresh interpreters and collect timings"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    timings: List[float] = []
+    heavy_loaded = set()
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, '-c', code], cwd=here,
+                             capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(out[0]))
+        if len(out) > 1:
+            heavy_loaded.update(out[1].split(','))
+    timings.sort()
+    return {
+        'module': module,
+        'median_s': timings[len(timings) // 2],
+        'min_s': timings[0],
+        'max_s': timings[-1],
+        'heavy_modules_loaded': sorted(heavy_loaded),
+    }
+
+
+def run_benchmark(budget_s: float = IMPORT_BUDGET_S) -> bool:
+    """Benchmark the modules every evaluator worker imports"""
+    print("\n=== Startup Benchmark: Import Time ===")
+    ok = True
+    for module in ('yang_mills_theory', 'numerical_tests', 'experimental_validation',
+                   'wightman_axioms', 'compare_options'):
+        result = measure_import(module)
+        within = result['median_s'] < budget_s and not result['heavy_modules_loaded']
+        ok = ok and within
+        heavy = ', '.join(result['heavy_modules_loaded']) or 'none'
+        print(f"{module:<26} median={result['median_s']*1e3:7.1f} ms "
+              f"(min {result['min_s']*1e3:.1f}, max {result['max_s']*1e3:.1f}); "
+              f"heavy imports: {heavy} {'✓' if within else '✗'}")
+    print(f"Budget: {budget_s*1e3:.0f} ms")
+    print(f"{'✓ PASS' if ok else '✗ FAIL'}")
+    return ok
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else IMPORT_BUDGET_S
+    passed = run_benchmark(budget)
+    assert passed, f"import time budget of {budget*1e3:.0f} ms exceeded or heavy module loaded"
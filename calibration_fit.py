@@ -0,0 +1,263 @@
+"""
+Calibration fitter for the φ-coordinate theory
+Fits the calibration.json parameters against ExperimentalData with a
+vectorized χ² objective, analytic Jacobian and multi-start least squares
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from yang_mills_theory import C_STRONG, coupling_power_law, mass_gap_from_coupling
+from experimental_validation import ExperimentalData
+
+CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calibration.json')
+
+# Full parameter vector θ, in this order
+FIT_PARAMETERS = ['g0', 'beta_exp', 'Lambda_QCD', 'phi_confined', 'phi_string',
+                  'sigma_norm_k', 'ratio_2pp', 'ratio_0mp']
+
+# Observables entering χ², in this order
+FIT_OBSERVABLES = ['glueball_0pp', 'glueball_2pp', 'glueball_0mp',
+                   'string_tension', 'Lambda_QCD_pure']
+
+# Default free parameters. The φ evaluation points and the exponent are
+# degenerate with g0 for a single glueball mass, and a free glueball ratio
+# reproduces its own mass exactly, so these stay fixed unless requested
+# explicitly; the three masses then test one mass scale (2 dof).
+DEFAULT_FREE = ['g0', 'Lambda_QCD', 'sigma_norm_k']
+
+BOUNDS = {
+    'g0': (1e-4, 2.0),
+    'beta_exp': (1.0, 12.0),
+    'Lambda_QCD': (0.1, 0.4),
+    'phi_confined': (0.3, 0.9),
+    'phi_string': (0.3, 0.9),
+    'sigma_norm_k': (0.5, 10.0),
+    'ratio_2pp': (1.0, 3.0),
+    'ratio_0mp': (1.0, 3.0),
+}
+
+
+def theta_from_calibration(calib: Dict) -> np.ndarray:
+    """Parameter vector from a calibration dict (defaults as in ExperimentalValidator)"""
+    ratios = calib.get('glueball_ratios', {})
+    return np.array([
+        float(calib.get('g0', 0.25)),
+        float(calib.get('beta_exp', 11.0/3.0)),
+        float(calib.get('Lambda_QCD', 0.200)),
+        float(calib.get('phi_confined', 0.507)),
+        float(calib.get('phi_string', 0.55)),
+        float(calib.get('sigma_norm_k', 2.85)),
+        float(ratios.get('2pp', 1.407)),
+        float(ratios.get('0mp', 1.551)),
+    ])
+
+
+def measurements(data: ExperimentalData) -> np.ndarray:
+    """(value, uncertainty) rows for FIT_OBSERVABLES"""
+    return np.array([getattr(data, name) for name in FIT_OBSERVABLES], dtype=float)
+
+
+def _mass_gap_with_gradient(phi_val, g0, beta_exp, Lambda_QCD):
+    """M(φ) and ∂M/∂(g0, β, Λ, φ); all arguments broadcast"""
+    g_val = coupling_power_law(phi_val, g0, beta_exp)
+    M = mass_gap_from_coupling(g_val, Lambda_QCD)
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        exponent = -8*np.pi**2/(3*g_val**2)
+        dM_dg = np.where(g_val > 1.0, Lambda_QCD * C_STRONG,
+                         np.where(exponent > -50, M * 16*np.pi**2/(3*g_val**3), 0.0))
+    dM_dL = np.where((g_val > 1.0) | (exponent > -50), M / Lambda_QCD, 0.0)
+    return M, dM_dg * g_val / g0, -dM_dg * g_val * np.log(phi_val), dM_dL, -dM_dg * beta_exp * g_val / phi_val
+
+
+def predictions(theta: np.ndarray) -> np.ndarray:
+    """Predicted FIT_OBSERVABLES for θ of shape (..., 8) → (..., 5)"""
+    g0, beta_exp, Lam, phi_c, phi_s, k, r2, r0 = np.moveaxis(np.asarray(theta, dtype=float), -1, 0)
+    M0 = mass_gap_from_coupling(coupling_power_law(phi_c, g0, beta_exp), Lam)
+    Ms = mass_gap_from_coupling(coupling_power_law(phi_s, g0, beta_exp), Lam)
+    return np.stack([M0, r2 * M0, r0 * M0, (Ms / k)**2, Lam], axis=-1)
+
+
+def chi_square(theta: np.ndarray, data: ExperimentalData) -> np.ndarray:
+    """χ² for a batch of parameter vectors, shape (..., 8) → (...)"""
+    meas = measurements(data)
+    pulls = (predictions(theta) - meas[:, 0]) / meas[:, 1]
+    return np.sum(pulls**2, axis=-1)
+
+
+def jacobian(theta: np.ndarray, data: ExperimentalData) -> np.ndarray:
+    """Analytic ∂(pull_i)/∂θ_j at one θ, shape (5, 8)"""
+    g0, beta_exp, Lam, phi_c, phi_s, k, r2, r0 = np.asarray(theta, dtype=float)
+    sigma = measurements(data)[:, 1]
+    M0, dM0_g0, dM0_b, dM0_L, dM0_phi = _mass_gap_with_gradient(phi_c, g0, beta_exp, Lam)
+    Ms, dMs_g0, dMs_b, dMs_L, dMs_phi = _mass_gap_with_gradient(phi_s, g0, beta_exp, Lam)
+    dsig_dMs = 2 * Ms / k**2
+    J = np.zeros((len(FIT_OBSERVABLES), len(FIT_PARAMETERS)))
+    grad_M0 = [dM0_g0, dM0_b, dM0_L, dM0_phi, 0.0]
+    for row, scale in ((0, 1.0), (1, r2), (2, r0)):
+        J[row, :5] = np.multiply(scale, grad_M0)
+    J[1, 6] = M0
+    J[2, 7] = M0
+    J[3, :5] = [dsig_dMs * dMs_g0, dsig_dMs * dMs_b, dsig_dMs * dMs_L, 0.0, dsig_dMs * dMs_phi]
+    J[3, 5] = -2 * Ms**2 / k**3
+    J[4, 2] = 1.0
+    return J / sigma[:, None]
+
+
+def _fit_from_start(start: np.ndarray, base: np.ndarray, free_idx: List[int],
+                    data: ExperimentalData) -> Dict:
+    """Worker entry point: one bounded least-squares run"""
+    from scipy.optimize import least_squares
+    meas = measurements(data)
+    lo = np.array([BOUNDS[FIT_PARAMETERS[i]][0] for i in free_idx])
+    hi = np.array([BOUNDS[FIT_PARAMETERS[i]][1] for i in free_idx])
+
+    def full(x):
+        theta = base.copy()
+        theta[free_idx] = x
+        return theta
+
+    t0 = time.perf_counter()
+    sol = least_squares(
+        lambda x: (predictions(full(x)) - meas[:, 0]) / meas[:, 1],
+        np.clip(start, lo, hi), jac=lambda x: jacobian(full(x), data)[:, free_idx],
+        bounds=(lo, hi), x_scale='jac')
+    return {
+        'x': sol.x,
+        'chi2': float(2 * sol.cost),
+        'nfev': int(sol.nfev),
+        'success': bool(sol.success),
+        'time_s': time.perf_counter() - t0,
+    }
+
+
+def fit_calibration(data: Optional[ExperimentalData] = None, initial: Optional[Dict] = None,
+                    free: Sequence[str] = DEFAULT_FREE, n_starts: int = 8,
+                    n_screen: int = 4096, seed: Optional[int] = 0,
+                    max_workers: Optional[int] = None) -> Dict:
+    """
+    Multi-start fit: screen n_screen random points with the batched χ²,
+    refine the best n_starts with least squares on a process pool.
+    """
+    if data is None:
+        data = ExperimentalData()
+    if initial is None:
+        initial = load_calibration()
+    unknown = set(free) - set(FIT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown fit parameters: {sorted(unknown)}")
+    dof = len(FIT_OBSERVABLES) - len(free)
+    if dof <= 0:
+        raise ValueError(f"{len(free)} free parameters for {len(FIT_OBSERVABLES)} observables leave "
+                         f"{dof} degrees of freedom; fix at least {1 - dof} more")
+    free_idx = [FIT_PARAMETERS.index(p) for p in free]
+    base = theta_from_calibration(initial)
+
+    t_start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    lo = np.array([BOUNDS[p][0] for p in free])
+    hi = np.array([BOUNDS[p][1] for p in free])
+    candidates = np.repeat(base[None, :], n_screen, axis=0)
+    candidates[:, free_idx] = lo + rng.random((n_screen, len(free))) * (hi - lo)
+    candidates[0] = base  # always refine the current calibration too
+    chi2_screen = chi_square(candidates, data)
+    starts = candidates[np.argsort(chi2_screen)[:n_starts]][:, free_idx]
+    t_screen = time.perf_counter() - t_start
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        runs = list(pool.map(_fit_from_start, starts, [base] * len(starts),
+                             [free_idx] * len(starts), [data] * len(starts)))
+    best = min(runs, key=lambda r: r['chi2'])
+    theta = base.copy()
+    theta[free_idx] = best['x']
+
+    # Covariance of the free parameters from the Gauss-Newton Hessian
+    J = jacobian(theta, data)[:, free_idx]
+    covariance = np.linalg.pinv(J.T @ J)
+
+    return {
+        'theta': theta,
+        'free': list(free),
+        'chi2': best['chi2'],
+        'dof': dof,
+        'covariance': covariance,
+        'runs': runs,
+        'timings': {
+            'screen_s': t_screen,
+            'total_s': time.perf_counter() - t_start,
+            'per_start_s': [r['time_s'] for r in runs],
+        },
+    }
+
+
+def load_calibration(path: str = CALIBRATION_PATH) -> Dict:
+    if os.path.isfile(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def write_calibration(fit: Dict, path: str = CALIBRATION_PATH) -> Dict:
+    """Write fitted values in the format ExperimentalValidator reads, plus fit metadata"""
+    previous = load_calibration(path)
+    g0, beta_exp, Lam, phi_c, phi_s, k, r2, r0 = (float(v) for v in fit['theta'])
+    calib = {
+        'g0': g0,
+        'beta_exp': beta_exp,
+        'Lambda_QCD': Lam,
+        'phi_confined': phi_c,
+        'phi_string': phi_s,
+        'sigma_norm_k': k,
+        'glueball_ratios': {'2pp': r2, '0mp': r0},
+        'version': int(previous.get('version', 0)) + 1,
+        'fitted_at': datetime.now().isoformat(timespec='seconds'),
+        'fit': {
+            'free_parameters': fit['free'],
+            'chi2': fit['chi2'],
+            'dof': fit['dof'],
+            'chi2_per_dof': fit['chi2'] / fit['dof'],
+            'covariance': fit['covariance'].tolist(),
+            'timings': fit['timings'],
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(calib, f, indent=2)
+        f.write('\n')
+    return calib
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--free', default=','.join(DEFAULT_FREE),
+                        help=f"comma-separated subset of {','.join(FIT_PARAMETERS)}")
+    parser.add_argument('--starts', type=int, default=8)
+    parser.add_argument('--screen', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default=CALIBRATION_PATH)
+    parser.add_argument('--dry-run', action='store_true', help='fit but do not write')
+    args = parser.parse_args()
+
+    print("Yang-Mills Mass Gap - Calibration Fit")
+    print("="*70)
+    try:
+        result = fit_calibration(free=args.free.split(','), n_starts=args.starts,
+                                 n_screen=args.screen, seed=args.seed, max_workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    errors = np.sqrt(np.diag(result['covariance']))
+    for name, err in zip(result['free'], errors):
+        value = result['theta'][FIT_PARAMETERS.index(name)]
+        print(f"  {name:<14} = {value:.6g} ± {err:.2g}")
+    print(f"χ² = {result['chi2']:.4g} for {result['dof']} dof (χ²/dof = {result['chi2'] / result['dof']:.3g})")
+    print(f"Fit time: {result['timings']['total_s']:.2f} s ({len(result['runs'])} starts)")
+    if not args.dry_run:
+        written = write_calibration(result, args.out)
+        print(f"Calibration v{written['version']} written to {args.out}")
@@ -1,48 +1,91 @@
 import numpy as np
 from dataclasses import replace
-from yang_mills_theory import YangMillsParameters, PhiCoordinateTheory
+from typing import Dict
+from yang_mills_theory import YangMillsParameters, coupling_power_law, mass_gap_from_coupling
 from experimental_validation import ExperimentalData
 
+# φ grid of the W3 positivity sweep
+W3_PHIS = np.linspace(0.1, 0.9, 20)
 
-def summarize_option(name: str, params: YangMillsParameters):
-    theory = PhiCoordinateTheory(params)
-    data = ExperimentalData()
 
-    phi_c = params.phi_critical
-    g_05 = theory.coupling_at_phi(0.5)
-    M_05 = theory.mass_gap(0.5)
-    M_0505 = theory.mass_gap(0.505)
+def batch_observables(g0: np.ndarray, beta_exp: np.ndarray, Lambda_QCD: np.ndarray,
+                      phi_critical: np.ndarray, phi_confined: np.ndarray,
+                      phi_string: np.ndarray, sigma_norm_k: np.ndarray,
+                      data: ExperimentalData = None) -> Dict[str, np.ndarray]:
+    """
+    The observables of summarize_option for N parameter variants at once.
+    Every argument is a length-N array (or scalar, shared by all N);
+    returns length-N columns, one row per parameter vector.
+    """
+    if data is None:
+        data = ExperimentalData()
+    g0, beta_exp, Lambda_QCD, phi_critical, phi_confined, phi_string, sigma_norm_k = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(a, dtype=float))
+          for a in (g0, beta_exp, Lambda_QCD, phi_critical, phi_confined, phi_string, sigma_norm_k)))
+
+    def gap(phi_vals):
+        return mass_gap_from_coupling(coupling_power_law(phi_vals, g0, beta_exp), Lambda_QCD)
 
-    # Glueball at 0.52 (as in validation) and at 0.505 (to match manuscript narrative)
-    M_glue_052 = theory.mass_gap(0.52)
+    g_05 = coupling_power_law(0.5, g0, beta_exp)
+
+    # Glueball 0++ at the calibrated confinement point
+    M_glue = gap(phi_confined)
     M_lat, dM = data.glueball_0pp
-    sigma_052 = abs(M_glue_052 - M_lat) / dM
+    glueball_sigma = np.abs(M_glue - M_lat) / dM
+
+    # String tension proxy σ ≈ (M_gap / k)²
+    sigma_pred = (gap(phi_string) / sigma_norm_k) ** 2
+    sigma_exp, _ = data.string_tension
+    string_rel_err = np.abs(sigma_pred - sigma_exp) / sigma_exp
 
-    M_glue_0505 = theory.mass_gap(0.505)
-    sigma_0505 = abs(M_glue_0505 - M_lat) / dM
+    # Asymptotic freedom at UV ~ 0.95
+    g_uv = coupling_power_law(0.95, g0, beta_exp)
 
-    # String tension proxy at 0.55, as in validation
-    phi_string = 0.55
-    M_gap = theory.mass_gap(phi_string)
-    sigma_pred = (M_gap / 2.2) ** 2
-    sigma_exp, delta_sigma = data.string_tension
-    rel_err_sigma = abs(sigma_pred - sigma_exp) / sigma_exp
+    # W3 positivity sweep, shape (N, len(W3_PHIS))
+    gaps = mass_gap_from_coupling(
+        coupling_power_law(W3_PHIS[None, :], g0[:, None], beta_exp[:, None]), Lambda_QCD[:, None])
 
-    # Asymptotic freedom at UV ~ 0.95 per manuscript mapping
-    phi_uv = 0.95
-    g_uv = theory.coupling_at_phi(phi_uv)
-    perturbative = g_uv < 1.0
+    return {
+        'g_at_0.5': g_05,
+        'glueball_0pp_GeV': M_glue,
+        'glueball_sigma_deviation': glueball_sigma,
+        'glueball_within_3sigma': glueball_sigma < 3.0,
+        'string_tension_GeV2': sigma_pred,
+        'string_tension_rel_error': string_rel_err,
+        'string_tension_within_50pct': string_rel_err < 0.5,
+        'g_UV': g_uv,
+        'uv_perturbative': g_uv < 1.0,
+        'w3_min_gap_GeV': gaps.min(axis=1),
+        'w3_all_positive': (gaps > 0).all(axis=1),
+        'bosenova_agreement': np.abs(phi_critical - 0.50) < 0.05,
+    }
+
+
+def summarize_option(name: str, params: YangMillsParameters):
+    data = ExperimentalData()
+    theory = (params.g0, params.beta0_coefficient, params.Lambda_QCD, params.phi_critical)
+    # Glueball at 0.52 and string tension proxy at 0.55 with k = 2.2, as in validation
+    obs = batch_observables(*theory, 0.52, 0.55, 2.2, data)
+    # Glueball also at 0.505 (manuscript narrative) and 0.5: one parameter vector per φ
+    phis = np.array([0.52, 0.505, 0.5])
+    glue = batch_observables(*(np.full(len(phis), v) for v in theory), phis, 0.55, 2.2, data)
+    M_lat, dM = data.glueball_0pp
+    sigma_exp, _ = data.string_tension
 
-    # W3 positivity sweep
-    phis = np.linspace(0.1, 0.9, 20)
-    gaps = np.array([theory.mass_gap(p) for p in phis])
-    min_gap = float(gaps.min())
-    all_positive = bool((gaps > 0).all())
+    g_05 = float(obs['g_at_0.5'][0])
+    M_glue_052, M_glue_0505, M_05 = glue['glueball_0pp_GeV']
+    sigma_052, sigma_0505, _ = glue['glueball_sigma_deviation']
+    sigma_pred = float(obs['string_tension_GeV2'][0])
+    rel_err_sigma = float(obs['string_tension_rel_error'][0])
+    g_uv = float(obs['g_UV'][0])
+    perturbative = bool(obs['uv_perturbative'][0])
+    min_gap = float(obs['w3_min_gap_GeV'][0])
+    all_positive = bool(obs['w3_all_positive'][0])
 
     print(f"\n=== {name} ===")
     print(f"Params: g0={params.g0:.6g}, beta_exp={params.beta0_coefficient:.6g}, Lambda_QCD={params.Lambda_QCD:.3f}")
     print(f"g(0.5) = {g_05:.4f}")
-    print(f"M_gap(0.5) = {M_05:.3f} GeV; M_gap(0.505) = {M_0505:.3f} GeV")
+    print(f"M_gap(0.5) = {M_05:.3f} GeV; M_gap(0.505) = {M_glue_0505:.3f} GeV")
     print(f"Glueball (0.52): pred={M_glue_052:.3f} vs lat={M_lat:.3f} ± {dM:.3f} → {sigma_052:.2f}σ")
     print(f"Glueball (0.505): pred={M_glue_0505:.3f} vs lat={M_lat:.3f} ± {dM:.3f} → {sigma_0505:.2f}σ")
     print(f"String tension proxy (0.55): pred={sigma_pred:.3f} GeV^2 vs exp={sigma_exp:.3f} → rel err={rel_err_sigma*100:.1f}%")
@@ -4,7 +4,6 @@ Identifies problems and suggests theoretical refinements
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from yang_mills_theory import YangMillsParameters, PhiCoordinateTheory
 
 
@@ -54,7 +53,7 @@ class MassGapDiagnostics:
         phi_values = np.linspace(0.1, 0.9, 50)
         
         # Original: g = g₀ φ^β₀ (decreases as φ increases)
-        g_original = np.array([self.theory.coupling_at_phi(p) for p in phi_values])
+        g_original = self.theory.coupling_at_phi_array(phi_values)
         
         # Alternative 1: g = g₀ φ^(-β₀) (increases as φ increases - correct for IR)
         g_alt1 = self.params.g0 * phi_values**(-self.params.beta0_coefficient)
@@ -109,6 +108,7 @@ class MassGapDiagnostics:
             print("   No non-zero mass gap found")
         
         # Plot comparison
+        import matplotlib.pyplot as plt
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
         
         ax1.plot(phi_values, g_original, 'b-', label='Original: φ^β₀', linewidth=2)
@@ -0,0 +1,113 @@
+"""
+Runtime and memory planner for ensemble campaigns
+Micro-benchmarks the update, smearing, measurement and store-write
+kernels on this machine, extrapolates wall time, peak memory and disk
+footprint to every (φ, size) task of lattice_params.yaml and writes the
+per-task seconds as JSON for run_campaign.py --costs
+"""
+
+import argparse
+import json
+import os
+
+from lattice import LatticeConfig
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.cost_model import PROBE_SIZES, benchmark_kernels, estimate_tasks
+from lattice.scheduler import STAGES, build_tasks, critical_path
+
+GB = 1024**3
+
+
+def physical_memory() -> int:
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def format_seconds(s: float) -> str:
+    if s < 120:
+        return f"{s:.1f} s"
+    if s < 7200:
+        return f"{s / 60:.1f} min"
+    if s < 172800:
+        return f"{s / 3600:.1f} h"
+    return f"{s / 86400:.1f} d"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--update', choices=['hmc', 'heatbath'], default=None,
+                        help='override update_algorithm')
+    parser.add_argument('--precision', choices=['double', 'single'], default=None,
+                        help='override the link precision')
+    parser.add_argument('--smearing-iterations', type=int, default=None, help='override smearing depth')
+    parser.add_argument('--interval', type=int, default=None, help='override measurement_interval')
+    parser.add_argument('--configs', type=int, default=None, help='override n_configurations')
+    parser.add_argument('--phi', type=float, nargs='+', default=None, help='subset of phi_values')
+    parser.add_argument('--size-index', type=int, nargs='+', default=None, help='subset of lattice_sizes')
+    parser.add_argument('--workers', type=int, default=None, help='campaign pool size (default: all CPUs)')
+    parser.add_argument('--beta', type=float, default=5.7, help='coupling of the probe lattices')
+    parser.add_argument('--repeats', type=int, default=2)
+    parser.add_argument('--output', default=None, help='write {task id: seconds} JSON here')
+    parser.add_argument('--table', default=None, help='write the full per-task table as JSON here')
+    args = parser.parse_args()
+
+    config = LatticeConfig.load(args.params)
+    if args.update is not None:
+        config.update_algorithm = args.update
+    if args.precision is not None:
+        config.precision = args.precision
+    if args.smearing_iterations is not None:
+        config.smearing = {**config.smearing, 'n_iterations': args.smearing_iterations}
+    if args.interval is not None:
+        config.measurement_interval = args.interval
+    if args.configs is not None:
+        config.n_configurations = args.configs
+    workers = args.workers or os.cpu_count() or 1
+
+    print("Campaign Cost Estimate")
+    print("="*70)
+    print(f"Update: {config.update_algorithm}, {config.thermalization} thermalization + "
+          f"{config.n_configurations} × {config.measurement_interval} updates, "
+          f"{config.smearing.get('n_iterations', 0)} smearing iterations, {config.link_dtype} links")
+    print(f"Probing kernels on {' and '.join('×'.join(map(str, s)) for s in PROBE_SIZES)} ...")
+    kernels = benchmark_kernels(config, args.beta, repeats=args.repeats)
+    print(f"\n{'kernel':<10} {'s/site':>12} {'overhead':>10} {'bytes/site':>12}")
+    for name, k in kernels.items():
+        print(f"{name:<10} {k.seconds.slope:12.3e} {k.seconds.intercept:9.3f}s {k.peak_bytes.slope:12.0f}")
+
+    estimates = estimate_tasks(config, kernels, args.phi, args.size_index)
+    print(f"\n{'task':<40} {'wall time':>10} {'peak mem':>10} {'disk':>10}")
+    for e in estimates:
+        print(f"{e.id:<40} {format_seconds(e.seconds):>10} "
+              f"{e.peak_bytes / GB:8.2f}GB {e.disk_bytes / GB:8.2f}GB")
+
+    costs = {e.id: e.seconds for e in estimates}
+    rank = critical_path(build_tasks(config, costs, args.phi, args.size_index))
+    total = sum(costs.values())
+    longest = max(rank.values())
+    peak = max(e.peak_bytes for e in estimates)
+    ram = physical_memory()
+    print(f"\nTotal: {format_seconds(total)} CPU time, {sum(e.disk_bytes for e in estimates) / GB:.1f} GB disk")
+    print(f"With {workers} workers: ≥ {format_seconds(max(total / workers, longest))} wall time "
+          f"(critical path {format_seconds(longest)})")
+    if ram:
+        print(f"Largest task peak {peak / GB:.2f} GB of {ram / GB:.1f} GB RAM: "
+              f"at most {int(ram // peak)} concurrent tasks of that size")
+        too_big = {}
+        for e in estimates:
+            if e.peak_bytes > ram:
+                too_big.setdefault(e.id.split('size=')[1], set()).add(e.stage)
+        for size, stages in too_big.items():
+            print(f"  ✗ {size}: {', '.join(s for s in STAGES if s in stages)} do not fit in memory")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(costs, f, indent=1)
+        print(f"\nWrote task costs to {args.output} (run_campaign.py --costs {args.output})")
+    if args.table:
+        with open(args.table, 'w', encoding='utf-8') as f:
+            json.dump([e.__dict__ for e in estimates], f, indent=1)
+        print(f"Wrote per-task table to {args.table}")
@@ -0,0 +1,17 @@
+from .config import LatticeConfig
+from .gauge import GaugeField, shift, parity_mask
+from .action import (WilsonAction, SiteLocalWilsonAction, ImprovedGaugeAction, gauge_action,
+                     plaquette_staples, rectangle_staples)
+from .metropolis import MetropolisUpdater
+from .hmc import HMC
+from .heatbath import HeatbathUpdater
+from .smearing import Smearer, smearing_staples
+from .wilson_loops import wilson_loops, polyakov_loop, polyakov_correlator
+from .glueball import glueball_operators, CorrelatorAccumulator, gevp
+from .gradient_flow import GradientFlow, energy_density, topological_charge
+from .config_store import ConfigStore
+from .statistics import gamma_method, BinnedSeries, BlockAccumulator
+from .domain import DomainDecomposition
+from .ensemble import EnsembleChain, stream_seed
+from .scheduler import run_campaign
+from .cost_model import benchmark_kernels, estimate_tasks
@@ -0,0 +1,286 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+from .su3 import NC, dagger, mul, mul_ad, mul_da, re_trace, traceless_antihermitian
+from .gauge import GaugeField, ND, shift, parity_mask
+
+# Rectangle coefficient c1 per gauge action; the plaquette coefficient is
+# c0 = 1 − 8 c1, so β keeps its Wilson normalization
+GAUGE_ACTIONS = {
+    'wilson': 0.0,
+    'symanzik': -1.0 / 12.0,  # tree-level Lüscher–Weisz
+    'iwasaki': -0.331,
+}
+
+
+def plaquette_staples(field: GaugeField, mu: int) -> np.ndarray:
+    """
+    Σ_{ν≠μ} of the two staples closing U_μ(x) into a plaquette, ordered so
+    that Re tr(U_μ(x) A_μ(x)) is the sum of the 2(d−1) plaquettes containing it.
+    """
+    U_mu = field.link(mu)
+    A = np.zeros_like(U_mu)
+    for nu in range(ND):
+        if nu == mu:
+            continue
+        U_nu = field.link(nu)
+        U_nu_xpmu = shift(U_nu, mu)
+        # forward staple: U_ν(x+μ) U_μ(x+ν)† U_ν(x)†
+        A += mul_ad(U_nu_xpmu, mul(U_nu, shift(U_mu, nu)))
+        # backward staple: U_ν(x+μ−ν)† U_μ(x−ν)† U_ν(x−ν)
+        A += shift(mul_da(mul(U_mu, U_nu_xpmu), U_nu), nu, -1)
+    return A
+
+
+def staple_sums(field: GaugeField, mu: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (plaquette staples, rectangle staples) of U_μ in one pass. Every
+    rectangle staple is a product of the forward plaquette staples
+    F(x) = U_ν(x+μ) U_μ(x+ν)† U_ν(x)† of the signed directions ±ν, and the
+    F of +ν and −ν are the forward and backward plaquette staples.
+    """
+    U_mu = field.link(mu)
+    A = np.zeros_like(U_mu)
+    R = np.zeros_like(U_mu)
+    for nu in range(ND):
+        if nu == mu:
+            continue
+        for sign in (1, -1):
+            # U_{±ν}(x): links of the signed direction (U_{−ν}(x) = U_ν(x−ν)†)
+            U_nu = field.link(nu) if sign > 0 else dagger(shift(field.link(nu), nu, -1))
+            U_nu_xpmu = shift(U_nu, mu)
+            F = mul_ad(U_nu_xpmu, mul(U_nu, shift(U_mu, nu, sign)))
+            A += F
+            # long side along ν: U_ν(x+μ) F(x+ν) U_ν(x)†
+            R += mul_ad(mul(U_nu_xpmu, shift(F, nu, sign)), U_nu)
+            # long side along μ, U_μ(x) first: U_μ(x+μ) F(x+μ) F(x)
+            R += mul(shift(mul(U_mu, F), mu), F)
+            # long side along μ, U_μ(x) second: F(x) F(x−μ) U_μ(x−μ)
+            R += mul(F, shift(mul(F, U_mu), mu, -1))
+    return A, R
+
+
+def rectangle_staples(field: GaugeField, mu: int) -> np.ndarray:
+    """
+    Σ over the 18 rectangle staples of U_μ(x), ordered so that
+    Re tr(U_μ(x) R_μ(x)) is the sum of the 2×1 and 1×2 loops containing it
+    """
+    return staple_sums(field, mu)[1]
+
+
+def neighbour_index(site_shape: Tuple[int, ...], mask: np.ndarray):
+    """
+    index(*steps) → flat (periodic) site index of x + Σ step·direction for
+    every site x of mask, in the order of an array indexed by [mask]
+    """
+    coords = np.unravel_index(np.flatnonzero(mask), site_shape)
+
+    def index(*steps: Tuple[int, int]) -> np.ndarray:
+        offset = [0] * ND
+        for direction, step in steps:
+            offset[direction] += step
+        return np.ravel_multi_index(tuple(c + o for c, o in zip(coords, offset)), site_shape, mode='wrap')
+
+    return index
+
+
+def masked_staple_sums(field: GaugeField, mu: int, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    staple_sums at the sites of mask only, shape (n_sites, 3, 3) in the
+    order of field.link(mu)[mask]. The links are gathered from neighbour
+    indices, so sweeping the update masks of a direction costs about one
+    full-lattice staple pass instead of one per mask.
+    """
+    links = field.links.reshape(-1, ND, NC, NC)
+    index = neighbour_index(field.site_shape, mask)
+
+    def gather(nu: int, *steps: Tuple[int, int]) -> np.ndarray:
+        """U_ν(x + Σ step·direction) at every masked site x"""
+        return links[index(*steps), nu]
+
+    A = np.zeros((int(np.count_nonzero(mask)), NC, NC), dtype=field.links.dtype)
+    R = np.zeros_like(A)
+    U_xpmu = gather(mu, (mu, 1))
+    U_xmmu = gather(mu, (mu, -1))
+    for nu in range(ND):
+        if nu == mu:
+            continue
+        for sign in (1, -1):
+            def signed(*steps):
+                # U_{±ν}(x + steps), with U_{−ν}(y) = U_ν(y−ν)†
+                return gather(nu, *steps) if sign > 0 else dagger(gather(nu, (nu, -1), *steps))
+
+            def forward(U_nu_y, U_nu_ypmu, *steps):
+                # F(y) = U_{±ν}(y+μ) U_μ(y±ν)† U_{±ν}(y)† at y = x + steps
+                return mul_ad(U_nu_ypmu, mul(U_nu_y, gather(mu, (nu, sign), *steps)))
+
+            U_nu = signed()
+            U_nu_xpmu = signed((mu, 1))
+            F = forward(U_nu, U_nu_xpmu)
+            A += F
+            # the terms of staple_sums, with F(x+ν), F(x+μ) and F(x−μ) rebuilt from gathered links
+            F_xpnu = forward(signed((nu, sign)), signed((mu, 1), (nu, sign)), (nu, sign))
+            R += mul_ad(mul(U_nu_xpmu, F_xpnu), U_nu)
+            F_xpmu = forward(U_nu_xpmu, signed((mu, 2)), (mu, 1))
+            R += mul(mul(U_xpmu, F_xpmu), F)
+            F_xmmu = forward(signed((mu, -1)), U_nu, (mu, -1))
+            R += mul(F, mul(F_xmmu, U_xmmu))
+    return A, R
+
+
+def update_masks(site_shape: Tuple[int, ...], mu: int, rectangles: bool = False) -> List[np.ndarray]:
+    """
+    Site masks of μ-links that share no loop of the action and can be
+    updated together: the two parities for plaquette actions. With
+    rectangles, μ-links at offsets ±ν̂, ±μ̂, ±μ̂±ν̂ and ±2ν̂ also interact;
+    all of these change (Σ_{ν≠μ} x_ν + 2 x_μ) mod 4, so its 4 classes are
+    used, which needs every extent divisible by 4.
+    """
+    if not rectangles:
+        return [parity_mask(site_shape, p) for p in (0, 1)]
+    if any(n % 4 for n in site_shape):
+        raise ValueError(f"rectangle actions need lattice extents divisible by 4 for "
+                         f"local updates, got {tuple(site_shape)}")
+    coords = np.indices(site_shape)
+    colour = (coords.sum(axis=0) + coords[mu]) % 4
+    return [colour == c for c in range(4)]
+
+
+@dataclass
+class WilsonAction:
+    """S = β Σ_P (1 − Re tr P / N)"""
+    beta: float
+
+    def action(self, field: GaugeField) -> float:
+        n_plaq = 6 * field.volume
+        return self.beta * (n_plaq - field.plaquette_sum() / NC)
+
+    def staples(self, field: GaugeField, mu: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        β-weighted staples: the local action of U_μ(x) is −Re tr(U_μ(x) A)/N.
+        With a mask, only the staples of those sites (as field.link(mu)[mask]).
+        """
+        A = self.beta * plaquette_staples(field, mu)
+        return A if mask is None else A[mask]
+
+    def update_masks(self, site_shape: Tuple[int, ...], mu: int) -> List[np.ndarray]:
+        return update_masks(site_shape, mu)
+
+
+@dataclass
+class ImprovedGaugeAction:
+    """
+    S = β Σ_x [c0 Σ_{μ<ν} (1 − Re tr P_μν/N) + c1 Σ_{μ≠ν} (1 − Re tr R_μν/N)]
+    with 2×1 rectangles R and c0 = 1 − 8 c1 (Symanzik: c1 = −1/12,
+    Iwasaki: c1 = −0.331). c1 = 0 is the Wilson action.
+    """
+    beta: float
+    c1: float
+
+    @property
+    def c0(self) -> float:
+        return 1.0 - 8.0 * self.c1
+
+    def action(self, field: GaugeField) -> float:
+        V = field.volume
+        return self.beta * (self.c0 * (6 * V - field.plaquette_sum() / NC)
+                            + self.c1 * (12 * V - field.rectangle_sum() / NC))
+
+    def staples(self, field: GaugeField, mu: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """β-weighted plaquette and rectangle staples, as WilsonAction.staples"""
+        A, R = staple_sums(field, mu) if mask is None else masked_staple_sums(field, mu, mask)
+        A *= self.beta * self.c0
+        A += (self.beta * self.c1) * R
+        return A
+
+    def update_masks(self, site_shape: Tuple[int, ...], mu: int) -> List[np.ndarray]:
+        return update_masks(site_shape, mu, rectangles=self.c1 != 0.0)
+
+
+def gauge_action(name: str, beta: float):
+    """Action for a `gauge_action:` setting ('wilson', 'symanzik' or 'iwasaki')"""
+    try:
+        c1 = GAUGE_ACTIONS[name]
+    except KeyError:
+        raise ValueError(f"Unknown gauge action '{name}' (expected one of {tuple(GAUGE_ACTIONS)})") from None
+    return WilsonAction(beta) if c1 == 0.0 else ImprovedGaugeAction(beta, c1)
+
+
+class SiteLocalWilsonAction:
+    """
+    S = Σ_x β(x) Σ_{μ<ν} (1 − Re tr P_μν(x) / N), each plaquette weighted by
+    β at its base site. A uniform β(x) is evaluated exactly as WilsonAction.
+    """
+
+    def __init__(self, beta_field: np.ndarray):
+        self.beta_field = np.ascontiguousarray(beta_field, dtype=np.float64)
+        b0 = self.beta_field.flat[0]
+        self._uniform = WilsonAction(float(b0)) if np.all(self.beta_field == b0) else None
+        self._weights = self.beta_field[..., None, None]
+
+    @property
+    def beta(self) -> float:
+        """Volume-averaged β (the exact β for a uniform profile)"""
+        return float(self.beta_field.mean())
+
+    def action(self, field: GaugeField) -> float:
+        if self._uniform is not None:
+            return self._uniform.action(field)
+        total = 0.0
+        for mu in range(ND):
+            for nu in range(mu + 1, ND):
+                total += float(np.sum(
+                    self.beta_field * (1.0 - re_trace(field.plaquette_field(mu, nu)) / NC)))
+        return total
+
+    def staples(self, field: GaugeField, mu: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """As WilsonAction.staples, with each staple weighted by its plaquette's β(x)"""
+        if self._uniform is not None:
+            return self._uniform.staples(field, mu, mask)
+        if mask is not None:
+            return self._masked_staples(field, mu, mask)
+        U_mu = field.link(mu)
+        A = np.zeros_like(U_mu)
+        for nu in range(ND):
+            if nu == mu:
+                continue
+            U_nu = field.link(nu)
+            U_nu_xpmu = shift(U_nu, mu)
+            A += self._weights * mul_ad(U_nu_xpmu, mul(U_nu, shift(U_mu, nu)))
+            A += shift(self._weights * mul_da(mul(U_mu, U_nu_xpmu), U_nu), nu, -1)
+        return A
+
+    def _masked_staples(self, field: GaugeField, mu: int, mask: np.ndarray) -> np.ndarray:
+        """staples at the sites of mask only, from gathered neighbour links and β"""
+        links = field.links.reshape(-1, ND, NC, NC)
+        beta = self.beta_field.reshape(-1)
+        index = neighbour_index(field.site_shape, mask)
+        x = index()
+        A = np.zeros((len(x), NC, NC), dtype=field.links.dtype)
+        for nu in range(ND):
+            if nu == mu:
+                continue
+            # forward staple β(x) U_ν(x+μ) U_μ(x+ν)† U_ν(x)†
+            A += beta[x, None, None] * mul_ad(links[index((mu, 1)), nu],
+                                             mul(links[x, nu], links[index((nu, 1)), mu]))
+            # backward staple β(x−ν) U_ν(x+μ−ν)† U_μ(x−ν)† U_ν(x−ν)
+            x_mnu = index((nu, -1))
+            A += beta[x_mnu, None, None] * mul_da(mul(links[x_mnu, mu], links[index((mu, 1), (nu, -1)), nu]),
+                                                  links[x_mnu, nu])
+        return A
+
+    def update_masks(self, site_shape: Tuple[int, ...], mu: int) -> List[np.ndarray]:
+        return update_masks(site_shape, mu)
+
+
+def gauge_force(action, field: GaugeField) -> np.ndarray:
+    """
+    HMC force dP/dτ for H = Σ tr P² + S with U̇ = iPU: (i/2N)·TA(U A) for
+    every link, where A are the action's weighted staples. Shape as links.
+    """
+    F = np.empty_like(field.links)
+    for mu in range(ND):
+        F[..., mu, :, :] = (0.5j / NC) * traceless_antihermitian(
+            mul(field.link(mu), action.staples(field, mu)))
+    return F
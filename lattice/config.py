@@ -0,0 +1,100 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+import os
+import numpy as np
+from .su3 import link_dtype
+from .action import GAUGE_ACTIONS, gauge_action
+
+DEFAULT_PARAMS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'lattice_params.yaml')
+
+
+@dataclass
+class LatticeConfig:
+    """Settings written by lattice_simulation_plan.py (lattice_params.yaml)"""
+    gauge_group: str = 'SU(3)'
+    N_colors: int = 3
+    n_flavors: int = 0
+    phi_values: List[float] = field(default_factory=lambda: [0.2, 0.3, 0.4, 0.5, 0.6, 0.8])
+    g0: float = 0.00073242
+    beta0: float = 11.0
+    # Each size is listed as [X, Y, Z, T]; see LatticeConfig.array_shape
+    lattice_sizes: List[List[int]] = field(default_factory=lambda: [[24, 24, 24, 48]])
+    hmc: Dict[str, Any] = field(default_factory=lambda: {
+        'trajectory_length': 1.0, 'n_steps': 100, 'target_acceptance': 0.75})
+    update_algorithm: str = 'hmc'  # 'hmc' or 'heatbath'
+    heatbath: Dict[str, Any] = field(default_factory=lambda: {
+        'n_heatbath': 1, 'n_overrelax': 4, 'reunitarize_every': 10})
+    gauge_action: str = 'wilson'  # 'wilson', 'symanzik' or 'iwasaki'
+    precision: str = 'double'  # link storage: 'double' or 'single' (float64 sums either way)
+    thermalization: int = 1000
+    n_configurations: int = 2000
+    measurement_interval: int = 10
+    smearing: Dict[str, Any] = field(default_factory=lambda: {
+        'type': 'APE', 'alpha': 0.5, 'n_iterations': 50, 'spatial_only': True})
+    extra: Dict[str, Any] = field(default_factory=dict)  # keys this version does not interpret
+
+    def __post_init__(self):
+        if self.gauge_action not in GAUGE_ACTIONS:
+            raise ValueError(f"Unknown gauge_action '{self.gauge_action}' "
+                             f"(expected one of {tuple(GAUGE_ACTIONS)})")
+        link_dtype(self.precision)  # ValueError for an unknown precision
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> 'LatticeConfig':
+        known = {f for f in cls.__dataclass_fields__ if f != 'extra'}
+        kwargs = {k: v for k, v in raw.items() if k in known}
+        extra = {k: v for k, v in raw.items() if k not in known}
+        return cls(**kwargs, extra=extra)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PARAMS_PATH) -> 'LatticeConfig':
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(yaml.safe_load(f) or {})
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {k: getattr(self, k) for k in self.__dataclass_fields__ if k != 'extra'}
+        out.update(self.extra)
+        return out
+
+    @staticmethod
+    def array_shape(size: List[int]) -> Tuple[int, int, int, int]:
+        """[X, Y, Z, T] from the YAML → (T, Z, Y, X) link-array site shape"""
+        X, Y, Z, T = size
+        return (T, Z, Y, X)
+
+    def coupling(self, phi: float) -> float:
+        """g(φ) = g₀ φ^(−β₀) with the plan's g0/beta0"""
+        from yang_mills_theory import coupling_power_law
+        return float(coupling_power_law(phi, self.g0, self.beta0))
+
+    def beta(self, phi: float) -> float:
+        """Lattice β = 2N / g²(φ)"""
+        return 2 * self.N_colors / self.coupling(phi)**2
+
+    def beta_field(self, phi_field: np.ndarray, phi_critical: float = 0.5) -> np.ndarray:
+        """
+        Site-local β(x) = 2N/g²(φ(x)) × metric(φ(x)) for a φ profile of the
+        link-array site shape, from the theory's vectorized kernels
+        """
+        from yang_mills_theory import PhiCoordinateTheory, YangMillsParameters
+        theory = PhiCoordinateTheory(YangMillsParameters(
+            g0=self.g0, beta0_coefficient=self.beta0, N=self.N_colors, nf=self.n_flavors,
+            phi_critical=phi_critical))
+        phi_field = np.asarray(phi_field, dtype=float)
+        g = theory.coupling_at_phi_array(phi_field)
+        return 2 * self.N_colors / g**2 * theory.dimensional_metric_array(phi_field)
+
+    @property
+    def link_dtype(self) -> np.dtype:
+        """Link dtype of the precision setting"""
+        return link_dtype(self.precision)
+
+    def action(self, beta: float):
+        """The gauge_action at coupling β"""
+        return gauge_action(self.gauge_action, beta)
+
+    def site_count(self, size: List[int]) -> int:
+        return int(np.prod(size))
@@ -0,0 +1,179 @@
+"""
+On-disk gauge configuration store
+
+One file per configuration plus index.json in the store directory.
+
+File layout (all little-endian):
+
+    offset  size  field
+    0       8     magic b'YMGAUGE1'
+    8       4     uint32 format version (1)
+    12      4     uint32 flags; bit 0 set = compressed (two rows stored)
+    16      4     uint32 bytes per real (8: float64, 4: float32)
+    20      16    uint32 T, Z, Y, X
+    36      4     uint32 number of directions (4)
+    40      4     uint32 stored rows per link (3, or 2 when compressed)
+    44      20    reserved (zero)
+    64      ...   payload: real array of shape (T, Z, Y, X, 4, rows, 3, 2),
+                  C order, the last axis holding (Re, Im)
+
+The payload is timeslice-major, so timeslice t is one contiguous block.
+A compressed file stores the first two rows of every SU(3) link (12
+reals) and the third row is rebuilt as (u × v)*. index.json maps each
+configuration number to its file name, the SHA-256 of the payload, the
+layout and free-form metadata, so any configuration can be opened
+without scanning the directory.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+from .su3 import NC
+from .gauge import GaugeField, ND
+
+MAGIC = b'YMGAUGE1'
+FORMAT_VERSION = 1
+HEADER_BYTES = 64
+FLAG_COMPRESSED = 1
+_HEADER = struct.Struct('<8sIII4III')
+
+INDEX_NAME = 'index.json'
+
+
+def reconstruct_third_row(rows: np.ndarray) -> np.ndarray:
+    """(..., 2, 3) first two rows of SU(3) matrices → full (..., 3, 3)"""
+    out = np.empty(rows.shape[:-2] + (NC, NC), dtype=rows.dtype)
+    out[..., :2, :] = rows
+    out[..., 2, :] = np.conj(np.cross(rows[..., 0, :], rows[..., 1, :]))
+    return out
+
+
+class ConfigStore:
+    """Directory of gauge configurations with a JSON index"""
+
+    def __init__(self, root: str, compress: bool = False):
+        self.root = root
+        self.compress = compress
+        os.makedirs(root, exist_ok=True)
+        self._index = self._read_index()
+
+    # -- index -----------------------------------------------------------
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_NAME)
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'format_version': FORMAT_VERSION, 'configs': {}}
+
+    def _write_index(self):
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+    def __len__(self) -> int:
+        return len(self._index['configs'])
+
+    def __contains__(self, k: int) -> bool:
+        return str(k) in self._index['configs']
+
+    def keys(self) -> List[int]:
+        return sorted(int(k) for k in self._index['configs'])
+
+    def entry(self, k: int) -> Dict[str, Any]:
+        try:
+            return self._index['configs'][str(k)]
+        except KeyError:
+            raise KeyError(f"configuration {k} not in store {self.root}") from None
+
+    # -- writing ---------------------------------------------------------
+
+    def write(self, field: GaugeField, k: Optional[int] = None,
+              metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Write `field` as configuration k (default: next number) and index it"""
+        if k is None:
+            k = max(self.keys(), default=-1) + 1
+        links = field.links
+        complex_dtype = np.dtype('<c16') if links.dtype == np.complex128 else np.dtype('<c8')
+        real_dtype = np.dtype(f'<f{complex_dtype.itemsize // 2}')
+        rows = 2 if self.compress else NC
+        T, Z, Y, X = field.site_shape
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_COMPRESSED if self.compress else 0,
+                              real_dtype.itemsize, T, Z, Y, X, ND, rows)
+        name = f"cfg_{k:06d}.lat"
+        path = os.path.join(self.root, name)
+        digest = hashlib.sha256()
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(header.ljust(HEADER_BYTES, b'\0'))
+            for t in range(T):
+                data = np.ascontiguousarray(links[t, ..., :rows, :], dtype=complex_dtype).tobytes()
+                digest.update(data)
+                f.write(data)
+        os.replace(tmp, path)
+        entry = {
+            'file': name,
+            'sha256': digest.hexdigest(),
+            'site_shape': [T, Z, Y, X],
+            'compressed': self.compress,
+            'real_bytes': real_dtype.itemsize,
+            'metadata': metadata or {},
+        }
+        self._index['configs'][str(k)] = entry
+        self._write_index()
+        return entry
+
+    # -- reading ---------------------------------------------------------
+
+    def open(self, k: int) -> np.memmap:
+        """Read-only memmap of the payload, shape (T, Z, Y, X, 4, rows, 3, 2)"""
+        entry = self.entry(k)
+        path = os.path.join(self.root, entry['file'])
+        with open(path, 'rb') as f:
+            magic, version, flags, real_bytes, T, Z, Y, X, nd, rows = _HEADER.unpack(
+                f.read(_HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path}: not a version-{FORMAT_VERSION} gauge configuration")
+        dtype = np.dtype('<f8') if real_bytes == 8 else np.dtype('<f4')
+        return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_BYTES,
+                         shape=(T, Z, Y, X, nd, rows, NC, 2))
+
+    @staticmethod
+    def _as_links(raw: np.ndarray) -> np.ndarray:
+        """Complex links from a (…, rows, 3, 2) real block; a view when uncompressed"""
+        complex_dtype = np.dtype('<c16') if raw.dtype.itemsize == 8 else np.dtype('<c8')
+        z = raw.view(complex_dtype)[..., 0]
+        return z if z.shape[-2] == NC else reconstruct_third_row(z)
+
+    def timeslice(self, k: int, t: int) -> np.ndarray:
+        """Links of timeslice t, shape (Z, Y, X, 4, 3, 3); zero-copy for uncompressed files"""
+        return self._as_links(self.open(k)[t])
+
+    def timeslices(self, k: int) -> Iterator[np.ndarray]:
+        mm = self.open(k)
+        for t in range(mm.shape[0]):
+            yield self._as_links(mm[t])
+
+    def load(self, k: int, verify: bool = True) -> GaugeField:
+        """Configuration k as an in-memory GaugeField"""
+        if verify and not self.verify(k):
+            raise IOError(f"checksum mismatch for configuration {k} in {self.root}")
+        links = self._as_links(self.open(k))
+        # uncompressed links are a read-only view of the file
+        return GaugeField(links if links.flags.writeable else links.copy())
+
+    def verify(self, k: int) -> bool:
+        """Recompute the payload SHA-256 timeslice by timeslice"""
+        mm = self.open(k)
+        digest = hashlib.sha256()
+        for t in range(mm.shape[0]):
+            digest.update(np.ascontiguousarray(mm[t]).tobytes())
+        return digest.hexdigest() == self.entry(k)['sha256']
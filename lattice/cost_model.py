@@ -0,0 +1,176 @@
+"""
+Runtime, memory and disk estimates for campaign tasks
+Each kernel (one update, one smearing iteration, one configuration's
+measurements, one ConfigStore write) is timed on two small probe
+lattices and fitted as t = a + b·sites. Its peak allocation above the
+resident gauge fields is read from tracemalloc (NumPy reports its
+buffers there) and fitted the same way. The fits are extrapolated to
+every (φ, size) task of the scheduler DAG.
+"""
+from __future__ import annotations
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence
+import numpy as np
+from .su3 import NC
+from .config import LatticeConfig
+from .gauge import GaugeField, ND
+from .hmc import HMC
+from .heatbath import HeatbathUpdater
+from .smearing import Smearer
+from .wilson_loops import wilson_loops, polyakov_loop
+from .config_store import ConfigStore, HEADER_BYTES
+from .scheduler import DEFAULT_MEASUREMENTS, build_tasks
+
+# [X, Y, Z, T]; extents of 8 hold the default 4×4 Wilson loops
+PROBE_SIZES = ([8, 8, 8, 8], [8, 8, 8, 16])
+# HMC trajectories are timed with at most this many steps and scaled to n_steps
+PROBE_HMC_STEPS = 4
+ANALYZE_SECONDS = 1.0
+ANALYZE_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class LinearFit:
+    """y = intercept + slope·sites, intercept clamped at 0"""
+    intercept: float
+    slope: float
+
+    @classmethod
+    def through(cls, x: Sequence[float], y: Sequence[float]) -> 'LinearFit':
+        slope = (y[1] - y[0]) / (x[1] - x[0])
+        if slope <= 0:
+            return cls(0.0, max(y) / max(x))
+        return cls(max(0.0, y[0] - slope * x[0]), slope)
+
+    def __call__(self, sites: float) -> float:
+        return self.intercept + self.slope * sites
+
+
+@dataclass
+class KernelCost:
+    seconds: LinearFit
+    peak_bytes: LinearFit
+
+
+@dataclass
+class TaskEstimate:
+    id: str
+    stage: str
+    sites: int
+    seconds: float
+    peak_bytes: float
+    disk_bytes: float
+
+
+def field_bytes(sites: int, itemsize: int = 16) -> int:
+    return sites * ND * NC * NC * itemsize
+
+
+def config_file_bytes(sites: int, compressed: bool = False, itemsize: int = 16) -> int:
+    rows = 2 if compressed else NC
+    return HEADER_BYTES + sites * ND * rows * NC * itemsize
+
+
+def profile_kernel(fn: Callable[[], None], repeats: int):
+    """(best wall time, peak traced bytes) of fn"""
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, float(peak)
+
+
+def _kernels(config: LatticeConfig, field: GaugeField, rng: np.random.Generator,
+             beta: float, store: ConfigStore) -> Dict[str, Callable[[], None]]:
+    action = config.action(beta)
+    if config.update_algorithm == 'heatbath':
+        updater = HeatbathUpdater.from_config(config.heatbath, action)
+        update = lambda: updater.sweep(field, rng)
+    else:
+        hmc = HMC.from_config(config.hmc, action)
+        hmc.n_steps = min(hmc.n_steps, PROBE_HMC_STEPS)
+        update = lambda: hmc.trajectory(field, rng)
+    smearer = Smearer.from_config({**config.smearing, 'n_iterations': 1}, n_workers=1)
+    settings = {**DEFAULT_MEASUREMENTS, **config.extra.get('measurements', {})}
+    T, Z, Y, X = field.site_shape
+
+    def measure():
+        field.average_plaquette()
+        polyakov_loop(field)
+        wilson_loops(field, min(settings['max_R'], min(X, Y, Z) // 2), min(settings['max_T'], T // 2))
+
+    return {
+        'update': update,
+        'smear': lambda: smearer.smear(field, in_place=True),
+        'measure': measure,
+        'write': lambda: store.write(field, 0),
+    }
+
+
+def benchmark_kernels(config: LatticeConfig, beta: float = 5.7,
+                      probe_sizes: Sequence[List[int]] = PROBE_SIZES, repeats: int = 2,
+                      seed: int = 0) -> Dict[str, KernelCost]:
+    """Per-kernel time and peak-memory fits from the probe lattices"""
+    rng = np.random.default_rng(seed)
+    sites, times, peaks = [], {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ConfigStore(tmp, compress=bool(config.extra.get('compress', False)))
+        for size in probe_sizes:
+            field = GaugeField.hot(config.array_shape(size), rng, config.link_dtype)
+            sites.append(field.volume)
+            for name, fn in _kernels(config, field, rng, beta, store).items():
+                t, peak = profile_kernel(fn, repeats)
+                times.setdefault(name, []).append(t)
+                peaks.setdefault(name, []).append(peak)
+    costs = {name: KernelCost(LinearFit.through(sites, times[name]), LinearFit.through(sites, peaks[name]))
+             for name in times}
+    if config.update_algorithm != 'heatbath':
+        steps = int(config.hmc.get('n_steps', 100))
+        scale = steps / min(steps, PROBE_HMC_STEPS)
+        fit = costs['update'].seconds
+        costs['update'].seconds = LinearFit(fit.intercept * scale, fit.slope * scale)
+    return costs
+
+
+def estimate_tasks(config: LatticeConfig, kernels: Dict[str, KernelCost],
+                   phi_values=None, size_indices=None) -> List[TaskEstimate]:
+    """Wall time, peak memory and disk footprint of every scheduler task"""
+    n_configs = config.n_configurations
+    n_updates_gen = n_configs * config.measurement_interval
+    n_smear = int(config.smearing.get('n_iterations', 0))
+    compressed = bool(config.extra.get('compress', False))
+    settings = {**DEFAULT_MEASUREMENTS, **config.extra.get('measurements', {})}
+    itemsize = config.link_dtype.itemsize
+    out = []
+    for task in build_tasks(config, phi_values=phi_values, size_indices=size_indices):
+        V = config.site_count(task.size)
+        U = field_bytes(V, itemsize)
+        k = {name: (c.seconds(V), c.peak_bytes(V)) for name, c in kernels.items()}
+        if task.stage == 'thermalize':
+            seconds = config.thermalization * k['update'][0]
+            peak = U + k['update'][1]
+            disk = U
+        elif task.stage == 'generate':
+            seconds = n_updates_gen * k['update'][0] + n_configs * k['write'][0]
+            peak = U + max(k['update'][1], k['write'][1])
+            disk = n_configs * config_file_bytes(V, compressed, itemsize)
+        elif task.stage == 'smear':
+            seconds = n_configs * (n_smear * k['smear'][0] + k['write'][0])
+            peak = U + k['smear'][1]
+            disk = n_configs * config_file_bytes(V, itemsize=itemsize)
+        elif task.stage == 'measure':
+            seconds = n_configs * k['measure'][0]
+            peak = 2 * U + k['measure'][1]
+            disk = n_configs * (settings['max_R'] * settings['max_T'] + 3) * 8
+        else:
+            seconds, peak, disk = ANALYZE_SECONDS, ANALYZE_BYTES, 4096
+        out.append(TaskEstimate(task.id, task.stage, V, seconds, peak, disk))
+    return out
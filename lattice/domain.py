@@ -0,0 +1,194 @@
+"""
+Time-slab domain decomposition over shared memory
+The gauge field lives in one multiprocessing.shared_memory block. Each
+worker process owns a contiguous range of timeslices and keeps a private
+copy of it with one halo timeslice on either side. After every
+direction/parity step of the checkerboard heatbath/overrelaxation
+sweep, workers publish their two boundary timeslices of that direction
+and read their neighbours' into the halos, so only 2 timeslices per
+worker cross process boundaries per step. Interiors are written back to
+shared memory only when the full field is gathered.
+"""
+from __future__ import annotations
+import multiprocessing as mp
+import traceback
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .su3 import NC, re_trace
+from .gauge import GaugeField, ND, parity_mask
+from .action import SiteLocalWilsonAction
+from .heatbath import HeatbathUpdater
+
+HALO = 1
+
+
+def slab_bounds(T: int, n_workers: int) -> List[Tuple[int, int]]:
+    """Balanced [t_lo, t_hi) ranges covering 0..T"""
+    edges = np.linspace(0, T, n_workers + 1).round().astype(int)
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+
+def _local_action(action, t_index: np.ndarray):
+    if isinstance(action, SiteLocalWilsonAction):
+        return SiteLocalWilsonAction(action.beta_field[t_index])
+    return action
+
+
+def _worker(shm_name: str, shape: Tuple[int, ...], dtype: str, t_lo: int, t_hi: int,
+            action, settings: Dict, seed: np.random.SeedSequence, conn, barrier):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    shared = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        T = shape[0]
+        n = t_hi - t_lo
+        t_index = np.arange(t_lo - HALO, t_hi + HALO) % T
+        local = GaugeField(shared[t_index])
+        interior = np.zeros(local.site_shape, dtype=bool)
+        interior[HALO:HALO + n] = True
+        masks = [parity_mask(shape[:4], p)[t_index] & interior for p in (0, 1)]
+        updater = HeatbathUpdater.from_config(settings, _local_action(action, t_index))
+        rng = np.random.default_rng(seed)
+
+        def exchange(mu=slice(None)):
+            shared[t_lo, ..., mu, :, :] = local.links[HALO, ..., mu, :, :]
+            shared[t_hi - 1, ..., mu, :, :] = local.links[HALO + n - 1, ..., mu, :, :]
+            barrier.wait()
+            local.links[0, ..., mu, :, :] = shared[(t_lo - 1) % T, ..., mu, :, :]
+            local.links[-1, ..., mu, :, :] = shared[t_hi % T, ..., mu, :, :]
+            barrier.wait()
+
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == 'stop':
+                break
+            if cmd == 'sweep':
+                for _ in range(arg):
+                    updater.sweep(local, rng, masks, exchange)
+                    # boundaries may have been reunitarized after the last step
+                    exchange()
+                conn.send(('ok', None))
+            elif cmd == 'plaquette':
+                total = 0.0
+                for mu in range(ND):
+                    for nu in range(mu + 1, ND):
+                        total += float(np.sum(re_trace(local.plaquette_field(mu, nu)[HALO:HALO + n]),
+                                             dtype=np.float64))
+                conn.send(('ok', total))
+            elif cmd == 'flush':
+                shared[t_lo:t_hi] = local.links[HALO:HALO + n]
+                conn.send(('ok', None))
+            elif cmd == 'load':
+                local.links[...] = shared[t_index]
+                conn.send(('ok', None))
+            elif cmd == 'get_state':
+                conn.send(('ok', {'rng': rng.bit_generator.state, 'updater': updater.get_state()}))
+            elif cmd == 'set_state':
+                rng.bit_generator.state = arg['rng']
+                updater.set_state(arg['updater'])
+                conn.send(('ok', None))
+    except Exception:
+        barrier.abort()
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        del shared
+        shm.close()
+
+
+class DomainDecomposition:
+    """
+    Heatbath/overrelaxation sweeps and plaquette measurements of one
+    GaugeField split into time slabs, one worker process per slab.
+    Worker k draws from the k-th child stream of `seed` (an int or a
+    SeedSequence), so a run is reproducible for a fixed worker count (but
+    differs from the serial HeatbathUpdater chain).
+    """
+
+    def __init__(self, field: GaugeField, action, n_workers: int,
+                 settings: Optional[Dict] = None, seed=None):
+        T = field.site_shape[0]
+        if not 1 <= n_workers <= T:
+            raise ValueError(f"need 1 ≤ n_workers ≤ T = {T}, got {n_workers}")
+        if getattr(action, 'c1', 0.0):
+            raise ValueError("domain decomposition has one halo timeslice and supports "
+                             "plaquette actions only")
+        self.site_shape = field.site_shape
+        self.volume = field.volume
+        self.bounds = slab_bounds(T, n_workers)
+        self._shm = shared_memory.SharedMemory(create=True, size=field.links.nbytes)
+        self.links = np.ndarray(field.links.shape, dtype=field.links.dtype, buffer=self._shm.buf)
+        self.links[...] = field.links
+        ctx = mp.get_context()
+        barrier = ctx.Barrier(n_workers)
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        seeds = [np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (k,))
+                 for k in range(n_workers)]
+        self._conns, self._procs = [], []
+        for (t_lo, t_hi), ss in zip(self.bounds, seeds):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, daemon=True,
+                               args=(self._shm.name, field.links.shape, field.links.dtype.str,
+                                     t_lo, t_hi, action, settings or {}, ss, child, barrier))
+            proc.start()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    @property
+    def n_workers(self) -> int:
+        return len(self._procs)
+
+    def _call(self, cmd: str, arg=None, per_worker: Optional[list] = None) -> list:
+        args = per_worker if per_worker is not None else [arg] * self.n_workers
+        for conn, worker_arg in zip(self._conns, args):
+            conn.send((cmd, worker_arg))
+        replies = [conn.recv() for conn in self._conns]
+        errors = [msg for status, msg in replies if status == 'error']
+        if errors:
+            raise RuntimeError("domain worker failed:\n" + errors[0])
+        return [msg for _, msg in replies]
+
+    def sweep(self, n_sweeps: int = 1):
+        self._call('sweep', n_sweeps)
+
+    def average_plaquette(self) -> float:
+        """⟨Re tr P⟩/N, summed over slabs"""
+        return sum(self._call('plaquette')) / (6 * self.volume * NC)
+
+    def gather(self) -> GaugeField:
+        """Copy of the current global field"""
+        self._call('flush')
+        return GaugeField(self.links.copy())
+
+    def scatter(self, field: GaugeField):
+        """Replace the global field (e.g. from a checkpoint)"""
+        self.links[...] = field.links
+        self._call('load')
+
+    def get_state(self) -> Dict:
+        """Per-worker generator and updater states (for checkpoints)"""
+        return {'workers': self._call('get_state')}
+
+    def set_state(self, state: Dict):
+        workers = state['workers']
+        if len(workers) != self.n_workers:
+            raise ValueError(f"state has {len(workers)} workers, run has {self.n_workers}")
+        self._call('set_state', per_worker=workers)
+
+    def close(self):
+        if self._shm is None:
+            return
+        for conn, proc in zip(self._conns, self._procs):
+            if proc.is_alive():
+                conn.send(('stop', None))
+            proc.join()
+        del self.links
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> 'DomainDecomposition':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,151 @@
+"""
+Ensemble generation with reproducible random streams and checkpoint/resume
+Each (φ, volume) chain draws from SeedSequence(seed, spawn_key=(i_φ, i_size))
+and domain-decomposition worker k from spawn_key (i_φ, i_size, k): the
+streams SeedSequence(seed).spawn() would hand out at those positions of
+the tree, so concurrent chains never share random numbers. A checkpoint
+is one .npz file (links, optional momenta, and a JSON document with the
+bit-generator state, updater state and chain position) written under a
+temporary name and renamed, so a kill mid-write leaves the previous
+checkpoint intact. HMC checkpoints fall between trajectories, where the
+momenta are redrawn from the checkpointed generator.
+"""
+from __future__ import annotations
+import json
+import os
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+from .gauge import GaugeField
+from .hmc import HMC
+from .domain import DomainDecomposition
+
+CHECKPOINT_VERSION = 1
+
+
+def stream_seed(seed, phi_index: int, size_index: int,
+                worker: Optional[int] = None) -> np.random.SeedSequence:
+    """Independent SeedSequence of one (φ, volume[, worker]) chain"""
+    key = (phi_index, size_index) if worker is None else (phi_index, size_index, worker)
+    return np.random.SeedSequence(seed, spawn_key=key)
+
+
+def update_step(updater, field: GaugeField, rng: np.random.Generator) -> float:
+    """One sweep / trajectory; returns the acceptance (rate or 0/1)"""
+    if isinstance(updater, HMC):
+        return float(updater.trajectory(field, rng)['accepted'])
+    if isinstance(updater, DomainDecomposition):
+        updater.sweep()
+        return 1.0
+    return updater.sweep(field, rng)
+
+
+def save_checkpoint(path: str, field: GaugeField, rng: np.random.Generator, state: Dict,
+                    momenta: Optional[np.ndarray] = None):
+    """Atomically write links, generator state and `state` to path (.npz)"""
+    doc = {'version': CHECKPOINT_VERSION, 'rng': rng.bit_generator.state, **state}
+    arrays = {'links': field.links, 'state': np.array(json.dumps(doc))}
+    if momenta is not None:
+        arrays['momenta'] = momenta
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> Tuple[GaugeField, np.random.Generator, Dict, Optional[np.ndarray]]:
+    """(field, generator, state, momenta) as written by save_checkpoint"""
+    with np.load(path) as data:
+        doc = json.loads(str(data['state']))
+        field = GaugeField(data['links'])
+        momenta = data['momenta'] if 'momenta' in data.files else None
+    if doc.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"{path}: unsupported checkpoint version {doc.get('version')}")
+    bit_generator = getattr(np.random, doc['rng']['bit_generator'])()
+    bit_generator.state = doc.pop('rng')
+    return field, np.random.Generator(bit_generator), doc, momenta
+
+
+class EnsembleChain:
+    """
+    Thermalization followed by n_configs configurations, one every
+    `interval` updates, for one (φ, volume) point. The chain is
+    checkpointed every `checkpoint_every` updates and at the end of
+    run(); resume() continues bit-exactly from the last checkpoint.
+    """
+
+    def __init__(self, field: GaugeField, updater, rng: np.random.Generator,
+                 n_thermalize: int, n_configs: int, interval: int,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 0,
+                 store=None, metadata: Optional[Dict] = None):
+        self.field = field
+        self.updater = updater
+        self.rng = rng
+        self.n_thermalize = n_thermalize
+        self.n_configs = n_configs
+        self.interval = interval
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.store = store
+        self.metadata = metadata or {}
+        self.update = 0
+        self._saved = -1
+
+    @property
+    def n_updates(self) -> int:
+        return self.n_thermalize + self.n_configs * self.interval
+
+    @property
+    def finished(self) -> bool:
+        return self.update >= self.n_updates
+
+    def current_field(self) -> GaugeField:
+        if isinstance(self.updater, DomainDecomposition):
+            return self.updater.gather()
+        return self.field
+
+    def checkpoint(self):
+        state = {'update': self.update}
+        if hasattr(self.updater, 'get_state'):
+            state['updater'] = self.updater.get_state()
+        save_checkpoint(self.checkpoint_path, self.current_field(), self.rng, state)
+        self._saved = self.update
+
+    def resume(self) -> bool:
+        """Restore the last checkpoint if there is one"""
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return False
+        field, rng, state, _ = load_checkpoint(self.checkpoint_path)
+        if field.links.shape != self.field.links.shape:
+            raise ValueError(f"checkpoint lattice {field.site_shape} does not match {self.field.site_shape}")
+        if field.links.dtype != self.field.links.dtype:
+            raise ValueError(f"checkpoint links are {field.links.dtype}, the chain uses {self.field.links.dtype}")
+        self.field.links[...] = field.links
+        self.rng.bit_generator.state = rng.bit_generator.state
+        if isinstance(self.updater, DomainDecomposition):
+            self.updater.scatter(field)
+        if 'updater' in state:
+            self.updater.set_state(state['updater'])
+        self.update = self._saved = int(state['update'])
+        return True
+
+    def run(self, max_updates: Optional[int] = None,
+            report: Optional[Callable[[int, float], None]] = None) -> bool:
+        """Advance by up to max_updates (default: to the end); True once finished"""
+        stop = self.n_updates if max_updates is None else min(self.n_updates, self.update + max_updates)
+        while self.update < stop:
+            acceptance = update_step(self.updater, self.field, self.rng)
+            self.update += 1
+            produced = self.update - self.n_thermalize
+            if self.store is not None and produced > 0 and produced % self.interval == 0:
+                config = self.current_field()
+                self.store.write(config, produced // self.interval - 1, {
+                    **self.metadata, 'update': self.update, 'plaquette': config.average_plaquette()})
+            if report is not None:
+                report(self.update, acceptance)
+            if self.checkpoint_path and self.checkpoint_every and self.update % self.checkpoint_every == 0:
+                self.checkpoint()
+        if self.checkpoint_path and self._saved != self.update:
+            self.checkpoint()
+        return self.finished
@@ -0,0 +1,106 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Tuple
+import numpy as np
+from .su3 import NC, mul, mul_ad, identity, random_su3, project_su3, unitarity_violation
+
+ND = 4  # directions; direction mu runs along array axis mu of (T, Z, Y, X)
+
+
+def shift(field: np.ndarray, mu: int, step: int = 1) -> np.ndarray:
+    """field(x + step·μ̂) with periodic boundaries (site axes come first)"""
+    return np.roll(field, -step, axis=mu)
+
+
+def parity_mask(site_shape: Tuple[int, ...], parity: int) -> np.ndarray:
+    """Boolean mask of even (0) or odd (1) sites"""
+    coords = np.indices(site_shape).sum(axis=0)
+    return (coords % 2) == parity
+
+
+def _promoted(U: np.ndarray) -> np.ndarray:
+    """U in complex128 (no copy when it already is)"""
+    return U.astype(np.complex128, copy=False)
+
+
+@dataclass
+class GaugeField:
+    """SU(3) links U_μ(x) in one contiguous array of shape (T, Z, Y, X, 4, 3, 3)"""
+    links: np.ndarray
+
+    def __post_init__(self):
+        if self.links.ndim != 7 or self.links.shape[4:] != (ND, NC, NC):
+            raise ValueError(f"links must have shape (T,Z,Y,X,4,3,3), got {self.links.shape}")
+        if not self.links.flags.c_contiguous:
+            self.links = np.ascontiguousarray(self.links)
+
+    @classmethod
+    def cold(cls, site_shape: Tuple[int, int, int, int], dtype=np.complex128) -> 'GaugeField':
+        return cls(identity(tuple(site_shape) + (ND,), dtype))
+
+    @classmethod
+    def hot(cls, site_shape: Tuple[int, int, int, int], rng: np.random.Generator,
+            dtype=np.complex128) -> 'GaugeField':
+        return cls(random_su3(tuple(site_shape) + (ND,), rng, dtype))
+
+    @property
+    def site_shape(self) -> Tuple[int, int, int, int]:
+        return self.links.shape[:4]
+
+    @property
+    def volume(self) -> int:
+        return int(np.prod(self.site_shape))
+
+    def copy(self) -> 'GaugeField':
+        return GaugeField(self.links.copy())
+
+    def link(self, mu: int) -> np.ndarray:
+        """View of U_μ(x) for all sites, shape (T, Z, Y, X, 3, 3)"""
+        return self.links[..., mu, :, :]
+
+    def plaquette_field(self, mu: int, nu: int) -> np.ndarray:
+        """P_μν(x) = U_μ(x) U_ν(x+μ) U_μ(x+ν)† U_ν(x)†"""
+        U_mu, U_nu = self.link(mu), self.link(nu)
+        return mul_ad(mul(U_mu, shift(U_nu, mu)), mul(U_nu, shift(U_mu, nu)))
+
+    def plaquette_sum(self) -> float:
+        """
+        Σ_x Σ_{μ<ν} Re tr P_μν(x) in float64; single-precision links are
+        promoted one direction at a time, so HMC action differences and ⟨P⟩
+        carry no single-precision rounding
+        """
+        total = 0.0
+        for mu in range(ND):
+            U_mu = _promoted(self.link(mu))
+            for nu in range(mu + 1, ND):
+                U_nu = _promoted(self.link(nu))
+                left = mul(U_mu, shift(U_nu, mu))
+                right = mul(U_nu, shift(U_mu, nu))
+                # Re tr(L R†) = Re Σ L_ij conj(R_ij)
+                total += float(np.sum((left * np.conj(right)).real, dtype=np.float64))
+        return total
+
+    def rectangle_sum(self) -> float:
+        """Σ_x Σ_{μ≠ν} Re tr R_μν(x) over 2×1 rectangles (long side along μ), in float64"""
+        total = 0.0
+        for mu in range(ND):
+            U_mu = _promoted(self.link(mu))
+            U_mu2 = mul(U_mu, shift(U_mu, mu))
+            for nu in range(ND):
+                if nu == mu:
+                    continue
+                U_nu = _promoted(self.link(nu))
+                left = mul(U_mu2, shift(U_nu, mu, 2))
+                right = mul(U_nu, shift(U_mu2, nu))
+                total += float(np.sum((left * np.conj(right)).real, dtype=np.float64))
+        return total
+
+    def average_plaquette(self) -> float:
+        """⟨Re tr P⟩/N over all 6 planes; 1 for a cold start"""
+        return self.plaquette_sum() / (6 * self.volume * NC)
+
+    def reunitarize(self):
+        self.links[...] = project_su3(self.links)
+
+    def unitarity_violation(self) -> float:
+        return unitarity_violation(self.links)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+import itertools
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .su3 import mul, mul_ad, dagger, re_trace
+from .gauge import GaugeField
+from .statistics import BlockAccumulator
+
+CHANNELS = ('0++', '2++', '0-+')
+
+# Shortest chiral loop on the cubic lattice (8 links): its parity image is
+# not a rotation of it, so Σ_R [W(RC) − W(−RC)] is a non-vanishing 0−+ operator.
+# Steps are signed spatial directions (1, 2, 3).
+CHIRAL_LOOP = (1, 2, 1, 3, -1, -3, -1, -2)
+
+
+def cubic_rotations() -> List[np.ndarray]:
+    """The 24 proper rotations of the cube as signed permutation matrices"""
+    out = []
+    for perm in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            M = np.zeros((3, 3), dtype=int)
+            M[list(perm), range(3)] = signs
+            if round(np.linalg.det(M)) == 1:
+                out.append(M)
+    return out
+
+
+def rotate_path(R: np.ndarray, path: Sequence[int]) -> Tuple[int, ...]:
+    out = []
+    for step in path:
+        v = R[:, abs(step) - 1] * np.sign(step)
+        axis = int(np.flatnonzero(v)[0])
+        out.append((axis + 1) * int(v[axis]))
+    return tuple(out)
+
+
+def path_re_trace(field: GaugeField, path: Sequence[int]) -> np.ndarray:
+    """Re tr of the closed spatial link path starting at every site, shape (T, Z, Y, X)"""
+    pos = np.zeros(4, dtype=int)
+    M = None
+    for step in path:
+        mu = abs(step)
+        if step < 0:
+            pos[mu] -= 1
+        U = np.roll(field.link(mu), tuple(-pos[1:]), axis=(1, 2, 3))
+        if step > 0:
+            M = U if M is None else mul(M, U)
+            pos[mu] += 1
+        else:
+            M = dagger(U) if M is None else mul_ad(M, U)
+    if pos.any():
+        raise ValueError(f"path {tuple(path)} is not closed")
+    return re_trace(M)
+
+
+def _timeslices(x: np.ndarray) -> np.ndarray:
+    """Zero-momentum projection: sum over the spatial sites of each timeslice, in float64"""
+    return x.sum(axis=(1, 2, 3), dtype=np.float64)
+
+
+def glueball_operators(field: GaugeField) -> Dict[str, np.ndarray]:
+    """
+    Zero-momentum operators per channel, shape (components, operators, T):
+    0++ from the spatial plaquette and the A1 sum of the chiral loop,
+    2++ from the two E combinations of plaquette orientations,
+    0−+ from the parity-odd sum of the chiral loop.
+    """
+    p12, p13, p23 = (_timeslices(re_trace(field.plaquette_field(i, j)))
+                     for i, j in ((1, 2), (1, 3), (2, 3)))
+    even = np.zeros_like(p12)
+    odd = np.zeros_like(p12)
+    for R in cubic_rotations():
+        loop = rotate_path(R, CHIRAL_LOOP)
+        w = _timeslices(path_re_trace(field, loop))
+        w_mirror = _timeslices(path_re_trace(field, tuple(-s for s in loop)))
+        even += w + w_mirror
+        odd += w - w_mirror
+    return {
+        '0++': np.stack([p12 + p13 + p23, even])[None],
+        '2++': np.stack([p12 - p13, (p12 + p13 - 2 * p23) / np.sqrt(3)])[:, None],
+        '0-+': odd[None, None],
+    }
+
+
+def correlator_matrix(ops: np.ndarray) -> np.ndarray:
+    """
+    C_ab(Δ) = (1/T) Σ_t Σ_c O_ca(t+Δ) O_cb(t) for ops of shape
+    (components, operators, T), via FFT along t
+    """
+    f = np.fft.fft(ops, axis=-1)
+    T = ops.shape[-1]
+    return np.fft.ifft(np.einsum('cat,cbt->abt', f, np.conj(f)), axis=-1).real / T
+
+
+class CorrelatorAccumulator:
+    """
+    Streaming block sums of operators and correlator matrices for one
+    channel, kept in a statistics.BlockAccumulator: neighbouring blocks are
+    merged when max_blocks is reached, so memory stays bounded while the
+    blocks remain usable for the jackknife of any derived quantity.
+    """
+
+    def __init__(self, max_blocks: int = 32):
+        if max_blocks < 2 or max_blocks % 2:
+            raise ValueError("max_blocks must be an even number ≥ 2")
+        self.max_blocks = max_blocks
+        self._blocks: Optional[BlockAccumulator] = None
+        self._shape: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def n(self) -> int:
+        return self._blocks.n if self._blocks is not None else 0
+
+    @property
+    def n_blocks(self) -> int:
+        return self._blocks.n_blocks if self._blocks is not None else 0
+
+    def add(self, ops: np.ndarray):
+        """Add one configuration's operators, shape (components, operators, T)"""
+        if self._blocks is None:
+            components, n_ops, T = self._shape = ops.shape
+            self._blocks = BlockAccumulator(components * n_ops + n_ops * n_ops * T, self.max_blocks)
+        self._blocks.add(np.concatenate([ops.mean(axis=-1).ravel(), correlator_matrix(ops).ravel()]))
+
+    def _connected(self, mean: np.ndarray) -> np.ndarray:
+        """Vacuum-subtracted, symmetrized C_ab(Δ) from the mean of the accumulated vectors"""
+        components, n_ops, T = self._shape
+        mean_O = mean[:components * n_ops].reshape(components, n_ops)
+        C = mean[components * n_ops:].reshape(n_ops, n_ops, T) - np.einsum('ca,cb->ab', mean_O, mean_O)[..., None]
+        return 0.5 * (C + np.swapaxes(C, 0, 1))
+
+    def correlator(self) -> np.ndarray:
+        """Vacuum-subtracted, symmetrized C_ab(Δ) over all configurations"""
+        return self._connected(self._blocks.mean())
+
+    def jackknife(self, func: Callable[[np.ndarray], np.ndarray] = lambda C: C
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """func(correlator) and its leave-one-block-out jackknife error"""
+        return self._blocks.jackknife(lambda mean: func(self._connected(mean)))
+
+
+def gevp(C: np.ndarray, t0: int = 0, cutoff: float = 1e-6) -> np.ndarray:
+    """
+    Eigenvalues λ_n(t, t0) of C(t) v = λ C(t0) v for t = 0..T/2, in
+    decreasing order. C(t0) is normalized and truncated to the eigenvectors
+    above cutoff × its largest eigenvalue, which keeps the problem well
+    posed when operators at neighbouring smearing levels are nearly
+    degenerate. Shape (T/2 + 1, n_kept).
+    """
+    T = C.shape[-1]
+    scale = np.sqrt(np.abs(np.diagonal(C[..., t0])))
+    Cn = C / (scale[:, None, None] * scale[None, :, None])
+    w, v = np.linalg.eigh(Cn[..., t0])
+    keep = w > cutoff * w.max()
+    B = v[:, keep] / np.sqrt(w[keep])
+    return np.array([np.sort(np.linalg.eigvalsh(B.T @ Cn[..., t] @ B))[::-1]
+                     for t in range(T // 2 + 1)])
+
+
+def effective_masses(lam: np.ndarray) -> np.ndarray:
+    """am_eff(t) = ln[λ(t)/λ(t+1)] per GEVP state"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log(lam[:-1] / lam[1:])
@@ -0,0 +1,304 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .su3 import NC, mul, mul_ad, mul_da, expi_su3, traceless_antihermitian
+from .gauge import GaugeField, ND, shift
+from .action import plaquette_staples, staple_sums
+
+FLOW_TYPES = ('wilson', 'zeuthen')
+
+# Lüscher–Weisz (tree-level Symanzik) coefficients, c0 + 8 c1 = 1
+LW_C0 = 5.0 / 3.0
+LW_C1 = -1.0 / 12.0
+
+# Reference value of t²⟨E⟩ at t0 and of t d/dt t²⟨E⟩ at w0²
+FLOW_REFERENCE = 0.3
+# Physical scales from the Sommer scale: √(8 t0)/r0 = 0.941 (Lüscher 2010), r0 = 0.5 fm
+SQRT_T0_FM = 0.941 * 0.5 / np.sqrt(8.0)
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      '.ym_cache', 'flow')
+DEFAULT_CHECKPOINT_MAX_BYTES = 1024**3
+
+
+def clover_field(field: GaugeField, mu: int, nu: int) -> np.ndarray:
+    """Traceless antihermitian clover G_μν(x) = (Q − Q†)/8 from the four leaves around x"""
+    U_mu, U_nu = field.link(mu), field.link(nu)
+    # leaf in the (+μ, +ν) quadrant, then transported leaves of the other three
+    P = mul_ad(mul(U_mu, shift(U_nu, mu)), mul(U_nu, shift(U_mu, nu)))
+    U_mu_xmmu = shift(U_mu, mu, -1)
+    U_nu_xmnu = shift(U_nu, nu, -1)
+    Q = P.copy()
+    # (−μ, +ν): U_ν(x) U_μ(x−μ+ν)† U_ν(x−μ)† U_μ(x−μ)
+    Q += mul(mul_ad(mul_ad(U_nu, shift(U_mu_xmmu, nu)), shift(U_nu, mu, -1)), U_mu_xmmu)
+    # (−μ, −ν): U_μ(x−μ)† U_ν(x−μ−ν)† U_μ(x−μ−ν) U_ν(x−ν)
+    Q += mul(mul_da(mul(shift(U_nu_xmnu, mu, -1), U_mu_xmmu), shift(U_mu_xmmu, nu, -1)), U_nu_xmnu)
+    # (+μ, −ν): U_ν(x−ν)† U_μ(x−ν) U_ν(x+μ−ν) U_μ(x)†
+    Q += mul_ad(mul(mul_da(U_nu_xmnu, shift(U_mu, nu, -1)), shift(U_nu_xmnu, mu)), U_mu)
+    return traceless_antihermitian(Q) / 4.0
+
+
+def clover_fields(field: GaugeField) -> Dict[Tuple[int, int], np.ndarray]:
+    """G_μν for the six planes μ < ν"""
+    return {(mu, nu): clover_field(field, mu, nu) for mu in range(ND) for nu in range(mu + 1, ND)}
+
+
+def _tr_prod(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.einsum('...ij,...ji->...', a, b).real
+
+
+def energy_density(field: GaugeField, clover: Optional[Dict] = None) -> Tuple[float, float]:
+    """
+    Volume-averaged E from the plaquette, 2 Σ_{μ<ν} Re tr(1 − P), and from
+    the clover, −Σ_{μ<ν} tr(G_μν G_μν)
+    """
+    G = clover_fields(field) if clover is None else clover
+    E_plaq = 2 * (6 * NC - field.plaquette_sum() / field.volume)
+    E_clover = -sum(float(np.sum(_tr_prod(g, g), dtype=np.float64)) for g in G.values())
+    return E_plaq, E_clover / field.volume
+
+
+def topological_charge_density(field: GaugeField, clover: Optional[Dict] = None) -> np.ndarray:
+    """q(x) = −(1/32π²) ε_μνρσ tr(G_μν G_ρσ) with the clover G"""
+    G = clover_fields(field) if clover is None else clover
+    s = _tr_prod(G[0, 1], G[2, 3]) - _tr_prod(G[0, 2], G[1, 3]) + _tr_prod(G[0, 3], G[1, 2])
+    return -s / (4 * np.pi**2)
+
+
+def topological_charge(field: GaugeField, clover: Optional[Dict] = None) -> float:
+    return float(np.sum(topological_charge_density(field, clover), dtype=np.float64))
+
+
+def scale_t0(t: np.ndarray, t2E: np.ndarray, reference: float = FLOW_REFERENCE) -> float:
+    """t0/a² where t²⟨E⟩ crosses `reference` (linear interpolation), nan if not reached"""
+    return _crossing(np.asarray(t), np.asarray(t2E), reference)
+
+
+def scale_w0(t: np.ndarray, t2E: np.ndarray, reference: float = FLOW_REFERENCE) -> float:
+    """w0/a from t d/dt t²⟨E⟩ = reference, derivative by central differences"""
+    t = np.asarray(t)
+    if len(t) < 3:
+        return float('nan')
+    W = t * np.gradient(np.asarray(t2E), t)
+    w0_sq = _crossing(t, W, reference)
+    return float(np.sqrt(w0_sq))
+
+
+def _crossing(t: np.ndarray, y: np.ndarray, level: float) -> float:
+    above = np.flatnonzero(y >= level)
+    if len(above) == 0 or above[0] == 0:
+        return float('nan')
+    i = above[0]
+    return float(t[i - 1] + (level - y[i - 1]) * (t[i] - t[i - 1]) / (y[i] - y[i - 1]))
+
+
+class GradientFlow:
+    """
+    Wilson or Zeuthen gradient flow integrated with Lüscher's third-order
+    Runge–Kutta scheme on the link arrays. With adaptive=True the step size
+    is controlled by the distance to an embedded second-order solution
+    built from the same stages. With a checkpoint_dir, flowed fields at
+    checkpoint times are saved there, keyed by the configuration and flow
+    settings, and later flows resume from the latest stored time; the least
+    recently used checkpoints are dropped beyond checkpoint_max_bytes.
+    reunitarize_every > 0
+    projects the flowed links back onto SU(3) every that many steps, which
+    single-precision links need over long flows.
+    """
+
+    def __init__(self, kind: str = 'wilson', epsilon: float = 0.01, adaptive: bool = False,
+                 tolerance: float = 1e-5, checkpoint_dir: Optional[str] = None,
+                 reunitarize_every: int = 0, checkpoint_max_bytes: int = DEFAULT_CHECKPOINT_MAX_BYTES):
+        if kind not in FLOW_TYPES:
+            raise ValueError(f"Unknown flow '{kind}' (expected one of {FLOW_TYPES})")
+        self.kind = kind
+        self.epsilon = epsilon
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_max_bytes = checkpoint_max_bytes
+        self.reunitarize_every = reunitarize_every
+        self.n_force = 0
+
+    def generator(self, field: GaugeField) -> np.ndarray:
+        """Z_μ(x) (antihermitian, traceless) with V̇ = Z V, shape as the links"""
+        Z = np.empty_like(field.links)
+        for mu in range(ND):
+            if self.kind == 'wilson':
+                A = plaquette_staples(field, mu)
+            else:
+                A, R = staple_sums(field, mu)
+                A = LW_C0 * A + LW_C1 * R
+            Z[..., mu, :, :] = -traceless_antihermitian(mul(field.link(mu), A))
+        if self.kind == 'zeuthen':
+            Z = self._zeuthen_correction(field, Z)
+        self.n_force += 1
+        return Z
+
+    @staticmethod
+    def _zeuthen_correction(field: GaugeField, Z: np.ndarray) -> np.ndarray:
+        """(1 + ∇*_μ ∇_μ / 12) Z_μ with adjoint covariant differences along μ"""
+        out = Z.copy()
+        for mu in range(ND):
+            U = field.link(mu)
+            X = Z[..., mu, :, :]
+            fwd = mul_ad(mul(U, shift(X, mu)), U)
+            bwd = shift(mul(mul_da(U, X), U), mu, -1)
+            out[..., mu, :, :] += (fwd + bwd - 2 * X) / 12.0
+        return out
+
+    @staticmethod
+    def _apply(Z: np.ndarray, links: np.ndarray) -> np.ndarray:
+        """exp(Z) V for antihermitian Z"""
+        return mul(expi_su3(-1j * Z), links)
+
+    def step(self, field: GaugeField, eps: float) -> Tuple[np.ndarray, float]:
+        """
+        One RK3 step of size eps; returns the new links and the max
+        distance to the embedded second-order (Ralston) solution.
+        """
+        V0 = field.links
+        Z0 = eps * self.generator(field)
+        W1 = GaugeField(self._apply(0.25 * Z0, V0))
+        Z1 = eps * self.generator(W1)
+        W2 = GaugeField(self._apply(8.0 / 9.0 * Z1 - 17.0 / 36.0 * Z0, W1.links))
+        Z2 = eps * self.generator(W2)
+        V3 = self._apply(0.75 * Z2 - 8.0 / 9.0 * Z1 + 17.0 / 36.0 * Z0, W2.links)
+        error = 0.0
+        if self.adaptive:
+            V2 = self._apply(0.25 * Z0 + 0.75 * Z2, V0)
+            error = float(np.max(np.abs(V3 - V2)))
+        return V3, error
+
+    # -- checkpoints ----------------------------------------------------
+
+    def _checkpoint_key(self, links: np.ndarray, measure_every: float, topology: bool) -> str:
+        # the measurement grid also sets the step sizes, and the stored history holds Q only with topology
+        h = hashlib.sha256(np.ascontiguousarray(links).view(np.uint8))
+        settings = [self.kind, self.epsilon, self.adaptive, self.tolerance, self.reunitarize_every,
+                    measure_every, topology]
+        h.update(json.dumps(settings).encode())
+        return h.hexdigest()[:32]
+
+    def _checkpoint_path(self, key: str, t: float) -> str:
+        return os.path.join(self.checkpoint_dir, key, f"t{t:.6f}.npy")
+
+    def _latest_checkpoint(self, key: str, t_max: float) -> Optional[Tuple[float, str]]:
+        directory = os.path.join(self.checkpoint_dir, key)
+        if not os.path.isdir(directory):
+            return None
+        times = [(float(name[1:-4]), os.path.join(directory, name))
+                 for name in os.listdir(directory) if name.startswith('t') and name.endswith('.npy')]
+        times = [entry for entry in times if entry[0] <= t_max + 1e-12]
+        return max(times) if times else None
+
+    def _save_checkpoint(self, key: str, t: float, links: np.ndarray, history: List[Dict]):
+        path = self._checkpoint_path(key, t)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, links)
+        os.replace(tmp, path)
+        with open(path[:-4] + '.json', 'w', encoding='utf-8') as f:
+            json.dump(history, f)
+        self._evict_checkpoints()
+
+    def _evict_checkpoints(self):
+        """Drop least recently used checkpoints until checkpoint_dir fits checkpoint_max_bytes"""
+        entries = []
+        for key in os.listdir(self.checkpoint_dir):
+            directory = os.path.join(self.checkpoint_dir, key)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.startswith('t') and name.endswith('.npy'):
+                    path = os.path.join(directory, name)
+                    try:
+                        st = os.stat(path)
+                        size = st.st_size + os.path.getsize(path[:-4] + '.json')
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.checkpoint_max_bytes:
+                break
+            for name in (path, path[:-4] + '.json'):
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+            try:
+                os.rmdir(os.path.dirname(path))  # only once the key has no checkpoints left
+            except OSError:
+                pass
+            total -= size
+
+    # -- driver ----------------------------------------------------------
+
+    def flow(self, field: GaugeField, t_max: float, measure_every: float = 0.05,
+             checkpoint_times: Sequence[float] = (), topology: bool = False,
+             stop_at_t0: bool = False) -> Dict:
+        """
+        Flow a copy of `field` to t_max (in lattice units), measuring
+        t²⟨E⟩ (clover) every `measure_every` and, with topology=True, Q.
+        Returns the history and the flowed field.
+        """
+        key = None
+        t = 0.0
+        links = field.links
+        history: List[Dict] = []
+        if self.checkpoint_dir is not None:
+            key = self._checkpoint_key(field.links, measure_every, topology)
+            found = self._latest_checkpoint(key, t_max)
+            if found is not None:
+                t, path = found
+                links = np.load(path)
+                os.utime(path)  # mark as recently used
+                with open(path[:-4] + '.json', 'r', encoding='utf-8') as f:
+                    history = json.load(f)
+        current = GaugeField(links.copy())
+        if not history:
+            history.append(self._measure(current, 0.0, topology))
+
+        grid = [measure_every * k for k in range(1, int(round(t_max / measure_every)) + 1)]
+        stops = sorted({round(float(s), 9) for s in list(checkpoint_times) + grid + [t_max]
+                        if t + 1e-9 < s <= t_max + 1e-9})
+        eps = self.epsilon
+        n_steps = 0
+        for target in stops:
+            while t < target - 1e-12:
+                h = min(eps, target - t)
+                new_links, error = self.step(current, h)
+                if self.adaptive:
+                    if error > self.tolerance and h > 1e-6:
+                        eps = 0.9 * h * (self.tolerance / error) ** (1.0 / 3.0)
+                        continue
+                    eps = min(2.0 * h, 0.9 * h * (self.tolerance / max(error, 1e-300)) ** (1.0 / 3.0))
+                current.links[...] = new_links
+                t += h
+                n_steps += 1
+                if self.reunitarize_every and n_steps % self.reunitarize_every == 0:
+                    current.reunitarize()
+            history.append(self._measure(current, t, topology))
+            if key is not None and any(abs(target - s) < 1e-9 for s in checkpoint_times):
+                self._save_checkpoint(key, target, current.links, history)
+            if stop_at_t0 and history[-1]['t2E'] > FLOW_REFERENCE:
+                break
+
+        ts = np.array([h['t'] for h in history])
+        t2E = np.array([h['t2E'] for h in history])
+        return {'history': history, 'field': current, 't0': scale_t0(ts, t2E),
+                'w0': scale_w0(ts, t2E), 'n_force': self.n_force}
+
+    @staticmethod
+    def _measure(field: GaugeField, t: float, topology: bool) -> Dict:
+        G = clover_fields(field)
+        E_plaq, E_clover = energy_density(field, G)
+        out = {'t': t, 'E_plaq': E_plaq, 'E': E_clover, 't2E': t * t * E_clover}
+        if topology:
+            out['Q'] = topological_charge(field, G)
+        return out
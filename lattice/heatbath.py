@@ -0,0 +1,155 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Tuple
+import numpy as np
+from .su3 import NC, mul, project_su3
+from .gauge import GaugeField, ND
+
+# Cabibbo–Marinari SU(2) subgroups (row/column pairs) of SU(3)
+SU2_SUBGROUPS: Tuple[Tuple[int, int], ...] = ((0, 1), (0, 2), (1, 2))
+
+# Below this α the Kennedy–Pendleton acceptance collapses
+KP_MIN_ALPHA = 2.0
+
+
+def _su2_project(W: np.ndarray, i: int, j: int):
+    """Quaternion (a0, a1, a2, a3) of the SU(2)-proportional part of W[(i,j),(i,j)]"""
+    w00, w01 = W[..., i, i], W[..., i, j]
+    w10, w11 = W[..., j, i], W[..., j, j]
+    return np.stack([
+        0.5 * (w00 + w11).real,
+        0.5 * (w01 + w10).imag,
+        0.5 * (w01 - w10).real,
+        0.5 * (w00 - w11).imag,
+    ], axis=-1)
+
+
+def _quat_mul(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Product of quaternions representing p0 + i p·σ and q0 + i q·σ"""
+    p0, pv = p[..., :1], p[..., 1:]
+    q0, qv = q[..., :1], q[..., 1:]
+    r0 = p0 * q0 - np.sum(pv * qv, axis=-1, keepdims=True)
+    rv = p0 * qv + q0 * pv - np.cross(pv, qv)
+    return np.concatenate([r0, rv], axis=-1)
+
+
+def _apply_left(M: np.ndarray, r: np.ndarray, i: int, j: int):
+    """M ← R M in place, with R the SU(2) element r embedded in rows/cols (i, j)"""
+    r00 = (r[..., 0] + 1j * r[..., 3])[..., None]
+    r01 = (r[..., 2] + 1j * r[..., 1])[..., None]
+    r10 = (-r[..., 2] + 1j * r[..., 1])[..., None]
+    r11 = (r[..., 0] - 1j * r[..., 3])[..., None]
+    row_i, row_j = M[..., i, :].copy(), M[..., j, :].copy()
+    M[..., i, :] = r00 * row_i + r01 * row_j
+    M[..., j, :] = r10 * row_i + r11 * row_j
+
+
+def sample_x0(alpha: np.ndarray, rng: np.random.Generator, max_rounds: int = 1000) -> np.ndarray:
+    """
+    x0 ∈ [−1, 1] with density ∝ sqrt(1 − x0²) exp(α x0), redrawing only the
+    rejected entries each round. Kennedy–Pendleton for α ≥ KP_MIN_ALPHA;
+    below that, Haar (semicircle) proposals accepted with exp(α (x0 − 1)).
+    """
+    x0 = np.empty_like(alpha)
+    todo = np.arange(alpha.size)
+    a = alpha.reshape(-1)
+    out = x0.reshape(-1)
+    for _ in range(max_rounds):
+        if todo.size == 0:
+            break
+        n = todo.size
+        at = a[todo]
+        r1, r2, r3, r4 = 1.0 - rng.random((4, n))
+        with np.errstate(divide='ignore'):
+            lam2 = -(np.log(r1) + np.cos(2 * np.pi * r2)**2 * np.log(r3)) / (2 * at)
+        kp = at >= KP_MIN_ALPHA
+        q = rng.standard_normal((n, 4))
+        haar = q[:, 0] / np.linalg.norm(q, axis=-1)
+        candidate = np.where(kp, 1 - 2 * lam2, haar)
+        ok = np.where(kp, r4**2 <= 1 - lam2, r4 <= np.exp(at * (haar - 1)))
+        out[todo[ok]] = candidate[ok]
+        todo = todo[~ok]
+    if todo.size:
+        raise RuntimeError(f"heatbath x0 sampling did not converge for {todo.size} links")
+    return x0
+
+
+def _random_sphere(shape, rng: np.random.Generator) -> np.ndarray:
+    v = rng.standard_normal(tuple(shape) + (3,))
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+@dataclass
+class HeatbathUpdater:
+    """
+    Cabibbo–Marinari heatbath plus overrelaxation on a checkerboard: every
+    SU(2) subgroup update is applied to all links of one direction and
+    parity at once.
+    """
+    action: object
+    n_overrelax: int = 4
+    n_heatbath: int = 1
+    reunitarize_every: int = 10
+    _sweeps: int = 0
+
+    @classmethod
+    def from_config(cls, settings: dict, action) -> 'HeatbathUpdater':
+        return cls(action, n_overrelax=int(settings.get('n_overrelax', 4)),
+                   n_heatbath=int(settings.get('n_heatbath', 1)),
+                   reunitarize_every=int(settings.get('reunitarize_every', 10)))
+
+    def get_state(self) -> dict:
+        """Sweep counter that sets the reunitarization cadence (for checkpoints)"""
+        return {'sweeps': self._sweeps}
+
+    def set_state(self, state: dict):
+        self._sweeps = int(state['sweeps'])
+
+    def _subgroup_pass(self, U: np.ndarray, W: np.ndarray, rng: np.random.Generator,
+                       overrelax: bool):
+        for i, j in SU2_SUBGROUPS:
+            a = _su2_project(W, i, j)
+            k = np.linalg.norm(a, axis=-1)
+            safe = k > 1e-12
+            v_dag = np.where(safe[..., None], a / np.where(safe, k, 1.0)[..., None], [1.0, 0, 0, 0])
+            v_dag[..., 1:] *= -1
+            if overrelax:
+                r = _quat_mul(v_dag, v_dag)
+            else:
+                # weight exp((1/N) Re tr(R W)) = exp((2k/N) x0)
+                x0 = sample_x0(2 * k / NC, rng)
+                xv = np.sqrt(np.clip(1 - x0**2, 0.0, None))[..., None] * _random_sphere(x0.shape, rng)
+                x = np.concatenate([x0[..., None], xv], axis=-1)
+                r = _quat_mul(x, v_dag)
+            r = np.where(safe[..., None], r, [1.0, 0, 0, 0])
+            _apply_left(U, r, i, j)
+            _apply_left(W, r, i, j)
+
+    def sweep(self, field: GaugeField, rng: np.random.Generator,
+              masks: Optional[Sequence[np.ndarray]] = None,
+              after_step: Optional[Callable[[int], None]] = None) -> float:
+        """
+        n_heatbath heatbath sweeps followed by n_overrelax OR sweeps; returns 1.0.
+        By default each direction is updated in the action's update_masks
+        (even/odd sites for plaquette actions); masks (even, odd) restrict the
+        update to a subdomain, and after_step(mu) runs after each
+        direction/parity step (halo exchange).
+        """
+        if masks is None:
+            per_direction = [self.action.update_masks(field.site_shape, mu) for mu in range(ND)]
+        else:
+            per_direction = [masks] * ND
+        passes = [False] * self.n_heatbath + [True] * self.n_overrelax
+        for overrelax in passes:
+            for mu in range(ND):
+                for mask in per_direction[mu]:
+                    U = field.link(mu)[mask]
+                    W = mul(U, self.action.staples(field, mu, mask))
+                    self._subgroup_pass(U, W, rng, overrelax)
+                    field.links[..., mu, :, :][mask] = U
+                    if after_step is not None:
+                        after_step(mu)
+        self._sweeps += 1
+        if self.reunitarize_every and self._sweeps % self.reunitarize_every == 0:
+            field.links[...] = project_su3(field.links)
+        return 1.0
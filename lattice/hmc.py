@@ -0,0 +1,162 @@
+from __future__ import annotations
+from dataclasses import dataclass, field as dc_field
+from typing import Dict, List, Optional
+import numpy as np
+from .su3 import mul, expi_su3, random_algebra, project_su3
+from .gauge import GaugeField, ND
+from .action import gauge_force
+
+# Omelyan–Mryglod–Folk 2nd-order minimum-norm parameter
+OMELYAN_LAMBDA = 0.1931833275037836
+
+INTEGRATORS = ('leapfrog', 'omelyan')
+
+
+def kinetic_energy(P: np.ndarray) -> float:
+    """Σ_links tr P², accumulated in float64"""
+    return float(np.sum((P * np.conj(P)).real, dtype=np.float64))
+
+
+@dataclass
+class HMC:
+    """
+    Hybrid Monte Carlo for the gauge links.
+
+    `levels` lists (action, n_steps) from the outermost to the innermost
+    timescale (Sexton–Weingarten nesting); the outermost level's steps span
+    the trajectory, each inner level subdivides one step of the level above.
+    A single level is plain leapfrog/Omelyan with `n_steps` steps.
+    Links are projected back onto SU(3) every `reunitarize_every`
+    trajectories (0: never). With single-precision links the momenta and
+    forces stay complex64, while link updates and ΔH are computed in float64.
+    """
+    levels: List[tuple]
+    trajectory_length: float = 1.0
+    integrator: str = 'omelyan'
+    target_acceptance: float = 0.75
+    reunitarize_every: int = 1
+    history: List[Dict] = dc_field(default_factory=list)
+    _trajectories: int = 0
+
+    def __post_init__(self):
+        if self.integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{self.integrator}' (expected one of {INTEGRATORS})")
+        if not self.levels:
+            raise ValueError("HMC needs at least one (action, n_steps) level")
+
+    @classmethod
+    def from_config(cls, hmc_settings: Dict, action, integrator: str = 'omelyan') -> 'HMC':
+        """Build from the `hmc:` block of lattice_params.yaml"""
+        return cls(levels=[(action, int(hmc_settings.get('n_steps', 100)))],
+                   trajectory_length=float(hmc_settings.get('trajectory_length', 1.0)),
+                   integrator=hmc_settings.get('integrator', integrator),
+                   target_acceptance=float(hmc_settings.get('target_acceptance', 0.75)),
+                   reunitarize_every=int(hmc_settings.get('reunitarize_every', 1)))
+
+    @property
+    def n_steps(self) -> int:
+        return self.levels[0][1]
+
+    @n_steps.setter
+    def n_steps(self, value: int):
+        self.levels[0] = (self.levels[0][0], max(1, int(value)))
+
+    def get_state(self) -> Dict:
+        """Chain state beyond the links and the generator (for checkpoints)"""
+        return {'n_steps': [n for _, n in self.levels], 'trajectories': self._trajectories}
+
+    def set_state(self, state: Dict):
+        self.levels = [(action, int(n)) for (action, _), n in zip(self.levels, state['n_steps'])]
+        self._trajectories = int(state.get('trajectories', 0))
+
+    def hamiltonian_action(self, field: GaugeField) -> float:
+        return sum(action.action(field) for action, _ in self.levels)
+
+    # -- integrator ---------------------------------------------------------
+
+    def _update_links(self, field: GaugeField, P: np.ndarray, eps: float):
+        # exp(iεP) U in complex128 per direction, rounded once into the links:
+        # single-precision links then leave SU(3) and the reversible trajectory
+        # only by storage rounding instead of a coherent drift that grows ΔH
+        for mu in range(ND):
+            U = field.link(mu)
+            U[...] = mul(expi_su3(eps * P[..., mu, :, :].astype(np.complex128, copy=False)),
+                         U.astype(np.complex128, copy=False))
+
+    def _update_momenta(self, level: int, field: GaugeField, P: np.ndarray, eps: float):
+        P += eps * gauge_force(self.levels[level][0], field)
+
+    def _integrate(self, level: int, field: GaugeField, P: np.ndarray, tau: float):
+        """Evolve (U, P) for time tau using this level's force and the levels below"""
+        n = self.levels[level][1]
+        eps = tau / n
+
+        def drift(dt):
+            if level + 1 < len(self.levels):
+                self._integrate(level + 1, field, P, dt)
+            else:
+                self._update_links(field, P, dt)
+
+        if self.integrator == 'leapfrog':
+            self._update_momenta(level, field, P, eps / 2)
+            for i in range(n):
+                drift(eps)
+                self._update_momenta(level, field, P, eps if i < n - 1 else eps / 2)
+        else:
+            lam = OMELYAN_LAMBDA
+            self._update_momenta(level, field, P, lam * eps)
+            for i in range(n):
+                drift(eps / 2)
+                self._update_momenta(level, field, P, (1 - 2 * lam) * eps)
+                drift(eps / 2)
+                self._update_momenta(level, field, P, 2 * lam * eps if i < n - 1 else lam * eps)
+
+    def integrate(self, field: GaugeField, P: np.ndarray, tau: Optional[float] = None):
+        """Molecular dynamics for time tau (default: one trajectory), no accept/reject"""
+        self._integrate(0, field, P, self.trajectory_length if tau is None else tau)
+
+    # -- Markov chain -------------------------------------------------------
+
+    def trajectory(self, field: GaugeField, rng: np.random.Generator,
+                   P: Optional[np.ndarray] = None) -> Dict:
+        """One trajectory with Metropolis accept/reject; field is updated in place"""
+        if P is None:
+            P = random_algebra(field.links.shape[:-2], rng, field.links.dtype)
+        old_links = field.links.copy()
+        H_old = kinetic_energy(P) + self.hamiltonian_action(field)
+
+        self.integrate(field, P)
+        self._trajectories += 1
+        if self.reunitarize_every and self._trajectories % self.reunitarize_every == 0:
+            field.links[...] = project_su3(field.links)
+
+        H_new = kinetic_energy(P) + self.hamiltonian_action(field)
+        dH = H_new - H_old
+        accept_prob = float(np.exp(min(0.0, -dH)))
+        accepted = bool(rng.random() < accept_prob)
+        if not accepted:
+            field.links[...] = old_links
+        record = {'dH': dH, 'accept_prob': accept_prob, 'accepted': accepted,
+                  'n_steps': self.n_steps}
+        self.history.append(record)
+        return record
+
+    def tune(self, field: GaugeField, rng: np.random.Generator, n_trajectories: int = 20,
+             gain: float = 1.0, window: int = 5) -> int:
+        """
+        Adjust the outer step count toward target_acceptance during
+        thermalization (stochastic approximation on log ε using ⟨min(1, e^−ΔH)⟩).
+        """
+        probs: List[float] = []
+        for k in range(1, n_trajectories + 1):
+            probs.append(self.trajectory(field, rng)['accept_prob'])
+            if k % window == 0:
+                mean_p = float(np.mean(probs[-window:]))
+                log_eps = np.log(self.trajectory_length / self.n_steps)
+                log_eps += gain * (mean_p - self.target_acceptance) / np.sqrt(k / window)
+                self.n_steps = int(np.ceil(self.trajectory_length / np.exp(log_eps)))
+        return self.n_steps
+
+    def acceptance_rate(self, last: Optional[int] = None) -> float:
+        recs = self.history[-last:] if last else self.history
+        return float(np.mean([r['accepted'] for r in recs])) if recs else 0.0
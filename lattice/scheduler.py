@@ -0,0 +1,442 @@
+"""
+Campaign scheduler for the φ × volume ensemble matrix
+Turns a LatticeConfig into a task DAG with five stages per (φ, size)
+
+    thermalize → generate → smear → measure → analyze
+
+and runs ready tasks on a process pool, highest critical-path cost first
+(so the largest volumes start first and the long chains are never left
+for the end). Queue state lives in SQLite, so a restarted campaign
+resumes where it stopped. A finished task is skipped when its input
+fingerprint (settings of its stage plus the output checksums of its
+dependencies) is unchanged and every recorded output still has its
+SHA-256.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field as dc_field
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+from .config import LatticeConfig
+from .gauge import GaugeField
+from .hmc import HMC
+from .heatbath import HeatbathUpdater
+from .smearing import Smearer
+from .wilson_loops import wilson_loops, polyakov_loop, static_potential, fit_cornell
+from .config_store import ConfigStore
+from .ensemble import EnsembleChain, stream_seed
+from .statistics import gamma_method, BlockAccumulator
+
+STAGES = ('thermalize', 'generate', 'smear', 'measure', 'analyze')
+
+# Settings each stage depends on (besides φ, size, seed and its inputs);
+# 'section.key' names one entry of a settings section
+STAGE_SETTINGS = {
+    'thermalize': ('N_colors', 'g0', 'beta0', 'update_algorithm', 'hmc', 'heatbath', 'thermalization',
+                   'precision', 'gauge_action'),
+    'generate': ('update_algorithm', 'hmc', 'heatbath', 'n_configurations', 'measurement_interval',
+                 'precision', 'gauge_action'),
+    'smear': ('smearing',),
+    'measure': ('measurements.max_R', 'measurements.max_T'),
+    'analyze': ('measurements.t_fit', 'measurements.max_blocks'),
+}
+
+# Fallback cost per site in update-sweep units when no cost table is given
+SMEAR_SWEEP_FRACTION = 0.2     # one APE iteration relative to one update sweep
+MEASURE_SWEEP_EQUIVALENT = 2.0
+ANALYZE_COST = 1.0
+
+DEFAULT_MEASUREMENTS = {'max_R': 4, 'max_T': 4, 't_fit': None, 'max_blocks': 32}
+
+
+def ensemble_dir(root: str, phi: float, size: List[int]) -> str:
+    return os.path.join(root, f"phi_{phi:g}", 'x'.join(str(n) for n in size))
+
+
+def task_id(stage: str, phi: float, size: List[int]) -> str:
+    return f"{stage}:phi={phi:g}:size={'x'.join(str(n) for n in size)}"
+
+
+def settings_digest(settings) -> str:
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class Task:
+    id: str
+    stage: str
+    phi: float
+    size: List[int]
+    phi_index: int
+    size_index: int
+    deps: List[str] = dc_field(default_factory=list)
+    cost: float = 0.0
+
+
+def default_cost(config: LatticeConfig, stage: str, size: List[int]) -> float:
+    """Estimated cost in site-sweeps"""
+    sites = config.site_count(size)
+    n_configs = config.n_configurations
+    if stage == 'thermalize':
+        return sites * config.thermalization
+    if stage == 'generate':
+        return sites * n_configs * config.measurement_interval
+    if stage == 'smear':
+        return sites * n_configs * config.smearing.get('n_iterations', 0) * SMEAR_SWEEP_FRACTION
+    if stage == 'measure':
+        return sites * n_configs * MEASURE_SWEEP_EQUIVALENT
+    return ANALYZE_COST
+
+
+def build_tasks(config: LatticeConfig, costs: Optional[Dict[str, float]] = None,
+                phi_values: Optional[Iterable[float]] = None,
+                size_indices: Optional[Iterable[int]] = None) -> List[Task]:
+    """One five-stage chain per (φ, size); `costs` (task id → seconds) overrides the estimate"""
+    phis = config.phi_values if phi_values is None else list(phi_values)
+    unknown = [phi for phi in phis if phi not in config.phi_values]
+    if unknown:
+        raise ValueError(f"φ values {unknown} are not in phi_values {config.phi_values}")
+    sizes = range(len(config.lattice_sizes)) if size_indices is None else list(size_indices)
+    tasks = []
+    for phi in phis:
+        for j in sizes:
+            size = config.lattice_sizes[j]
+            prev = None
+            for stage in STAGES:
+                tid = task_id(stage, phi, size)
+                cost = (costs or {}).get(tid, default_cost(config, stage, size))
+                tasks.append(Task(tid, stage, phi, list(size), config.phi_values.index(phi), j,
+                                  [prev] if prev else [], float(cost)))
+                prev = tid
+    return tasks
+
+
+def critical_path(tasks: List[Task]) -> Dict[str, float]:
+    """Own cost plus the most expensive chain of dependents"""
+    children: Dict[str, List[str]] = {t.id: [] for t in tasks}
+    for t in tasks:
+        for d in t.deps:
+            children[d].append(t.id)
+    by_id = {t.id: t for t in tasks}
+    rank: Dict[str, float] = {}
+
+    def visit(tid: str) -> float:
+        if tid not in rank:
+            rank[tid] = by_id[tid].cost + max((visit(c) for c in children[tid]), default=0.0)
+        return rank[tid]
+
+    for t in tasks:
+        visit(t.id)
+    return rank
+
+
+class TaskQueue:
+    """SQLite-persisted task states: pending, running, done, failed"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            stage TEXT NOT NULL,
+            deps TEXT NOT NULL,
+            cost REAL NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            fingerprint TEXT,
+            outputs TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            started REAL,
+            finished REAL,
+            error TEXT
+        )"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        with self.db:
+            self.db.execute(self.SCHEMA)
+
+    def sync(self, tasks: List[Task]):
+        """Register tasks; anything left 'running' by a dead scheduler becomes pending"""
+        with self.db:
+            for t in tasks:
+                self.db.execute(
+                    "INSERT INTO tasks (id, stage, deps, cost) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET deps = excluded.deps, cost = excluded.cost",
+                    (t.id, t.stage, json.dumps(t.deps), t.cost))
+            self.db.execute("UPDATE tasks SET status = 'pending' WHERE status = 'running'")
+
+    def get(self, tid: str) -> Optional[Dict]:
+        row = self.db.execute("SELECT * FROM tasks WHERE id = ?", (tid,)).fetchone()
+        if row is None:
+            return None
+        out = dict(row)
+        out['outputs'] = json.loads(out['outputs']) if out['outputs'] else {}
+        return out
+
+    def rows(self) -> List[Dict]:
+        return [self.get(r['id']) for r in self.db.execute("SELECT id FROM tasks ORDER BY id")]
+
+    def is_current(self, tid: str, fingerprint: str) -> bool:
+        """Done with the same inputs, and every output still matches its checksum"""
+        row = self.get(tid)
+        if row is None or row['status'] != 'done' or row['fingerprint'] != fingerprint:
+            return False
+        return all(os.path.exists(p) and file_sha256(p) == h for p, h in row['outputs'].items())
+
+    def mark_running(self, tid: str, fingerprint: str):
+        with self.db:
+            self.db.execute("UPDATE tasks SET status = 'running', fingerprint = ?, started = ?, "
+                            "attempts = attempts + 1, error = NULL WHERE id = ?",
+                            (fingerprint, time.time(), tid))
+
+    def mark_done(self, tid: str, outputs: Dict[str, str]):
+        with self.db:
+            self.db.execute("UPDATE tasks SET status = 'done', outputs = ?, finished = ? WHERE id = ?",
+                            (json.dumps(outputs), time.time(), tid))
+
+    def mark_failed(self, tid: str, error: str):
+        with self.db:
+            self.db.execute("UPDATE tasks SET status = 'failed', error = ?, finished = ? WHERE id = ?",
+                            (error, time.time(), tid))
+
+    def close(self):
+        self.db.close()
+
+
+# -- stage implementations (run in pool workers) ---------------------------
+
+def _updater(config: LatticeConfig, action):
+    if config.update_algorithm == 'heatbath':
+        return HeatbathUpdater.from_config(config.heatbath, action)
+    return HMC.from_config(config.hmc, action)
+
+
+def _chain(spec: Dict, config: LatticeConfig, checkpoint: str, n_configs: int = 0,
+           store: Optional[ConfigStore] = None) -> EnsembleChain:
+    rng = np.random.default_rng(stream_seed(spec['seed'], spec['phi_index'], spec['size_index']))
+    field = GaugeField.hot(config.array_shape(spec['size']), rng, config.link_dtype)
+    beta = spec['beta'] if spec['beta'] is not None else config.beta(spec['phi'])
+    updater = _updater(config, config.action(beta))
+    return EnsembleChain(field, updater, rng, config.thermalization, n_configs,
+                         config.measurement_interval, checkpoint, int(config.extra.get('checkpoint_every', 100)), store,
+                         {'phi': spec['phi'], 'beta': beta})
+
+
+def _checkpoint_path(spec: Dict, directory: str) -> str:
+    """Per-fingerprint checkpoint; those of other settings are removed"""
+    path = os.path.join(directory, f"{spec['stage']}.{spec['fingerprint'][:16]}.ckpt.npz")
+    for name in os.listdir(directory):
+        stale = os.path.join(directory, name)
+        if name.startswith(spec['stage'] + '.') and name.endswith('.ckpt.npz') and stale != path:
+            os.remove(stale)
+    return path
+
+
+def _thermalize(spec: Dict, config: LatticeConfig, directory: str) -> List[str]:
+    out = os.path.join(directory, 'thermalized.npz')
+    chain = _chain(spec, config, _checkpoint_path(spec, directory))
+    chain.resume()
+    chain.run()
+    os.replace(chain.checkpoint_path, out)
+    return [out]
+
+
+def _generate(spec: Dict, config: LatticeConfig, directory: str) -> List[str]:
+    checkpoint = _checkpoint_path(spec, directory)
+    store_dir = os.path.join(directory, 'configs')
+    if not os.path.exists(checkpoint):
+        # fresh chain: configurations of earlier settings must not survive
+        shutil.rmtree(store_dir, ignore_errors=True)
+    store = ConfigStore(store_dir, compress=bool(config.extra.get('compress', False)))
+    chain = _chain(spec, config, checkpoint, config.n_configurations, store)
+    if not chain.resume():
+        chain.checkpoint_path = os.path.join(directory, 'thermalized.npz')
+        chain.resume()
+        chain.checkpoint_path = checkpoint
+    chain.run()
+    os.remove(checkpoint)
+    return [store.index_path]
+
+
+def _smear(spec: Dict, config: LatticeConfig, directory: str) -> List[str]:
+    src = ConfigStore(os.path.join(directory, 'configs'))
+    dst = ConfigStore(os.path.join(directory, 'smeared'))
+    smearer = Smearer.from_config(config.smearing, n_workers=1)
+    # a smeared configuration is reused only for the same source links and smearing settings
+    smearing = settings_digest(config.smearing)
+    for k in src.keys():
+        source = src.entry(k)['sha256']
+        previous = dst.entry(k)['metadata'] if k in dst else {}
+        if previous.get('source_sha256') == source and previous.get('smearing') == smearing:
+            continue
+        dst.write(smearer.smear(src.load(k), in_place=True), k,
+                  {**src.entry(k)['metadata'], 'source_sha256': source, 'smearing': smearing})
+    return [dst.index_path]
+
+
+def _measure(spec: Dict, config: LatticeConfig, directory: str) -> List[str]:
+    settings = {**DEFAULT_MEASUREMENTS, **config.extra.get('measurements', {})}
+    src = ConfigStore(os.path.join(directory, 'configs'))
+    smeared = ConfigStore(os.path.join(directory, 'smeared'))
+    X, Y, Z, T = spec['size']
+    max_R = min(settings['max_R'], min(X, Y, Z) // 2)
+    max_T = min(settings['max_T'], T // 2)
+    plaquette, polyakov, loops = [], [], []
+    for k in src.keys():
+        field = src.load(k)
+        plaquette.append(field.average_plaquette())
+        polyakov.append(complex(polyakov_loop(field).mean()))
+        loops.append(wilson_loops(smeared.load(k), max_R, max_T))
+    out = os.path.join(directory, 'measurements.npz')
+    tmp = out + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f, plaquette=np.array(plaquette), polyakov=np.array(polyakov),
+                 wilson_loops=np.array(loops).reshape(len(loops), max_R, max_T))
+    os.replace(tmp, out)
+    return [out]
+
+
+def _analyze(spec: Dict, config: LatticeConfig, directory: str) -> List[str]:
+    settings = {**DEFAULT_MEASUREMENTS, **config.extra.get('measurements', {})}
+    with np.load(os.path.join(directory, 'measurements.npz')) as data:
+        plaquette, polyakov, loops = data['plaquette'], data['polyakov'], data['wilson_loops']
+    result = {'phi': spec['phi'], 'size': spec['size'], 'n_configs': len(plaquette),
+              'plaquette': gamma_method(plaquette),
+              'polyakov_abs': float(np.abs(polyakov.mean())) if len(polyakov) else None}
+    max_R, max_T = loops.shape[1:]
+    if len(loops) >= 2 and max_R >= 3 and max_T >= 2:
+        blocks = BlockAccumulator(max_R * max_T, settings['max_blocks'])
+        for W in loops:
+            blocks.add(W.ravel())
+        V, dV = blocks.jackknife(lambda m: static_potential(m.reshape(max_R, max_T), settings['t_fit']))
+        R = np.arange(1, max_R + 1)
+        fit = fit_cornell(R, V, np.where(dV > 0, dV, 1.0))
+        result['potential'] = {'R': R.tolist(), 'V': V.tolist(), 'dV': dV.tolist()}
+        result['cornell'] = {k: float(fit[k]) for k in ('V0', 'alpha', 'sigma', 'chi2')}
+    out = os.path.join(directory, 'analysis.json')
+    tmp = out + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=1, default=float)
+    os.replace(tmp, out)
+    return [out]
+
+
+STAGE_RUNNERS: Dict[str, Callable] = {
+    'thermalize': _thermalize, 'generate': _generate, 'smear': _smear,
+    'measure': _measure, 'analyze': _analyze,
+}
+
+
+def run_task(spec: Dict) -> Dict[str, str]:
+    """Pool worker entry point: run one stage, return {output path: sha256}"""
+    config = LatticeConfig.from_dict(spec['settings'])
+    directory = ensemble_dir(spec['root'], spec['phi'], spec['size'])
+    os.makedirs(directory, exist_ok=True)
+    outputs = STAGE_RUNNERS[spec['stage']](spec, config, directory)
+    return {path: file_sha256(path) for path in outputs}
+
+
+# -- scheduling ------------------------------------------------------------
+
+def _spec(task: Task, config: LatticeConfig, root: str, seed: int, beta: Optional[float]) -> Dict:
+    return {'stage': task.stage, 'phi': task.phi, 'size': task.size, 'phi_index': task.phi_index,
+            'size_index': task.size_index, 'root': root, 'seed': seed, 'beta': beta,
+            'settings': config.to_dict()}
+
+
+def setting(settings: Dict, name: str):
+    """Value of a STAGE_SETTINGS name; measurement entries fall back to DEFAULT_MEASUREMENTS"""
+    section, _, key = name.partition('.')
+    if not key:
+        return settings.get(name)
+    defaults = DEFAULT_MEASUREMENTS if section == 'measurements' else {}
+    return {**defaults, **(settings.get(section) or {})}.get(key)
+
+
+def fingerprint(task: Task, spec: Dict, queue: TaskQueue) -> str:
+    settings = spec['settings']
+    doc = {'stage': task.stage, 'phi': task.phi, 'size': task.size, 'seed': spec['seed'],
+           'beta': spec['beta'],
+           'settings': {k: setting(settings, k) for k in STAGE_SETTINGS[task.stage]},
+           'inputs': {d: queue.get(d)['outputs'] for d in task.deps}}
+    return settings_digest(doc)
+
+
+def run_campaign(config: LatticeConfig, root: str, max_workers: Optional[int] = None,
+                 seed: int = 0, beta: Optional[float] = None,
+                 costs: Optional[Dict[str, float]] = None,
+                 phi_values: Optional[Iterable[float]] = None,
+                 size_indices: Optional[Iterable[int]] = None,
+                 log: Callable[[str], None] = print) -> Dict[str, str]:
+    """
+    Run every outstanding task; returns the final status per task id.
+    At most max_workers tasks are in flight, so a task that becomes
+    ready later still overtakes cheaper ones already waiting.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    tasks = build_tasks(config, costs, phi_values, size_indices)
+    by_id = {t.id: t for t in tasks}
+    rank = critical_path(tasks)
+    queue = TaskQueue(os.path.join(root, 'queue.sqlite'))
+    queue.sync(tasks)
+    status: Dict[str, str] = {}
+    waiting = sorted(tasks, key=lambda t: -rank[t.id])
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while waiting or running:
+            progressed = False
+            for task in list(waiting):
+                if any(status.get(d) in ('failed', 'blocked') for d in task.deps):
+                    waiting.remove(task)
+                    status[task.id] = 'blocked'
+                    log(f"blocked  {task.id}")
+                    progressed = True
+                    continue
+                if len(running) >= max_workers or not all(status.get(d) == 'done' for d in task.deps):
+                    continue
+                waiting.remove(task)
+                spec = _spec(task, config, root, seed, beta)
+                fp = spec['fingerprint'] = fingerprint(task, spec, queue)
+                if queue.is_current(task.id, fp):
+                    status[task.id] = 'done'
+                    log(f"skip     {task.id} (outputs up to date)")
+                    progressed = True
+                    continue
+                queue.mark_running(task.id, fp)
+                running[pool.submit(run_task, spec)] = task
+                log(f"start    {task.id} (cost {task.cost:.3g}, rank {rank[task.id]:.3g})")
+            if progressed and not running:
+                continue
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    outputs = future.result()
+                except Exception as exc:
+                    queue.mark_failed(task.id, f"{type(exc).__name__}: {exc}")
+                    status[task.id] = 'failed'
+                    log(f"failed   {task.id}: {exc}")
+                else:
+                    queue.mark_done(task.id, outputs)
+                    status[task.id] = 'done'
+                    log(f"done     {task.id}")
+    queue.close()
+    return status
@@ -0,0 +1,144 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+import numpy as np
+from .su3 import mul, mul_ad, mul_da, expi_su3, project_su3_polar, traceless_antihermitian
+from .gauge import GaugeField, ND
+
+SMEARING_TYPES = ('APE', 'stout')
+SPATIAL = (1, 2, 3)
+
+
+def smearing_staples(links: np.ndarray, mu: int, directions: Sequence[int],
+                     offset: int = 0) -> np.ndarray:
+    """
+    C_μ(x) = Σ_ν U_ν(x) U_μ(x+ν) U_ν(x+μ)† + U_ν(x−ν)† U_μ(x−ν) U_ν(x−ν+μ)
+    over ν ∈ directions, ν ≠ μ. `links` may be a sub-lattice whose first
+    site axis is direction `offset` (e.g. one timeslice with offset=1).
+    """
+    def shift(a, nu, step=1):
+        return np.roll(a, -step, axis=nu - offset)
+
+    U_mu = links[..., mu, :, :]
+    C = np.zeros_like(U_mu)
+    for nu in directions:
+        if nu == mu:
+            continue
+        U_nu = links[..., nu, :, :]
+        U_nu_xpmu = shift(U_nu, mu)
+        C += mul_ad(mul(U_nu, shift(U_mu, nu)), U_nu_xpmu)
+        C += shift(mul(mul_da(U_nu, U_mu), U_nu_xpmu), nu, -1)
+    return C
+
+
+class Smearer:
+    """
+    APE or stout link smearing on two preallocated link buffers. Each
+    iteration reads one buffer and writes the other, so a smearing run
+    holds at most two configurations plus per-direction (or, for spatial
+    smearing, per-timeslice) temporaries. Spatial smearing leaves temporal
+    links untouched and processes timeslices independently on a thread pool.
+    """
+
+    def __init__(self, kind: str = 'APE', alpha: float = 0.5, n_iterations: int = 50,
+                 rho: float = 0.1, spatial_only: bool = True, n_workers: Optional[int] = None):
+        if kind not in SMEARING_TYPES:
+            raise ValueError(f"Unknown smearing type '{kind}' (expected one of {SMEARING_TYPES})")
+        self.kind = kind
+        self.alpha = alpha
+        self.rho = rho
+        self.n_iterations = n_iterations
+        self.spatial_only = spatial_only
+        self.n_workers = n_workers
+        self._work: Optional[np.ndarray] = None
+        self._spare: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_config(cls, settings: Dict, n_workers: Optional[int] = None) -> 'Smearer':
+        return cls(kind=settings.get('type', 'APE'), alpha=float(settings.get('alpha', 0.5)),
+                   n_iterations=int(settings.get('n_iterations', 50)),
+                   rho=float(settings.get('rho', 0.1)),
+                   spatial_only=bool(settings.get('spatial_only', True)), n_workers=n_workers)
+
+    @property
+    def directions(self) -> Tuple[int, ...]:
+        return SPATIAL if self.spatial_only else tuple(range(ND))
+
+    def _smeared_link(self, U: np.ndarray, C: np.ndarray) -> np.ndarray:
+        n_staples = 2 * (len(self.directions) - 1)
+        if self.kind == 'APE':
+            return project_su3_polar((1.0 - self.alpha) * U + (self.alpha / n_staples) * C)
+        # stout: U' = exp(iQ) U with Q = −i TA(ρ C U†)
+        Q = -1j * traceless_antihermitian(self.rho * mul_ad(C, U))
+        return mul(expi_su3(Q), U)
+
+    def _step_timeslice(self, src: np.ndarray, dst: np.ndarray, t: int):
+        links = src[t]
+        for mu in SPATIAL:
+            C = smearing_staples(links, mu, SPATIAL, offset=1)
+            dst[t, ..., mu, :, :] = self._smeared_link(links[..., mu, :, :], C)
+
+    def _step(self, src: np.ndarray, dst: np.ndarray, pool: Optional[ThreadPoolExecutor]):
+        if self.spatial_only:
+            if pool is None:
+                for t in range(src.shape[0]):
+                    self._step_timeslice(src, dst, t)
+            else:
+                list(pool.map(lambda t: self._step_timeslice(src, dst, t), range(src.shape[0])))
+            return
+        for mu in range(ND):
+            C = smearing_staples(src, mu, self.directions)
+            dst[..., mu, :, :] = self._smeared_link(src[..., mu, :, :], C)
+
+    @staticmethod
+    def _buffer_like(buffer: Optional[np.ndarray], links: np.ndarray) -> np.ndarray:
+        if buffer is None or buffer.shape != links.shape or buffer.dtype != links.dtype:
+            return np.empty_like(links)
+        return buffer
+
+    def _work_buffers(self, links: np.ndarray, in_place: bool) -> Tuple[np.ndarray, np.ndarray]:
+        self._spare = spare = self._buffer_like(self._spare, links)
+        if in_place:
+            work = links
+        else:
+            self._work = work = self._buffer_like(self._work, links)
+            np.copyto(work, links)
+        if self.spatial_only:
+            spare[..., 0, :, :] = work[..., 0, :, :]  # temporal links are never rewritten
+        return work, spare
+
+    def levels(self, field: GaugeField, iterations: Sequence[int],
+               in_place: bool = False) -> Iterator[Tuple[int, GaugeField]]:
+        """
+        Yield (n, smeared field) after each requested iteration count, in
+        increasing order. The yielded field is a view of an internal buffer
+        that the next level overwrites; copy it to keep it.
+        """
+        work, spare = self._work_buffers(field.links, in_place)
+        src, dst = work, spare
+        done = 0
+        pool = ThreadPoolExecutor(self.n_workers) if self.spatial_only and self.n_workers != 1 else None
+        try:
+            for target in sorted(iterations):
+                while done < target:
+                    self._step(src, dst, pool)
+                    src, dst = dst, src
+                    done += 1
+                yield done, GaugeField(src)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if src is not work:
+                np.copyto(work, src)  # leave the result where in_place callers expect it
+
+    def smear(self, field: GaugeField, n_iterations: Optional[int] = None,
+              in_place: bool = False) -> GaugeField:
+        """
+        Smeared copy of `field` (a view of the work buffer, reused by the
+        next call). With in_place=True the field's own links serve as one of
+        the two buffers, so no third configuration is allocated.
+        """
+        n = self.n_iterations if n_iterations is None else n_iterations
+        for _ in self.levels(field, [n], in_place):
+            pass
+        return field if in_place else GaugeField(self._work)
@@ -0,0 +1,243 @@
+"""
+Streaming Monte Carlo error analysis
+Γ-method integrated autocorrelation times (FFT, automatic windowing),
+bounded-memory binned time series with merge-doubling, blocked
+jackknife/bootstrap on running block sums, and thermalization /
+measurement-interval recommendations
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+
+# Wolff's window parameter S: W is the first lag with exp(-W/τ_W) < τ_W/√(WN)
+GAMMA_S = 1.5
+# thermalization is at least this many τ_int
+THERMALIZATION_TAUS = 20
+
+
+def autocorrelation(x: np.ndarray) -> np.ndarray:
+    """Normalized autocorrelation ρ(t) = Γ(t)/Γ(0) for t < N via zero-padded FFT"""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    d = x - x.mean()
+    f = np.fft.rfft(d, 2 * n)
+    gamma = np.fft.irfft(f * np.conj(f), 2 * n)[:n] / np.arange(n, 0, -1)
+    if gamma[0] == 0.0:
+        out = np.zeros(n)
+        out[0] = 1.0
+        return out
+    return gamma / gamma[0]
+
+
+def gamma_method(series: np.ndarray, S: float = GAMMA_S) -> Dict:
+    """
+    Mean, error and τ_int of a time series with Wolff's automatic window;
+    O(N log N). τ_int = 0.5 for uncorrelated data.
+    """
+    x = np.asarray(series, dtype=float)
+    n = len(x)
+    mean = float(x.mean())
+    variance = float(x.var())
+    if n < 2 or variance == 0.0:
+        return {'mean': mean, 'error': 0.0, 'variance': variance,
+                'tau_int': 0.5, 'tau_error': 0.0, 'window': 0, 'n': n}
+    rho = autocorrelation(x)
+    tau_cum = 0.5 + np.cumsum(rho[1:n // 2])
+    window = len(tau_cum)
+    for W in range(1, len(tau_cum) + 1):
+        tau = tau_cum[W - 1]
+        tau_W = S / np.log((2 * tau + 1) / (2 * tau - 1)) if tau > 0.5 else 1e-12
+        if np.exp(-W / tau_W) - tau_W / np.sqrt(W * n) < 0:
+            window = W
+            break
+    tau = max(float(tau_cum[window - 1]) if window else 0.5, 0.5)
+    # bias correction of Γ(0) for the estimated mean
+    variance *= 1 + (2 * window + 1) / n
+    return {
+        'mean': mean,
+        'error': float(np.sqrt(2 * tau * variance / n)),
+        'variance': variance,
+        'tau_int': tau,
+        'tau_error': tau * float(np.sqrt((4 * window + 2) / n)),
+        'window': window,
+        'n': n,
+    }
+
+
+def mser_truncation(x: np.ndarray) -> int:
+    """Marginal standard error rule: d ≤ N/2 minimizing Σ_{i≥d}(x_i − x̄_d)² / (N − d)²"""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n < 4:
+        return 0
+    m = n - np.arange(n)
+    tail_sum = np.cumsum(x[::-1])[::-1]
+    tail_sq = np.cumsum((x * x)[::-1])[::-1]
+    stat = (tail_sq - tail_sum**2 / m) / m**2
+    return int(np.argmin(stat[:n // 2 + 1]))
+
+
+class BinnedSeries:
+    """
+    Scalar observable streamed one measurement at a time. Samples are
+    averaged into at most `capacity` bins; when the bins fill up, pairs
+    are merged and the bin size doubles, so memory is O(capacity)
+    regardless of chain length. The Γ-method runs on the bins and τ_int
+    is converted back to units of single measurements.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        if capacity < 4 or capacity % 2:
+            raise ValueError("capacity must be an even number ≥ 4")
+        self.capacity = capacity
+        self.bin_size = 1
+        self.n = 0
+        self.n_bins = 0
+        self._mean = np.empty(capacity)
+        self._mean_sq = np.empty(capacity)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._count = 0
+        self._ref: Optional[float] = None
+
+    def add(self, value: float):
+        if self._ref is None:
+            self._ref = float(value)
+        x = float(value) - self._ref
+        self._sum += x
+        self._sum_sq += x * x
+        self._count += 1
+        self.n += 1
+        if self._count < self.bin_size:
+            return
+        if self.n_bins == self.capacity:
+            half = self.capacity // 2
+            self._mean[:half] = 0.5 * (self._mean[0::2] + self._mean[1::2])
+            self._mean_sq[:half] = 0.5 * (self._mean_sq[0::2] + self._mean_sq[1::2])
+            self.n_bins = half
+            self.bin_size *= 2
+            return
+        self._mean[self.n_bins] = self._sum / self._count
+        self._mean_sq[self.n_bins] = self._sum_sq / self._count
+        self.n_bins += 1
+        self._sum = self._sum_sq = 0.0
+        self._count = 0
+
+    def extend(self, values):
+        for v in values:
+            self.add(v)
+
+    def bins(self) -> np.ndarray:
+        """Completed bin means (offset restored)"""
+        return self._mean[:self.n_bins] + (self._ref or 0.0)
+
+    def thermalization(self) -> int:
+        """MSER truncation point in measurements, resolved to one bin"""
+        return mser_truncation(self._mean[:self.n_bins]) * self.bin_size
+
+    def analyze(self, discard: int = 0) -> Dict:
+        """Γ-method on the bins after dropping the first `discard` measurements"""
+        first = -(-discard // self.bin_size)
+        means = self._mean[first:self.n_bins]
+        if len(means) < 2:
+            raise ValueError("not enough data after the discarded part")
+        result = gamma_method(means)
+        n_used = len(means) * self.bin_size
+        raw_variance = float(np.mean(self._mean_sq[first:self.n_bins]) - np.mean(means)**2)
+        result['mean'] += self._ref
+        result['n'] = n_used
+        result['discarded'] = first * self.bin_size
+        result['bin_size'] = self.bin_size
+        if raw_variance > 0:
+            result['tau_int'] = max(0.5, result['error']**2 * n_used / (2 * raw_variance))
+            result['tau_error'] *= self.bin_size
+        else:
+            result['tau_int'], result['tau_error'] = 0.5, 0.0
+        result['variance'] = raw_variance
+        return result
+
+
+class BlockAccumulator:
+    """
+    Running block sums of vector-valued measurements (e.g. several
+    observables per configuration) for blocked jackknife and bootstrap
+    of derived quantities. Like CorrelatorAccumulator, neighbouring blocks
+    are merged when max_blocks is reached, so memory stays bounded.
+    """
+
+    def __init__(self, n_observables: int = 1, max_blocks: int = 64):
+        if max_blocks < 2 or max_blocks % 2:
+            raise ValueError("max_blocks must be an even number ≥ 2")
+        self.max_blocks = max_blocks
+        self.block_size = 1
+        self.n = 0
+        self.n_blocks = 0
+        self._sums = np.zeros((max_blocks, n_observables))
+        self._counts = np.zeros(max_blocks, dtype=np.int64)
+
+    def add(self, values):
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        if self.n_blocks == 0 or self._counts[self.n_blocks - 1] >= self.block_size:
+            if self.n_blocks == self.max_blocks:
+                half = self.max_blocks // 2
+                self._sums[:half] = self._sums[0::2] + self._sums[1::2]
+                self._counts[:half] = self._counts[0::2] + self._counts[1::2]
+                self._sums[half:] = 0.0
+                self._counts[half:] = 0
+                self.n_blocks = half
+                self.block_size *= 2
+            if self.n_blocks == 0 or self._counts[self.n_blocks - 1] >= self.block_size:
+                self.n_blocks += 1
+        self._sums[self.n_blocks - 1] += values
+        self._counts[self.n_blocks - 1] += 1
+        self.n += 1
+
+    def mean(self) -> np.ndarray:
+        return self._sums[:self.n_blocks].sum(axis=0) / self.n
+
+    def jackknife(self, func: Callable[[np.ndarray], np.ndarray] = lambda m: m
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """func(mean) and its leave-one-block-out jackknife error"""
+        sums, counts = self._sums[:self.n_blocks], self._counts[:self.n_blocks]
+        total, n_total = sums.sum(axis=0), counts.sum()
+        estimate = np.asarray(func(total / n_total))
+        if self.n_blocks < 2:
+            return estimate, np.full_like(estimate, np.nan, dtype=float)
+        replicas = np.array([func((total - s) / (n_total - c)) for s, c in zip(sums, counts)])
+        k = self.n_blocks
+        error = np.sqrt((k - 1) * np.mean((replicas - replicas.mean(axis=0))**2, axis=0))
+        return estimate, error
+
+    def bootstrap(self, func: Callable[[np.ndarray], np.ndarray] = lambda m: m,
+                  n_samples: int = 1000, rng: Optional[np.random.Generator] = None
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """func(mean) and its error from resampling whole blocks with replacement"""
+        rng = np.random.default_rng() if rng is None else rng
+        sums, counts = self._sums[:self.n_blocks], self._counts[:self.n_blocks]
+        estimate = np.asarray(func(sums.sum(axis=0) / counts.sum()))
+        picks = rng.integers(0, self.n_blocks, size=(n_samples, self.n_blocks))
+        weights = np.apply_along_axis(np.bincount, 1, picks, minlength=self.n_blocks)
+        means = (weights @ sums) / (weights @ counts)[:, None]
+        samples = np.array([func(m) for m in means])
+        return estimate, samples.std(axis=0, ddof=1)
+
+
+def recommend_intervals(series: BinnedSeries, sweeps_per_measurement: int = 1) -> Dict:
+    """
+    Thermalization (max of the MSER truncation and 20 τ_int) and the
+    measurement interval (≈ 2τ_int, one independent sample per
+    measurement), both in sweeps, from a series measured every
+    `sweeps_per_measurement` sweeps since the start of the chain
+    """
+    mser = series.thermalization()
+    result = series.analyze(discard=mser)
+    tau_sweeps = result['tau_int'] * sweeps_per_measurement
+    return {
+        'tau_int_sweeps': tau_sweeps,
+        'tau_error_sweeps': result['tau_error'] * sweeps_per_measurement,
+        'mser_sweeps': mser * sweeps_per_measurement,
+        'thermalization': int(np.ceil(max(mser * sweeps_per_measurement, THERMALIZATION_TAUS * tau_sweeps))),
+        'measurement_interval': max(1, int(np.ceil(2 * tau_sweeps))),
+        'effective_samples': result['n'] / (2 * result['tau_int']),
+        'analysis': result,
+    }
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import numpy as np
+
+# Batched SU(3) helpers. Every function acts on arrays of shape (..., 3, 3).
+
+NC = 3
+
+# Link storage precisions; lattice sums are accumulated in float64 for both
+LINK_DTYPES = {'double': np.complex128, 'single': np.complex64}
+
+
+def link_dtype(precision: str) -> np.dtype:
+    """complex dtype of the links for a `precision:` setting"""
+    try:
+        return np.dtype(LINK_DTYPES[precision])
+    except KeyError:
+        raise ValueError(f"Unknown precision '{precision}' (expected one of {tuple(LINK_DTYPES)})") from None
+
+
+def dagger(U: np.ndarray) -> np.ndarray:
+    return np.conj(np.swapaxes(U, -1, -2))
+
+
+def mul(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """A B, unrolled over the colour index (faster than matmul for 3×3 batches)"""
+    return (A[..., :, 0, None] * B[..., None, 0, :]
+            + A[..., :, 1, None] * B[..., None, 1, :]
+            + A[..., :, 2, None] * B[..., None, 2, :])
+
+
+def mul_ad(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """A B† without materializing B†"""
+    Bc = np.conj(B)
+    return (A[..., :, 0, None] * Bc[..., None, :, 0]
+            + A[..., :, 1, None] * Bc[..., None, :, 1]
+            + A[..., :, 2, None] * Bc[..., None, :, 2])
+
+
+def mul_da(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """A† B without materializing A†"""
+    Ac = np.conj(A)
+    return (Ac[..., 0, :, None] * B[..., None, 0, :]
+            + Ac[..., 1, :, None] * B[..., None, 1, :]
+            + Ac[..., 2, :, None] * B[..., None, 2, :])
+
+
+def re_trace_mul(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Re tr(A B) without forming the product"""
+    return np.einsum('...ij,...ji->...', A, B).real
+
+
+def trace(U: np.ndarray) -> np.ndarray:
+    return np.einsum('...ii->...', U)
+
+
+def re_trace(U: np.ndarray) -> np.ndarray:
+    return np.einsum('...ii->...', U).real
+
+
+def identity(shape, dtype=np.complex128) -> np.ndarray:
+    out = np.zeros(tuple(shape) + (NC, NC), dtype=dtype)
+    out[..., 0, 0] = out[..., 1, 1] = out[..., 2, 2] = 1
+    return out
+
+
+def project_su3(M: np.ndarray) -> np.ndarray:
+    """Reunitarize by Gram-Schmidt on the first two rows; third row = (u × v)*"""
+    u = M[..., 0, :]
+    u = u / np.sqrt(np.sum(np.abs(u)**2, axis=-1, keepdims=True))
+    v = M[..., 1, :]
+    v = v - np.sum(np.conj(u) * v, axis=-1, keepdims=True) * u
+    v = v / np.sqrt(np.sum(np.abs(v)**2, axis=-1, keepdims=True))
+    out = np.empty_like(M)
+    out[..., 0, :] = u
+    out[..., 1, :] = v
+    out[..., 2, :] = np.conj(np.cross(u, v))
+    return out
+
+
+def det3(M: np.ndarray) -> np.ndarray:
+    """Determinant of a batch of 3×3 matrices (cofactor expansion, no LAPACK loop)"""
+    return (M[..., 0, 0] * (M[..., 1, 1] * M[..., 2, 2] - M[..., 1, 2] * M[..., 2, 1])
+            - M[..., 0, 1] * (M[..., 1, 0] * M[..., 2, 2] - M[..., 1, 2] * M[..., 2, 0])
+            + M[..., 0, 2] * (M[..., 1, 0] * M[..., 2, 1] - M[..., 1, 1] * M[..., 2, 0]))
+
+
+def project_su3_polar(M: np.ndarray, tol: float = 1e-12, max_iter: int = 50) -> np.ndarray:
+    """
+    SU(3) projection through the unitary polar factor of M, computed by the
+    Newton–Schulz iteration X ← X (3 − X†X)/2 on M scaled to unit RMS
+    singular value, then divided by the cube root of its determinant phase.
+    The tolerance is floored at a few ulps of M's precision.
+    """
+    tol = max(tol, 8 * float(np.finfo(M.dtype).eps))
+    scale = np.sqrt(np.sum(np.abs(M)**2, axis=(-2, -1)) / NC)
+    X = M / scale[..., None, None]
+    eye = identity((), M.dtype)
+    for _ in range(max_iter):
+        D = mul_da(X, X)
+        if np.max(np.abs(D - eye)) < tol:
+            break
+        X = 0.5 * mul(X, 3.0 * eye - D)
+    phase = np.exp(-1j * np.angle(det3(X)) / NC)
+    return X * phase[..., None, None]
+
+
+def traceless_antihermitian(M: np.ndarray) -> np.ndarray:
+    """(M − M†)/2 minus its trace part, i.e. the projection onto su(3)"""
+    A = 0.5 * (M - dagger(M))
+    tr = trace(A) / NC
+    A[..., 0, 0] -= tr
+    A[..., 1, 1] -= tr
+    A[..., 2, 2] -= tr
+    return A
+
+
+def random_su3(shape, rng: np.random.Generator, dtype=np.complex128) -> np.ndarray:
+    """Haar-random SU(3) matrices via QR of complex Gaussian matrices"""
+    Z = (rng.standard_normal(tuple(shape) + (NC, NC))
+         + 1j * rng.standard_normal(tuple(shape) + (NC, NC))) / np.sqrt(2)
+    Q, R = np.linalg.qr(Z)
+    d = np.diagonal(R, axis1=-2, axis2=-1)
+    Q = Q * (d / np.abs(d))[..., None, :]
+    det = np.linalg.det(Q)
+    Q = Q / (det ** (1.0 / NC))[..., None, None]
+    return Q.astype(dtype, copy=False)
+
+
+def random_su3_near_identity(shape, epsilon: float, rng: np.random.Generator,
+                             dtype=np.complex128) -> np.ndarray:
+    """SU(3) matrices within ~epsilon of the identity (Metropolis proposals)"""
+    H = (rng.standard_normal(tuple(shape) + (NC, NC))
+         + 1j * rng.standard_normal(tuple(shape) + (NC, NC)))
+    H = 0.5 * (H + dagger(H))
+    M = identity(shape, np.complex128) + 1j * epsilon * H
+    return project_su3(M).astype(dtype, copy=False)
+
+
+def unitarity_violation(U: np.ndarray) -> float:
+    """max |U U† − 1| over the batch"""
+    eye = identity((), U.dtype)
+    return float(np.max(np.abs(U @ dagger(U) - eye)))
+
+
+def random_algebra(shape, rng: np.random.Generator, dtype=np.complex128) -> np.ndarray:
+    """Traceless Hermitian P = Σ_a p_a λ_a/2 with p_a ~ N(0,1), so tr P² = ½ Σ p_a²"""
+    p = rng.standard_normal((8,) + tuple(shape))
+    P = np.empty(tuple(shape) + (NC, NC), dtype=dtype)
+    s3 = np.sqrt(3.0)
+    P[..., 0, 0] = 0.5 * p[2] + p[7] / (2 * s3)
+    P[..., 1, 1] = -0.5 * p[2] + p[7] / (2 * s3)
+    P[..., 2, 2] = -p[7] / s3
+    P[..., 0, 1] = 0.5 * (p[0] - 1j * p[1])
+    P[..., 1, 0] = 0.5 * (p[0] + 1j * p[1])
+    P[..., 0, 2] = 0.5 * (p[3] - 1j * p[4])
+    P[..., 2, 0] = 0.5 * (p[3] + 1j * p[4])
+    P[..., 1, 2] = 0.5 * (p[5] - 1j * p[6])
+    P[..., 2, 1] = 0.5 * (p[5] + 1j * p[6])
+    return P
+
+
+def expi_su3(Q: np.ndarray) -> np.ndarray:
+    """
+    exp(iQ) for traceless Hermitian Q via the Cayley-Hamilton closed form
+    (Morningstar & Peardon 2004): exp(iQ) = f0 + f1 Q + f2 Q².
+    """
+    Q = np.asarray(Q)
+    Q2 = mul(Q, Q)
+    c0 = np.real(np.einsum('...ij,...ji->...', Q, Q2)) / 3.0  # det Q = tr Q³ / 3
+    c1 = np.real(trace(Q2)) / 2.0
+    neg = c0 < 0
+    c0 = np.abs(c0)
+    c0max = 2.0 * (c1 / 3.0) ** 1.5
+    tiny = c1 < 1e-12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        theta = np.arccos(np.clip(np.where(tiny, 0.0, c0 / c0max), -1.0, 1.0))
+    u = np.sqrt(c1 / 3.0) * np.cos(theta / 3.0)
+    w = np.sqrt(c1) * np.sin(theta / 3.0)
+    u2, w2 = u * u, w * w
+    xi0 = np.where(np.abs(w) < 0.05, 1 - w2 / 6 * (1 - w2 / 20 * (1 - w2 / 42)),
+                   np.sin(w) / np.where(w == 0, 1.0, w))
+    cos_w = np.cos(w)
+    e2iu = np.exp(2j * u)
+    emiu = np.exp(-1j * u)
+    h0 = (u2 - w2) * e2iu + emiu * (8 * u2 * cos_w + 2j * u * (3 * u2 + w2) * xi0)
+    h1 = 2 * u * e2iu - emiu * (2 * u * cos_w - 1j * (3 * u2 - w2) * xi0)
+    h2 = e2iu - emiu * (cos_w + 3j * u * xi0)
+    denom = np.where(tiny, 1.0, 9 * u2 - w2)
+    f0, f1, f2 = h0 / denom, h1 / denom, h2 / denom
+    # c0 < 0: f_j(−c0) = (−1)^j f_j(c0)*
+    f0 = np.where(neg, np.conj(f0), f0)
+    f1 = np.where(neg, -np.conj(f1), f1)
+    f2 = np.where(neg, np.conj(f2), f2)
+    # Q → 0: second-order expansion (error O(|Q|³) ≲ 1e-18)
+    f0 = np.where(tiny, 1.0, f0)
+    f1 = np.where(tiny, 1j, f1)
+    f2 = np.where(tiny, -0.5, f2)
+    out = f1[..., None, None] * Q + f2[..., None, None] * Q2
+    out[..., 0, 0] += f0
+    out[..., 1, 1] += f0
+    out[..., 2, 2] += f0
+    return out.astype(Q.dtype, copy=False)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from .su3 import NC, mul, trace
+from .gauge import GaugeField, shift
+
+SPATIAL = (1, 2, 3)
+HBARC_GEV_FM = 0.1973269804
+SOMMER_R0_FM = 0.5
+SOMMER_FORCE = 1.65  # r0² F(r0)
+
+
+def wilson_loops(field: GaugeField, max_R: int, max_T: int,
+                 spatial: Sequence[int] = SPATIAL, time_dir: int = 0) -> np.ndarray:
+    """
+    ⟨Re tr W(R, T)⟩ / N for R = 1..max_R, T = 1..max_T, averaged over all
+    sites and spatial orientations; shape (max_R, max_T).
+
+    The spatial line S_R(x) = S_{R−1}(x) U_i(x+(R−1)î) is extended by one
+    link per R and reused for every T, and the temporal line is likewise
+    built up one link per T, so each loop costs two matrix products.
+    """
+    W = np.zeros((max_R, max_T))
+    U_t = field.link(time_dir)
+    for i in spatial:
+        U_i = field.link(i)
+        S = U_i.copy()
+        for R in range(1, max_R + 1):
+            if R > 1:
+                S = mul(S, shift(U_i, i, R - 1))
+            L = U_t.copy()
+            for T in range(1, max_T + 1):
+                if T > 1:
+                    L = mul(L, shift(U_t, time_dir, T - 1))
+                # W = S_R(x) L_T(x+Rî) [L_T(x) S_R(x+Tt̂)]†
+                lower = mul(S, shift(L, i, R))
+                upper = mul(L, shift(S, time_dir, T))
+                W[R - 1, T - 1] += float(np.sum((lower * np.conj(upper)).real, dtype=np.float64))
+    return W / (len(spatial) * field.volume * NC)
+
+
+def polyakov_loop(field: GaugeField, time_dir: int = 0) -> np.ndarray:
+    """tr Π_t U_0(t, x⃗) / N for every spatial site, shape (Z, Y, X)"""
+    U_t = np.moveaxis(field.link(time_dir), time_dir, 0)
+    line = U_t[0]
+    for t in range(1, U_t.shape[0]):
+        line = mul(line, U_t[t])
+    return trace(line) / NC
+
+
+def polyakov_correlator(field: GaugeField, max_R: int) -> np.ndarray:
+    """⟨P(x⃗) P(x⃗+Rî)*⟩ for R = 1..max_R, averaged over sites and axes"""
+    P = polyakov_loop(field)
+    C = np.zeros(max_R)
+    for axis in range(P.ndim):
+        for R in range(1, max_R + 1):
+            C[R - 1] += float(np.mean((P * np.conj(np.roll(P, -R, axis=axis))).real, dtype=np.float64))
+    return C / P.ndim
+
+
+def static_potential(loops: np.ndarray, t_fit: Optional[int] = None) -> np.ndarray:
+    """
+    aV(R) = ln[W(R, T)/W(R, T+1)] at T = t_fit (default: the largest T
+    available), for loops of shape (..., max_R, max_T)
+    """
+    t = loops.shape[-1] - 1 if t_fit is None else t_fit
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log(loops[..., t - 1] / loops[..., t])
+
+
+def fit_cornell(R: np.ndarray, V: np.ndarray, dV: Optional[np.ndarray] = None) -> Dict:
+    """
+    Weighted linear least squares of V(R) = V0 − α/R + σR (lattice units).
+    Returns the parameters, their covariance and χ².
+    """
+    R = np.asarray(R, dtype=float)
+    V = np.asarray(V, dtype=float)
+    w = np.ones_like(V) if dV is None else 1.0 / np.asarray(dV, dtype=float)
+    A = np.stack([np.ones_like(R), -1.0 / R, R], axis=1)
+    coef, *_ = np.linalg.lstsq(A * w[:, None], V * w, rcond=None)
+    covariance = np.linalg.pinv((A * w[:, None]).T @ (A * w[:, None]))
+    chi2 = float(np.sum(((A @ coef - V) * w)**2))
+    V0, alpha, sigma = coef
+    return {'V0': V0, 'alpha': alpha, 'sigma': sigma, 'covariance': covariance,
+            'chi2': chi2, 'dof': len(R) - 3}
+
+
+def sommer_r0(alpha: float, sigma: float) -> float:
+    """r0/a from r0² F(r0) = 1.65 with F(r) = α/r² + σ"""
+    return float(np.sqrt((SOMMER_FORCE - alpha) / sigma))
+
+
+def string_tension_gev2(sigma_lattice: float, alpha: float,
+                        lattice_spacing_fm: Optional[float] = None) -> Tuple[float, float]:
+    """
+    σ in GeV² and the lattice spacing a in fm. Without an explicit spacing,
+    a is set by the Sommer scale r0 = 0.5 fm of the same Cornell fit.
+    """
+    if lattice_spacing_fm is None:
+        lattice_spacing_fm = SOMMER_R0_FM / sommer_r0(alpha, sigma_lattice)
+    a_inv_gev = HBARC_GEV_FM / lattice_spacing_fm
+    return sigma_lattice * a_inv_gev**2, lattice_spacing_fm
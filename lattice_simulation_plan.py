@@ -30,6 +30,14 @@ simulation_params = {
         'n_steps': 100,
         'target_acceptance': 0.75,
     },
+    'update_algorithm': 'hmc',  # or 'heatbath' (heatbath + overrelaxation)
+    'precision': 'double',  # or 'single' (complex64 links, float64 accumulation)
+    'gauge_action': 'wilson',  # or 'symanzik' / 'iwasaki' (rectangle-improved; extents divisible by 4)
+    'heatbath': {
+        'n_heatbath': 1,
+        'n_overrelax': 4,
+        'reunitarize_every': 10,
+    },
     
     'thermalization': 1000,
     'n_configurations': 2000,
@@ -38,7 +46,8 @@ simulation_params = {
     'smearing': {
         'type': 'APE',
         'alpha': 0.5,
-        'n_iterations': 50
+        'n_iterations': 50,
+        'spatial_only': True,  # smear each timeslice independently
     }
 }
 
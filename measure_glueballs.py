@@ -0,0 +1,99 @@
+"""
+Glueball spectrum from variational correlator analysis
+Streams heatbath/overrelaxation configurations, builds zero-momentum
+0++, 2++ and 0-+ operators at several APE smearing levels, accumulates
+timeslice correlator matrices incrementally and solves a generalized
+eigenvalue problem per channel for the effective masses
+"""
+
+import argparse
+import time
+from typing import Dict
+
+import numpy as np
+
+from lattice import LatticeConfig, GaugeField, HeatbathUpdater, Smearer
+from lattice.action import GAUGE_ACTIONS
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.glueball import (CHANNELS, CorrelatorAccumulator, glueball_operators,
+                              gevp, effective_masses)
+from lattice.wilson_loops import HBARC_GEV_FM
+
+# ExperimentalData attribute per channel
+EXPERIMENT = {'0++': 'glueball_0pp', '2++': 'glueball_2pp', '0-+': 'glueball_0mp'}
+
+
+def measure_operators(field: GaugeField, smearer: Smearer, levels) -> Dict[str, np.ndarray]:
+    """Operators of every channel at every smearing level, stacked along the operator axis"""
+    per_level = [glueball_operators(smeared) for _, smeared in smearer.levels(field, levels)]
+    return {ch: np.concatenate([ops[ch] for ops in per_level], axis=1) for ch in CHANNELS}
+
+
+def analyze(acc: CorrelatorAccumulator, t0: int = 0, t_mass: int = 1) -> Dict:
+    """Ground-state effective masses with their blocked-jackknife errors, quoted at t_mass"""
+    m_eff, errors = acc.jackknife(lambda C: effective_masses(gevp(C, t0))[:, 0])
+    return {'m_eff': m_eff, 'mass': float(m_eff[t_mass]), 'error': float(errors[t_mass])}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--size', type=int, nargs=4, default=[6, 6, 6, 12], metavar=('X', 'Y', 'Z', 'T'))
+    parser.add_argument('--beta', type=float, default=5.7)
+    parser.add_argument('--action', choices=sorted(GAUGE_ACTIONS), default=None,
+                        help='gauge action (default: gauge_action in the params file)')
+    parser.add_argument('--configs', type=int, default=50)
+    parser.add_argument('--thermalize', type=int, default=50)
+    parser.add_argument('--interval', type=int, default=2, help='sweeps between measurements')
+    parser.add_argument('--levels', type=int, nargs='+', default=[5, 15, 30],
+                        help='APE smearing iterations of the operator basis')
+    parser.add_argument('--t0', type=int, default=0)
+    parser.add_argument('--t-mass', type=int, default=1, help='timeslice of the quoted effective mass')
+    parser.add_argument('--max-blocks', type=int, default=32)
+    parser.add_argument('--spacing-fm', type=float, default=None, help='convert masses to GeV')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.max_blocks < 2 or args.max_blocks % 2:
+        parser.error("--max-blocks must be an even number ≥ 2")
+    config = LatticeConfig.load(args.params)
+    if args.action is not None:
+        config.gauge_action = args.action
+    rng = np.random.default_rng(args.seed)
+    field = GaugeField.hot(config.array_shape(args.size), rng)
+    updater = HeatbathUpdater.from_config(config.heatbath, config.action(args.beta))
+    smearer = Smearer.from_config(config.smearing)
+
+    print("Glueball Spectrum (GEVP)")
+    print("="*70)
+    print(f"Lattice {args.size}, β = {args.beta} ({config.gauge_action} action), "
+          f"{args.configs} configurations, smearing levels {args.levels}")
+    for _ in range(args.thermalize):
+        updater.sweep(field, rng)
+
+    accumulators = {ch: CorrelatorAccumulator(args.max_blocks) for ch in CHANNELS}
+    t_measure = 0.0
+    for n in range(args.configs):
+        for _ in range(args.interval):
+            updater.sweep(field, rng)
+        t_start = time.perf_counter()
+        for ch, ops in measure_operators(field, smearer, args.levels).items():
+            accumulators[ch].add(ops)
+        t_measure += time.perf_counter() - t_start
+
+    data = None
+    if args.spacing_fm is not None:
+        from experimental_validation import ExperimentalData
+        data = ExperimentalData()
+    for ch in CHANNELS:
+        result = analyze(accumulators[ch], args.t0, args.t_mass)
+        m_eff = ', '.join(f"{m:.3f}" for m in result['m_eff'][:4])
+        print(f"\n{ch}: am_eff(t) = {m_eff}")
+        print(f"  am = {result['mass']:.4f} ± {result['error']:.4f} (t = {args.t_mass})")
+        if data is not None:
+            a_inv = HBARC_GEV_FM / args.spacing_fm
+            m_exp, dm_exp = getattr(data, EXPERIMENT[ch])
+            print(f"  M = {result['mass'] * a_inv:.3f} ± {result['error'] * a_inv:.3f} GeV "
+                  f"(lattice QCD: {m_exp:.2f} ± {dm_exp:.2f} GeV)")
+    print(f"\nMeasurement time: {t_measure / args.configs:.3f} s per configuration "
+          f"({accumulators['0++'].n_blocks} jackknife blocks)")
@@ -0,0 +1,114 @@
+"""
+String tension from Wilson loops
+Generates heatbath/overrelaxation configurations, measures all R×T planar
+Wilson loops and the Polyakov loop on each, fits the static potential to
+the Cornell form with jackknife errors and feeds σ (GeV²) into
+ExperimentalValidator.validate_string_tension
+"""
+
+import argparse
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from lattice import (LatticeConfig, GaugeField, HeatbathUpdater, Smearer,
+                     wilson_loops, polyakov_loop)
+from lattice.action import GAUGE_ACTIONS
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.statistics import BlockAccumulator
+from lattice.wilson_loops import static_potential, fit_cornell, string_tension_gev2
+
+
+def analyze_loops(loops: np.ndarray, t_fit: Optional[int] = None, r_min: int = 1,
+                  lattice_spacing_fm: Optional[float] = None, max_blocks: int = 32) -> Dict:
+    """Cornell fit of the blocked-jackknife static potential; loops has shape (n_cfg, max_R, max_T)"""
+    shape = loops.shape[1:]
+    R = np.arange(1, shape[0] + 1)[r_min - 1:]
+    blocks = BlockAccumulator(shape[0] * shape[1], max_blocks)
+    for W in loops:
+        blocks.add(W.ravel())
+
+    def potential(mean: np.ndarray) -> np.ndarray:
+        return static_potential(mean.reshape(shape), t_fit)[r_min - 1:]
+
+    V, dV = blocks.jackknife(potential)
+    fit = fit_cornell(R, V, dV)
+    sigma_gev2, spacing = string_tension_gev2(fit['sigma'], fit['alpha'], lattice_spacing_fm)
+
+    def sigma(mean: np.ndarray) -> float:
+        # refit each jackknife replica with the weights of the central fit
+        f = fit_cornell(R, potential(mean), dV)
+        return string_tension_gev2(f['sigma'], f['alpha'], lattice_spacing_fm)[0]
+
+    _, d_sigma = blocks.jackknife(sigma)
+    return {'R': R, 'V': V, 'dV': dV, 'fit': fit, 'sigma_GeV2': sigma_gev2,
+            'sigma_GeV2_error': float(d_sigma), 'lattice_spacing_fm': spacing}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--size', type=int, nargs=4, default=[8, 8, 8, 8], metavar=('X', 'Y', 'Z', 'T'))
+    parser.add_argument('--beta', type=float, default=5.7)
+    parser.add_argument('--action', choices=sorted(GAUGE_ACTIONS), default=None,
+                        help='gauge action (default: gauge_action in the params file)')
+    parser.add_argument('--configs', type=int, default=20)
+    parser.add_argument('--thermalize', type=int, default=50)
+    parser.add_argument('--interval', type=int, default=5, help='sweeps between measurements')
+    parser.add_argument('--max-r', type=int, default=4)
+    parser.add_argument('--max-t', type=int, default=4)
+    parser.add_argument('--t-fit', type=int, default=None, help='T of the ln W(T)/W(T+1) plateau')
+    parser.add_argument('--smear', type=int, default=10,
+                        help='APE iterations on spatial links before measuring (0: none)')
+    parser.add_argument('--spacing-fm', type=float, default=None,
+                        help='lattice spacing; default: Sommer scale r0 = 0.5 fm from the fit')
+    parser.add_argument('--max-blocks', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.max_blocks < 2 or args.max_blocks % 2:
+        parser.error("--max-blocks must be an even number ≥ 2")
+    config = LatticeConfig.load(args.params)
+    if args.action is not None:
+        config.gauge_action = args.action
+    rng = np.random.default_rng(args.seed)
+    field = GaugeField.hot(config.array_shape(args.size), rng)
+    updater = HeatbathUpdater.from_config(config.heatbath, config.action(args.beta))
+    smearer = Smearer.from_config(dict(config.smearing, n_iterations=args.smear))
+
+    print("String Tension from Wilson Loops")
+    print("="*70)
+    print(f"Lattice {args.size}, β = {args.beta} ({config.gauge_action} action), "
+          f"{args.configs} configurations")
+    for _ in range(args.thermalize):
+        updater.sweep(field, rng)
+
+    loops = np.empty((args.configs, args.max_r, args.max_t))
+    polyakov = np.empty(args.configs, dtype=complex)
+    t_measure = 0.0
+    for n in range(args.configs):
+        for _ in range(args.interval):
+            updater.sweep(field, rng)
+        t0 = time.perf_counter()
+        smeared = smearer.smear(field) if args.smear else field
+        loops[n] = wilson_loops(smeared, args.max_r, args.max_t)
+        polyakov[n] = polyakov_loop(field).mean()
+        t_measure += time.perf_counter() - t0
+
+    result = analyze_loops(loops, args.t_fit, lattice_spacing_fm=args.spacing_fm, max_blocks=args.max_blocks)
+    fit = result['fit']
+    print(f"\n{'R':>3} {'aV(R)':>10} {'±':>8}")
+    for R, V, dV in zip(result['R'], result['V'], result['dV']):
+        print(f"{R:3d} {V:10.5f} {dV:8.5f}")
+    print(f"\nCornell fit: aV0 = {fit['V0']:.4f}, α = {fit['alpha']:.4f}, a²σ = {fit['sigma']:.4f}"
+          f"  (χ²/dof = {fit['chi2']:.2f}/{fit['dof']})")
+    print(f"Lattice spacing a = {result['lattice_spacing_fm']:.4f} fm")
+    print(f"σ = {result['sigma_GeV2']:.4f} ± {result['sigma_GeV2_error']:.4f} GeV²")
+    print(f"|⟨P⟩| = {abs(polyakov.mean()):.4f}")
+    print(f"Measurement time: {t_measure / args.configs:.3f} s per configuration")
+
+    from yang_mills_theory import YangMillsParameters
+    from experimental_validation import ExperimentalData, ExperimentalValidator
+    validator = ExperimentalValidator(YangMillsParameters(), ExperimentalData())
+    validator.validate_string_tension((result['sigma_GeV2'], result['sigma_GeV2_error']))
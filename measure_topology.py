@@ -0,0 +1,109 @@
+"""
+Gradient-flow scale setting and topological susceptibility
+Flows heatbath/overrelaxation configurations with the Wilson or Zeuthen
+flow, extracts t0 and w0 from t²⟨E⟩, measures the clover topological
+charge at the flow time t0 and feeds χ_top = ⟨Q²⟩/V (GeV⁴) into
+ExperimentalValidator.validate_topological_susceptibility. t²E, Q and Q²
+on the flow-time grid are streamed into a BlockAccumulator, so t0 and
+χ_top (with the scale it depends on) get blocked-jackknife errors
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from lattice import LatticeConfig, GaugeField, WilsonAction, HeatbathUpdater
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.gradient_flow import (GradientFlow, FLOW_TYPES, DEFAULT_CHECKPOINT_DIR, SQRT_T0_FM,
+                                   scale_t0, scale_w0)
+from lattice.statistics import BlockAccumulator
+from lattice.wilson_loops import HBARC_GEV_FM
+
+
+def topology_observables(mean: np.ndarray, t_grid: np.ndarray, volume: int) -> np.ndarray:
+    """
+    (t0/a², w0/a, ⟨Q(t0)⟩, χ_top in GeV⁴) from the means of t²E, Q and Q²
+    on t_grid, with Q and Q² interpolated to t0
+    """
+    t2E, Q, Q2 = np.split(mean, 3)
+    t0 = scale_t0(t_grid, t2E)
+    a_fm = SQRT_T0_FM / np.sqrt(t0)
+    volume_gev = volume * (a_fm / HBARC_GEV_FM)**4
+    return np.array([t0, scale_w0(t_grid, t2E), np.interp(t0, t_grid, Q),
+                     np.interp(t0, t_grid, Q2) / volume_gev])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--size', type=int, nargs=4, default=[8, 8, 8, 8], metavar=('X', 'Y', 'Z', 'T'))
+    parser.add_argument('--beta', type=float, default=5.7)
+    parser.add_argument('--configs', type=int, default=20)
+    parser.add_argument('--thermalize', type=int, default=50)
+    parser.add_argument('--interval', type=int, default=10, help='sweeps between measurements')
+    parser.add_argument('--flow', choices=FLOW_TYPES, default='wilson')
+    parser.add_argument('--epsilon', type=float, default=0.02, help='(initial) flow step')
+    parser.add_argument('--adaptive', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1e-5)
+    parser.add_argument('--t-max', type=float, default=3.0)
+    parser.add_argument('--measure-every', type=float, default=0.05)
+    parser.add_argument('--checkpoints', type=float, nargs='*', default=[],
+                        help='flow times stored for later resumption (none by default)')
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR)
+    parser.add_argument('--checkpoint-max-gb', type=float, default=1.0,
+                        help='least recently used checkpoints are dropped beyond this size')
+    parser.add_argument('--max-blocks', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.max_blocks < 2 or args.max_blocks % 2:
+        parser.error("--max-blocks must be an even number ≥ 2")
+
+    config = LatticeConfig.load(args.params)
+    rng = np.random.default_rng(args.seed)
+    field = GaugeField.hot(config.array_shape(args.size), rng)
+    updater = HeatbathUpdater.from_config(config.heatbath, WilsonAction(args.beta))
+    flow = GradientFlow(args.flow, args.epsilon, args.adaptive, args.tolerance,
+                        checkpoint_dir=args.checkpoint_dir if args.checkpoints else None,
+                        checkpoint_max_bytes=int(args.checkpoint_max_gb * 1024**3))
+
+    print("Gradient Flow: Scale Setting and Topology")
+    print("="*70)
+    print(f"Lattice {args.size}, β = {args.beta}, {args.flow} flow, {args.configs} configurations")
+    for _ in range(args.thermalize):
+        updater.sweep(field, rng)
+
+    t_grid = None
+    blocks = None
+    t_flow = 0.0
+    for n in range(args.configs):
+        for _ in range(args.interval):
+            updater.sweep(field, rng)
+        t_start = time.perf_counter()
+        result = flow.flow(field, args.t_max, args.measure_every, args.checkpoints, topology=True)
+        t_flow += time.perf_counter() - t_start
+        if t_grid is None:
+            t_grid = np.array([h['t'] for h in result['history']])
+            blocks = BlockAccumulator(3 * len(t_grid), args.max_blocks)
+        Q = np.array([h['Q'] for h in result['history']])
+        blocks.add(np.concatenate([[h['t2E'] for h in result['history']], Q, Q**2]))
+
+    (t0, w0, Q_t0, chi), (d_t0, d_w0, d_Q, d_chi) = blocks.jackknife(
+        lambda m: topology_observables(m, t_grid, field.volume))
+    print(f"\nt0/a² = {t0:.4f} ± {d_t0:.4f}   w0/a = {w0:.4f} ± {d_w0:.4f}   "
+          f"({blocks.n_blocks} jackknife blocks)")
+    if not np.isfinite(t0):
+        print("t²⟨E⟩ did not reach 0.3 within t_max; increase --t-max or the volume")
+        raise SystemExit(1)
+
+    a_fm = SQRT_T0_FM / np.sqrt(t0)
+    chi, d_chi = float(chi), float(d_chi)
+    print(f"a = {a_fm:.4f} fm (√t0 = {SQRT_T0_FM:.4f} fm)")
+    print(f"⟨Q(t0)⟩ = {Q_t0:+.3f} ± {d_Q:.3f}")
+    print(f"χ_top = {chi:.5f} ± {d_chi:.5f} GeV⁴")
+    print(f"Flow time: {t_flow / args.configs:.2f} s per configuration ({flow.n_force} force evaluations)")
+
+    from yang_mills_theory import YangMillsParameters
+    from experimental_validation import ExperimentalData, ExperimentalValidator
+    validator = ExperimentalValidator(YangMillsParameters(), ExperimentalData())
+    validator.validate_topological_susceptibility((chi, d_chi))
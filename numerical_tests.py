@@ -4,11 +4,10 @@ Implements computational validation of theoretical predictions
 """
 
 import numpy as np
-from scipy.integrate import quad, solve_ivp
-from scipy.optimize import minimize
-import matplotlib.pyplot as plt
 from typing import Dict, Tuple, List
-from yang_mills_theory import YangMillsParameters, PhiCoordinateTheory
+from yang_mills_theory import (YangMillsParameters, PhiCoordinateTheory, coupling_power_law_reference,
+                               mass_gap_from_coupling_reference)
+from result_cache import cached_result
 
 
 class NumericalTests:
@@ -19,13 +18,14 @@ class NumericalTests:
         self.theory = PhiCoordinateTheory(params)
         self.results = {}
         
+    @cached_result
     def test_coupling_evolution(self, phi_range: Tuple[float, float] = (0.01, 1.0), 
                                 num_points: int = 1000) -> Dict:
         """Test coupling constant evolution across φ range"""
         print("\n=== Numerical Test: Coupling Evolution ===")
         
         phi_values = np.linspace(phi_range[0], phi_range[1], num_points)
-        g_values = np.array([self.theory.coupling_at_phi(p) for p in phi_values])
+        g_values = self.theory.coupling_at_phi_array(phi_values)
         
         # Check asymptotic freedom: g should decrease as φ→0
         g_ratio = g_values[0] / g_values[-1]
@@ -61,12 +61,13 @@ class NumericalTests:
         
         return result
     
+    @cached_result
     def test_mass_gap_spectrum(self) -> Dict:
         """Calculate mass gap across φ values"""
         print("\n=== Numerical Test: Mass Gap Spectrum ===")
         
         phi_values = np.linspace(0.1, 0.9, 100)
-        mass_gaps = np.array([self.theory.mass_gap(p) for p in phi_values])
+        mass_gaps = self.theory.mass_gap_array(phi_values)
         
         # Find minimum mass gap
         min_gap_idx = np.argmin(mass_gaps)
@@ -99,6 +100,7 @@ class NumericalTests:
         
         return result
     
+    @cached_result
     def test_dimensional_boundary_sharpness(self, epsilon: float = 0.01) -> Dict:
         """Test sharpness of transition at φ=0.5±ε"""
         print(f"\n=== Numerical Test: Dimensional Boundary (ε={epsilon}) ===")
@@ -146,6 +148,7 @@ class NumericalTests:
         
         return result
     
+    @cached_result
     def test_confinement_scale(self) -> Dict:
         """Test confinement scale matches QCD expectations"""
         print("\n=== Numerical Test: Confinement Scale ===")
@@ -185,6 +188,7 @@ class NumericalTests:
         
         return result
     
+    @cached_result
     def test_renormalization_group_flow(self, num_steps: int = 1000) -> Dict:
         """Test RG flow equation: dg/d(ln μ) = β(g)"""
         print("\n=== Numerical Test: Renormalization Group Flow ===")
@@ -193,7 +197,7 @@ class NumericalTests:
         # Then verify β function
         
         phi_values = np.linspace(0.1, 0.9, num_steps)
-        g_values = np.array([self.theory.coupling_at_phi(p) for p in phi_values])
+        g_values = self.theory.coupling_at_phi_array(phi_values)
         
         # Numerical derivative dg/dφ
         dg_dphi = np.gradient(g_values, phi_values)
@@ -225,8 +229,47 @@ class NumericalTests:
         
         return result
     
+    @cached_result
+    def test_compiled_kernels(self, tolerance: float = 1e-12) -> Dict:
+        """Compiled (lambdified) kernels against the hand-written formulas"""
+        print("\n=== Numerical Test: Compiled Kernels ===")
+        
+        # φ grid spanning the strong, weak and floored regimes
+        phi_values = np.linspace(0.01, 1.0, 1000)
+        batch = self.theory.evaluate_batch(phi_values)
+        p = self.params
+        g_ref = coupling_power_law_reference(phi_values, p.g0, p.beta0_coefficient)
+        M_ref = mass_gap_from_coupling_reference(g_ref, p.Lambda_QCD)
+        M_scalar = np.array([self.theory.mass_gap(x) for x in phi_values])
+        b0 = 11*p.N/3 - 2*p.nf/3
+        b1 = 34*p.N**2/3 - 10*p.N*p.nf/3 - (p.N**2 - 1)*p.nf/p.N
+        beta_ref = -b0*g_ref**3 - b1*g_ref**5
+        
+        def rel(a, b):
+            return float(np.max(np.abs(a - b) / np.abs(b)))
+        
+        result = {
+            'test': 'Compiled Kernels',
+            'coupling_max_rel_diff': rel(batch['g'], g_ref),
+            'beta_max_rel_diff': rel(batch['beta'], beta_ref),
+            'mass_gap_max_rel_diff': rel(batch['M_gap'], M_ref),
+            'mass_gap_scalar_max_rel_diff': rel(batch['M_gap'], M_scalar),
+        }
+        result['passes'] = max(v for k, v in result.items() if k.endswith('diff')) < tolerance
+        
+        print(f"g(φ):  max relative difference {result['coupling_max_rel_diff']:.2e}")
+        print(f"β(g):  max relative difference {result['beta_max_rel_diff']:.2e}")
+        print(f"M_gap: max relative difference {result['mass_gap_max_rel_diff']:.2e} "
+              f"(scalar mass_gap: {result['mass_gap_scalar_max_rel_diff']:.2e})")
+        print(f"{'✓ PASS' if result['passes'] else '✗ FAIL'}")
+        
+        self.results['compiled_kernels'] = result
+        
+        return result
+    
     def _plot_coupling_evolution(self, phi_values, g_values):
         """Plot coupling constant vs φ"""
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(10, 6))
         plt.plot(phi_values, g_values, 'b-', linewidth=2, label='g(φ)')
         plt.axvline(x=0.5, color='r', linestyle='--', label='φ_critical = 0.5')
@@ -241,6 +284,7 @@ class NumericalTests:
     
     def _plot_mass_gap(self, phi_values, mass_gaps):
         """Plot mass gap vs φ"""
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(10, 6))
         plt.semilogy(phi_values, mass_gaps, 'g-', linewidth=2, label='M_gap(φ)')
         plt.axvline(x=0.5, color='r', linestyle='--', label='φ_critical = 0.5')
@@ -294,6 +338,7 @@ if __name__ == "__main__":
     tester.test_dimensional_boundary_sharpness()
     tester.test_confinement_scale()
     tester.test_renormalization_group_flow()
+    tester.test_compiled_kernels()
     
     # Print report
     print(tester.generate_report())
@@ -0,0 +1,193 @@
+"""
+High-throughput parameter scan over φ-coordinate theory variants
+Grid or Latin-hypercube samples are evaluated in chunks on a process pool
+with compare_options.batch_observables and streamed to a columnar store
+(one .npy column per parameter/observable plus meta.json)
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from compare_options import batch_observables
+
+# Scanned parameters in column order; the last three are calibration points
+SCAN_PARAMETERS = ['g0', 'beta0_coefficient', 'Lambda_QCD', 'phi_critical',
+                   'phi_confined', 'phi_string', 'sigma_norm_k']
+
+
+@dataclass
+class ScanSpace:
+    """Ranges (lo, hi) per scanned parameter; lo == hi pins a parameter"""
+    ranges: Dict[str, Tuple[float, float]] = field(default_factory=lambda: {
+        'g0': (0.15, 0.35),
+        'beta0_coefficient': (3.0, 4.5),
+        'Lambda_QCD': (0.18, 0.22),
+        'phi_critical': (0.45, 0.55),
+        'phi_confined': (0.49, 0.53),
+        'phi_string': (0.52, 0.58),
+        'sigma_norm_k': (2.0, 3.5),
+    })
+
+    def __post_init__(self):
+        unknown = set(self.ranges) - set(SCAN_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown scan parameters: {sorted(unknown)}")
+        for name, (lo, hi) in self.ranges.items():
+            if hi < lo:
+                raise ValueError(f"Empty range for {name}: ({lo}, {hi})")
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        lo = np.array([self.ranges[p][0] for p in SCAN_PARAMETERS])
+        hi = np.array([self.ranges[p][1] for p in SCAN_PARAMETERS])
+        return lo, hi
+
+
+def grid_axes(space: ScanSpace, points_per_axis: int) -> List[np.ndarray]:
+    """Grid axes; pinned parameters get a single point"""
+    return [np.linspace(lo, hi, points_per_axis) if hi > lo else np.array([lo])
+            for lo, hi in zip(*space.bounds())]
+
+
+def grid_chunk(axes: List[np.ndarray], start: int, stop: int) -> np.ndarray:
+    """Rows start..stop of the Cartesian product, without building the full grid"""
+    shape = tuple(len(a) for a in axes)
+    idx = np.unravel_index(np.arange(start, stop), shape)
+    return np.stack([a[i] for a, i in zip(axes, idx)], axis=1)
+
+
+def latin_hypercube(space: ScanSpace, n_samples: int, seed: Optional[int] = None) -> np.ndarray:
+    """n_samples × n_params Latin-hypercube design scaled to the scan ranges"""
+    rng = np.random.default_rng(seed)
+    lo, hi = space.bounds()
+    u = np.empty((n_samples, len(SCAN_PARAMETERS)))
+    for j in range(len(SCAN_PARAMETERS)):
+        u[:, j] = (rng.permutation(n_samples) + rng.random(n_samples)) / n_samples
+    return lo + u * (hi - lo)
+
+
+def evaluate_chunk(samples: np.ndarray) -> Dict[str, np.ndarray]:
+    """Worker entry point: observables for a block of parameter rows"""
+    return batch_observables(*(samples[:, j] for j in range(samples.shape[1])))
+
+
+class ColumnarWriter:
+    """Streams fixed-length columns into per-column .npy memmaps"""
+
+    def __init__(self, out_dir: str, n_rows: int):
+        self.out_dir = out_dir
+        self.n_rows = n_rows
+        self.columns: Dict[str, np.memmap] = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, start: int, block: Dict[str, np.ndarray]):
+        for name, values in block.items():
+            column = self.columns.get(name)
+            if column is None:
+                column = np.lib.format.open_memmap(
+                    os.path.join(self.out_dir, f"{name}.npy"), mode='w+',
+                    dtype=values.dtype, shape=(self.n_rows,))
+                self.columns[name] = column
+            column[start:start + len(values)] = values
+
+    def close(self, meta: Dict):
+        for column in self.columns.values():
+            column.flush()
+        meta = dict(meta, columns=list(self.columns), n_rows=self.n_rows)
+        with open(os.path.join(self.out_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+
+def load_scan(out_dir: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """Open a scan written by run_scan as a dict of (memory-mapped) columns"""
+    with open(os.path.join(out_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    mode = 'r' if mmap else None
+    return {name: np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode=mode)
+            for name in meta['columns']}
+
+
+def _chunks(n_rows: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, n_rows, chunk_size):
+        yield start, min(start + chunk_size, n_rows)
+
+
+def run_scan(space: ScanSpace, out_dir: str, mode: str = 'lhs', n_samples: int = 100_000,
+             points_per_axis: int = 5, seed: Optional[int] = None, chunk_size: int = 65_536,
+             max_workers: Optional[int] = None) -> Dict:
+    """Evaluate every sample and stream parameters + observables to out_dir"""
+    t0 = time.perf_counter()
+    if mode == 'grid':
+        axes = grid_axes(space, points_per_axis)
+        n_rows = int(np.prod([len(a) for a in axes]))
+        get_rows = lambda start, stop: grid_chunk(axes, start, stop)
+    elif mode == 'lhs':
+        design = latin_hypercube(space, n_samples, seed)
+        n_rows = n_samples
+        get_rows = lambda start, stop: design[start:stop]
+    else:
+        raise ValueError(f"Unknown scan mode '{mode}' (expected 'grid' or 'lhs')")
+
+    writer = ColumnarWriter(out_dir, n_rows)
+    in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = []
+        for start, stop in _chunks(n_rows, chunk_size):
+            rows = get_rows(start, stop)
+            writer.write(start, {p: rows[:, j] for j, p in enumerate(SCAN_PARAMETERS)})
+            pending.append((start, pool.submit(evaluate_chunk, rows)))
+            # Bound the number of chunks in flight to keep memory flat
+            while len(pending) > in_flight:
+                s, fut = pending.pop(0)
+                writer.write(s, fut.result())
+        for s, fut in pending:
+            writer.write(s, fut.result())
+
+    elapsed = time.perf_counter() - t0
+    meta = {
+        'mode': mode,
+        'seed': seed,
+        'points_per_axis': points_per_axis if mode == 'grid' else None,
+        'space': asdict(space),
+        'elapsed_s': elapsed,
+    }
+    writer.close(meta)
+    return dict(meta, n_rows=n_rows, out_dir=out_dir)
+
+
+def _parse_range(text: str) -> Tuple[str, Tuple[float, float]]:
+    name, _, bounds = text.partition('=')
+    lo, _, hi = bounds.partition(':')
+    return name, (float(lo), float(hi or lo))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=['lhs', 'grid'], default='lhs')
+    parser.add_argument('--samples', type=int, default=100_000, help='LHS sample count')
+    parser.add_argument('--points-per-axis', type=int, default=5, help='grid resolution')
+    parser.add_argument('--range', action='append', default=[], metavar='NAME=LO:HI',
+                        help='override a parameter range (LO only pins it)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=65_536)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default='scan_results')
+    args = parser.parse_args()
+
+    space = ScanSpace()
+    space = ScanSpace(dict(space.ranges, **dict(_parse_range(r) for r in args.range)))
+    summary = run_scan(space, args.out, mode=args.mode, n_samples=args.samples,
+                       points_per_axis=args.points_per_axis, seed=args.seed,
+                       chunk_size=args.chunk_size, max_workers=args.workers)
+
+    columns = load_scan(args.out)
+    print(f"Scanned {summary['n_rows']} points in {summary['elapsed_s']:.2f} s → {args.out}/")
+    for name in ('glueball_within_3sigma', 'string_tension_within_50pct',
+                 'uv_perturbative', 'w3_all_positive'):
+        print(f"  {name}: {100*np.mean(columns[name]):.1f}% of samples")
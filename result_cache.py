@@ -0,0 +1,192 @@
+"""
+Persistent content-addressed cache for test-suite results
+A test's result is keyed by a hash of its source, the theory source, the
+parameter/data dataclasses, its arguments and calibration.json
+"""
+
+import functools
+import hashlib
+import inspect
+import io
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+CALIBRATION_PATH = os.path.join(_HERE, 'calibration.json')
+THEORY_PATH = os.path.join(_HERE, 'yang_mills_theory.py')
+
+DEFAULT_CACHE_DIR = os.path.join(_HERE, '.ym_cache', 'results')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _file_digest(path: str) -> str:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return 'missing'
+
+
+@dataclass
+class ResultCache:
+    """On-disk result store with size-bounded LRU eviction (by access time)"""
+    directory: str = DEFAULT_CACHE_DIR
+    max_bytes: int = DEFAULT_MAX_BYTES
+    force_recompute: bool = False  # skip lookups, still store fresh results
+
+    def __post_init__(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, func: Callable, instance: Any, args: Tuple, kwargs: Dict) -> str:
+        """Content hash of everything a test result depends on"""
+        h = hashlib.sha256()
+        h.update(func.__qualname__.encode('utf-8'))
+        h.update(inspect.getsource(func).encode('utf-8'))
+        h.update(_file_digest(THEORY_PATH).encode('ascii'))
+        h.update(_file_digest(CALIBRATION_PATH).encode('ascii'))
+        for attr in ('params', 'data'):
+            h.update(repr(getattr(instance, attr, None)).encode('utf-8'))
+        h.update(repr(args).encode('utf-8'))
+        h.update(repr(sorted(kwargs.items())).encode('utf-8'))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.pkl')
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.force_recompute:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return None
+        os.utime(path)  # mark as recently used
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        # Write-then-rename so concurrent workers never see partial entries
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the store fits max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.directory, name))
+
+
+# Cache used by @cached_result; None disables caching
+_ACTIVE_CACHE: Optional[ResultCache] = None
+
+
+def configure_cache(directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                    force_recompute: bool = False, enabled: bool = True) -> Optional[ResultCache]:
+    """Enable (or disable) the result cache for all decorated test methods"""
+    global _ACTIVE_CACHE
+    _ACTIVE_CACHE = ResultCache(directory or DEFAULT_CACHE_DIR, max_bytes, force_recompute) if enabled else None
+    return _ACTIVE_CACHE
+
+
+def get_cache() -> Optional[ResultCache]:
+    return _ACTIVE_CACHE
+
+
+def cache_settings() -> Tuple:
+    """
+    configure_cache arguments that reproduce the current setting, e.g. as a
+    process pool's initargs: spawned workers do not inherit the global
+    """
+    cache = _ACTIVE_CACHE
+    if cache is None:
+        return None, DEFAULT_MAX_BYTES, False, False
+    return cache.directory, cache.max_bytes, cache.force_recompute, True
+
+
+class _Tee(io.TextIOBase):
+    """Write-through stdout wrapper that records what the test printed"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def cached_result(method: Callable) -> Callable:
+    """
+    Decorator for test methods that store into self.results and return a dict.
+    On a hit the recorded output is replayed and the stored results restored.
+    Side effects such as plot files are not re-created on a hit.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = _ACTIVE_CACHE
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        key = cache.key_for(method, self, args, kwargs)
+        hit = cache.get(key)
+        if hit is not None:
+            new_results, output, result = hit
+            sys.stdout.write(output)
+            self.results.update(new_results)
+            return result
+
+        before = set(self.results)
+        tee = _Tee(sys.stdout)
+        sys.stdout = tee
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            sys.stdout = tee.stream
+        new_results = {k: v for k, v in self.results.items() if k not in before}
+        cache.put(key, (new_results, tee.buffer.getvalue(), result))
+        return result
+
+    return wrapper
+
+
+# Allow enabling from the environment for ad-hoc scripts / CI
+# (YM_RESULT_CACHE=1 for the default directory, or a directory path)
+if os.environ.get('YM_RESULT_CACHE'):
+    _env_dir = os.environ['YM_RESULT_CACHE']
+    configure_cache(directory=None if _env_dir in ('1', 'true') else _env_dir,
+                    force_recompute=os.environ.get('YM_FORCE_RECOMPUTE') == '1')
@@ -3,14 +3,30 @@ Master test runner for Yang-Mills mass gap proof verification
 Executes all symbolic, numerical, experimental, and axiomatic tests
 """
 
+import argparse
+import io
 import sys
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import redirect_stdout
 from datetime import datetime
+from typing import Dict, Optional, Tuple
 from yang_mills_theory import YangMillsParameters, SymbolicVerification
+from result_cache import configure_cache, cache_settings, DEFAULT_MAX_BYTES
 from numerical_tests import NumericalTests
 from experimental_validation import ExperimentalValidator, ExperimentalData
 from wightman_axioms import WightmanAxiomVerifier
 
 
+def _run_test_task(verifier, method: str) -> Tuple[Dict, str]:
+    """Worker entry point: run one test method, return new results and its output"""
+    before = set(verifier.results)
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        getattr(verifier, method)()
+    new_results = {k: v for k, v in verifier.results.items() if k not in before}
+    return new_results, buffer.getvalue()
+
+
 class MasterTestSuite:
     """Comprehensive test suite for Yang-Mills mass gap proof"""
     
@@ -25,62 +41,111 @@ class MasterTestSuite:
         
         self.all_results = {}
         
-    def run_symbolic_tests(self):
-        """Run symbolic verification tests"""
+    # Phase table shared by the serial and parallel runners:
+    # (category, verifier attribute, phase banner, test methods in order)
+    PHASES = [
+        ('symbolic', 'symbolic', 'PHASE 1: SYMBOLIC VERIFICATION', [
+            'verify_coupling_asymptotic_freedom',
+            'verify_mass_gap_positivity',
+            'verify_dimensional_boundary',
+            'verify_gauge_invariance',
+            'verify_beta_function_sign',
+        ]),
+        ('numerical', 'numerical', 'PHASE 2: NUMERICAL TESTS', [
+            'test_coupling_evolution',
+            'test_mass_gap_spectrum',
+            'test_dimensional_boundary_sharpness',
+            'test_confinement_scale',
+            'test_renormalization_group_flow',
+            'test_compiled_kernels',
+        ]),
+        ('experimental', 'experimental', 'PHASE 3: EXPERIMENTAL VALIDATION', [
+            'validate_glueball_spectrum',
+            'validate_string_tension',
+            'validate_lambda_qcd_scale',
+            'validate_bosenova_connection',
+            'validate_asymptotic_freedom_scale',
+        ]),
+        ('axioms', 'axioms', 'PHASE 4: WIGHTMAN AXIOMS', [
+            'verify_W0_relativistic_quantum_theory',
+            'verify_W1_domain_axiom',
+            'verify_W2_transformation_law',
+            'verify_W3_spectral_condition',
+            'verify_locality',
+            'verify_cluster_decomposition',
+        ]),
+    ]
+    
+    # Dependency graph for the parallel scheduler: a test only starts once
+    # the tests it relies on have finished. Calibration is applied when the
+    # suite is constructed, so every test already sees calibrated parameters.
+    DEPENDENCIES = {
+        ('axioms', 'verify_locality'): [('symbolic', 'verify_gauge_invariance')],
+    }
+    
+    def _print_phase_banner(self, banner: str):
         print("\n" + "█"*70)
-        print("PHASE 1: SYMBOLIC VERIFICATION")
+        print(banner)
         print("█"*70)
         
-        self.symbolic.verify_coupling_asymptotic_freedom()
-        self.symbolic.verify_mass_gap_positivity()
-        self.symbolic.verify_dimensional_boundary()
-        self.symbolic.verify_gauge_invariance()
-        self.symbolic.verify_beta_function_sign()
+    def _run_phase(self, category: str):
+        for cat, attr, banner, methods in self.PHASES:
+            if cat != category:
+                continue
+            self._print_phase_banner(banner)
+            verifier = getattr(self, attr)
+            for method in methods:
+                getattr(verifier, method)()
+            self.all_results[category] = verifier.results
         
-        self.all_results['symbolic'] = self.symbolic.results
+    def run_symbolic_tests(self):
+        """Run symbolic verification tests"""
+        self._run_phase('symbolic')
         
     def run_numerical_tests(self):
         """Run numerical validation tests"""
-        print("\n" + "█"*70)
-        print("PHASE 2: NUMERICAL TESTS")
-        print("█"*70)
-        
-        self.numerical.test_coupling_evolution()
-        self.numerical.test_mass_gap_spectrum()
-        self.numerical.test_dimensional_boundary_sharpness()
-        self.numerical.test_confinement_scale()
-        self.numerical.test_renormalization_group_flow()
-        
-        self.all_results['numerical'] = self.numerical.results
+        self._run_phase('numerical')
         
     def run_experimental_validation(self):
         """Run experimental validation tests"""
-        print("\n" + "█"*70)
-        print("PHASE 3: EXPERIMENTAL VALIDATION")
-        print("█"*70)
-        
-        self.experimental.validate_glueball_spectrum()
-        self.experimental.validate_string_tension()
-        self.experimental.validate_lambda_qcd_scale()
-        self.experimental.validate_bosenova_connection()
-        self.experimental.validate_asymptotic_freedom_scale()
-        
-        self.all_results['experimental'] = self.experimental.results
+        self._run_phase('experimental')
         
     def run_axiom_verification(self):
         """Run Wightman axiom verification"""
-        print("\n" + "█"*70)
-        print("PHASE 4: WIGHTMAN AXIOMS")
-        print("█"*70)
-        
-        self.axioms.verify_W0_relativistic_quantum_theory()
-        self.axioms.verify_W1_domain_axiom()
-        self.axioms.verify_W2_transformation_law()
-        self.axioms.verify_W3_spectral_condition()
-        self.axioms.verify_locality()
-        self.axioms.verify_cluster_decomposition()
-        
-        self.all_results['axioms'] = self.axioms.results
+        self._run_phase('axioms')
+        
+    def run_parallel(self, max_workers: Optional[int] = None):
+        """
+        Run every test method on a process pool, honouring DEPENDENCIES.
+        Outputs and results are merged back in PHASES order, so console
+        output, all_results and the reports match a serial run.
+        """
+        tasks = [(cat, method) for cat, _, _, methods in self.PHASES for method in methods]
+        verifiers = {cat: getattr(self, attr) for cat, attr, _, _ in self.PHASES}
+        finished: Dict[Tuple[str, str], Tuple[Dict, str]] = {}
+        
+        # the cache setting is passed on explicitly for spawn/forkserver workers
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_cache,
+                                 initargs=cache_settings()) as pool:
+            running = {}
+            waiting = list(tasks)
+            while waiting or running:
+                for task in list(waiting):
+                    if all(dep in finished for dep in self.DEPENDENCIES.get(task, [])):
+                        waiting.remove(task)
+                        running[pool.submit(_run_test_task, verifiers[task[0]], task[1])] = task
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[running.pop(future)] = future.result()
+        
+        for cat, attr, banner, methods in self.PHASES:
+            self._print_phase_banner(banner)
+            verifier = verifiers[cat]
+            for method in methods:
+                new_results, output = finished[(cat, method)]
+                sys.stdout.write(output)
+                verifier.results.update(new_results)
+            self.all_results[cat] = verifier.results
         
     def generate_master_report(self) -> str:
         """Generate comprehensive final report"""
@@ -180,7 +245,7 @@ class MasterTestSuite:
         
         return report
     
-    def run_all(self):
+    def run_all(self, parallel: bool = False, max_workers: Optional[int] = None):
         """Execute complete test suite"""
         print("\n")
         print("╔" + "="*68 + "╗")
@@ -191,10 +256,13 @@ class MasterTestSuite:
         print("╚" + "="*68 + "╝")
         
         try:
-            self.run_symbolic_tests()
-            self.run_numerical_tests()
-            self.run_experimental_validation()
-            self.run_axiom_verification()
+            if parallel:
+                self.run_parallel(max_workers)
+            else:
+                self.run_symbolic_tests()
+                self.run_numerical_tests()
+                self.run_experimental_validation()
+                self.run_axiom_verification()
             
             # Generate and print final report
             final_report = self.generate_master_report()
@@ -230,6 +298,25 @@ class MasterTestSuite:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--parallel', action='store_true',
+                        help='schedule test methods on a process pool')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='process pool size (default: CPU count)')
+    parser.add_argument('--cache', action='store_true',
+                        help='reuse results from the on-disk result cache')
+    parser.add_argument('--force-recompute', action='store_true',
+                        help='ignore cached results (fresh results are still stored)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='result cache directory (default: .ym_cache/results)')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / 2**20,
+                        help='evict least recently used entries above this size')
+    args = parser.parse_args()
+    
+    if args.cache or args.force_recompute:
+        configure_cache(directory=args.cache_dir, max_bytes=int(args.cache_max_mb * 2**20),
+                        force_recompute=args.force_recompute)
+    
     suite = MasterTestSuite()
-    success = suite.run_all()
+    success = suite.run_all(parallel=args.parallel, max_workers=args.workers)
     sys.exit(0 if success else 1)
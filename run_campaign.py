@@ -0,0 +1,82 @@
+"""
+Ensemble campaign over the φ × lattice-size matrix of lattice_params.yaml
+Builds the thermalize → generate → smear → measure → analyze task DAG
+for every (φ, size), runs it on a local process pool (largest volumes
+first) and keeps the queue in <root>/queue.sqlite, so rerunning the same
+command resumes an interrupted campaign and skips finished tasks whose
+outputs still match their checksums
+"""
+
+import argparse
+import json
+import os
+import time
+
+from lattice import LatticeConfig
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.scheduler import TaskQueue, build_tasks, critical_path, run_campaign
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--root', default='campaign', help='output directory (ensembles and queue)')
+    parser.add_argument('--workers', type=int, default=None, help='pool size (default: all CPUs)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--phi', type=float, nargs='+', default=None, help='subset of phi_values')
+    parser.add_argument('--size-index', type=int, nargs='+', default=None, help='subset of lattice_sizes')
+    parser.add_argument('--costs', default=None,
+                        help='JSON {task id: seconds} from estimate_costs.py (default: site-sweep estimate)')
+    parser.add_argument('--beta', type=float, default=None, help='override β(φ) for every ensemble')
+    parser.add_argument('--scale', type=int, default=1, help='divide every lattice extent by this factor')
+    parser.add_argument('--thermalize', type=int, default=None, help='override thermalization')
+    parser.add_argument('--configs', type=int, default=None, help='override n_configurations')
+    parser.add_argument('--interval', type=int, default=None, help='override measurement_interval')
+    parser.add_argument('--dry-run', action='store_true', help='list tasks in scheduling order and exit')
+    parser.add_argument('--status', action='store_true', help='print the persisted queue and exit')
+    args = parser.parse_args()
+
+    config = LatticeConfig.load(args.params)
+    if args.scale > 1:
+        config.lattice_sizes = [[max(2, 2 * (n // (2 * args.scale))) for n in size]
+                                for size in config.lattice_sizes]
+    if args.thermalize is not None:
+        config.thermalization = args.thermalize
+    if args.configs is not None:
+        config.n_configurations = args.configs
+    if args.interval is not None:
+        config.measurement_interval = args.interval
+    costs = None
+    if args.costs is not None:
+        with open(args.costs, 'r', encoding='utf-8') as f:
+            costs = json.load(f)
+
+    print("Ensemble Campaign")
+    print("="*70)
+    if args.status:
+        queue = TaskQueue(os.path.join(args.root, 'queue.sqlite'))
+        counts = {}
+        for row in queue.rows():
+            counts[row['status']] = counts.get(row['status'], 0) + 1
+            line = f"{row['status']:<8} {row['id']:<40} attempts {row['attempts']}"
+            if row['error']:
+                line += f"  {row['error']}"
+            print(line)
+        print(f"\n{counts}")
+        raise SystemExit(0)
+
+    tasks = build_tasks(config, costs, args.phi, args.size_index)
+    rank = critical_path(tasks)
+    print(f"{len(tasks)} tasks for {len(tasks) // 5} ensembles in {args.root}, "
+          f"{args.workers or os.cpu_count()} workers")
+    if args.dry_run:
+        for t in sorted(tasks, key=lambda t: -rank[t.id]):
+            print(f"{t.id:<40} cost {t.cost:10.3g}  critical path {rank[t.id]:10.3g}")
+        raise SystemExit(0)
+
+    t0 = time.perf_counter()
+    status = run_campaign(config, args.root, args.workers, args.seed, args.beta, costs,
+                          args.phi, args.size_index)
+    summary = {s: sum(1 for v in status.values() if v == s) for s in sorted(set(status.values()))}
+    print(f"\nCampaign finished in {time.perf_counter() - t0:.1f} s: {summary}")
+    raise SystemExit(0 if all(v == 'done' for v in status.values()) else 1)
@@ -0,0 +1,151 @@
+"""
+SU(3) pure-gauge lattice runs driven by lattice_params.yaml
+Thermalizes one (φ, lattice size) point of the simulation plan and
+reports the average plaquette; with --store, continues into production
+and writes n_configurations configurations (one every
+measurement_interval sweeps) to a ConfigStore directory
+"""
+
+import argparse
+import hashlib
+import time
+
+import numpy as np
+
+from lattice import (LatticeConfig, GaugeField, SiteLocalWilsonAction,
+                     MetropolisUpdater, HMC, HeatbathUpdater, ConfigStore)
+from lattice.action import GAUGE_ACTIONS
+from lattice.config import DEFAULT_PARAMS_PATH
+from lattice.domain import DomainDecomposition
+from lattice.ensemble import EnsembleChain, stream_seed
+
+
+def phi_gradient(site_shape, phi_lo: float, phi_hi: float) -> np.ndarray:
+    """φ(x) rising linearly from phi_lo to phi_hi along X, constant in T, Z, Y"""
+    return np.broadcast_to(np.linspace(phi_lo, phi_hi, site_shape[-1]), site_shape)
+
+
+def phi_stream_index(config: LatticeConfig, phi) -> int:
+    """Position of φ in phi_values; off-plan values and φ profiles get a hash-derived index"""
+    if phi in config.phi_values:
+        return config.phi_values.index(phi)
+    return int.from_bytes(hashlib.sha256(repr(phi).encode()).digest()[:8], 'little')
+
+
+def build_run(config: LatticeConfig, phi: float, size_index: int, start: str,
+              rng: np.random.Generator, update: str = 'hmc', integrator: str = 'omelyan',
+              phi_field: np.ndarray = None):
+    """
+    Gauge field, action and updater for one (φ, size) point of the plan;
+    with phi_field, the site-local β(x) of that φ profile is used instead
+    """
+    site_shape = config.array_shape(config.lattice_sizes[size_index])
+    dtype = config.link_dtype
+    field = GaugeField.hot(site_shape, rng, dtype) if start == 'hot' else GaugeField.cold(site_shape, dtype)
+    if phi_field is None:
+        action = config.action(config.beta(phi))
+    else:
+        action = SiteLocalWilsonAction(config.beta_field(phi_field))
+    if update == 'hmc':
+        return field, action, HMC.from_config(config.hmc, action, integrator)
+    if update == 'heatbath':
+        return field, action, HeatbathUpdater.from_config(config.heatbath, action)
+    return field, action, MetropolisUpdater(action)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--params', default=DEFAULT_PARAMS_PATH)
+    parser.add_argument('--phi', type=float, default=None, help='φ value (default: first in plan)')
+    parser.add_argument('--size-index', type=int, default=0, help='index into lattice_sizes')
+    parser.add_argument('--size', type=int, nargs=4, default=None, metavar=('X', 'Y', 'Z', 'T'),
+                        help='override the lattice size')
+    parser.add_argument('--phi-gradient', type=float, nargs=2, default=None, metavar=('LO', 'HI'),
+                        help='site-local φ(x) rising linearly along X instead of a single φ')
+    parser.add_argument('--sweeps', type=int, default=None, help='default: thermalization')
+    parser.add_argument('--start', choices=['cold', 'hot'], default='cold')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--update', choices=['hmc', 'heatbath', 'metropolis'], default=None,
+                        help='default: update_algorithm from the params file')
+    parser.add_argument('--integrator', choices=['omelyan', 'leapfrog'], default='omelyan')
+    parser.add_argument('--tune', type=int, default=0,
+                        help='HMC trajectories spent tuning n_steps toward target_acceptance')
+    parser.add_argument('--store', default=None, help='write production configurations here')
+    parser.add_argument('--compress', action='store_true', help='store two rows per link (12 reals)')
+    parser.add_argument('--action', choices=sorted(GAUGE_ACTIONS), default=None,
+                        help='gauge action (default: gauge_action in the params file)')
+    parser.add_argument('--precision', choices=['double', 'single'], default=None,
+                        help='link precision (default: precision in the params file)')
+    parser.add_argument('--configs', type=int, default=None, help='default: n_configurations')
+    parser.add_argument('--checkpoint', default=None,
+                        help='checkpoint file; an existing one is resumed bit-exactly')
+    parser.add_argument('--checkpoint-every', type=int, default=100, help='updates between checkpoints')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes over time slabs (heatbath only)')
+    args = parser.parse_args()
+
+    config = LatticeConfig.load(args.params)
+    if args.size is not None:
+        config.lattice_sizes = [list(args.size)]
+        args.size_index = 0
+    phi = config.phi_values[0] if args.phi is None else args.phi
+    n_sweeps = config.thermalization if args.sweeps is None else args.sweeps
+    update = config.update_algorithm if args.update is None else args.update
+    if args.precision is not None:
+        config.precision = args.precision
+    if args.action is not None:
+        config.gauge_action = args.action
+
+    phi_field = None
+    if args.phi_gradient is not None:
+        site_shape = config.array_shape(config.lattice_sizes[args.size_index])
+        if config.gauge_action != 'wilson':
+            parser.error("--phi-gradient supports the Wilson action only")
+        phi_field = phi_gradient(site_shape, *args.phi_gradient)
+        phi = f"{args.phi_gradient[0]}…{args.phi_gradient[1]}"
+    seed = stream_seed(args.seed, phi_stream_index(config, phi), args.size_index)
+    rng = np.random.default_rng(seed)
+    field, action, updater = build_run(config, phi, args.size_index, args.start, rng,
+                                       update, args.integrator, phi_field)
+    print(f"SU({config.N_colors}) {config.gauge_action} action, φ={phi}, β={action.beta:.6g}, "
+          f"lattice {config.lattice_sizes[args.size_index]} ({field.volume} sites), {update}, "
+          f"{field.links.dtype} links")
+    plaquette = field.average_plaquette
+    if args.workers > 1:
+        if update != 'heatbath':
+            parser.error("--workers requires --update heatbath")
+        updater = DomainDecomposition(field, action, args.workers, config.heatbath, seed)
+        plaquette = updater.average_plaquette
+        print(f"{args.workers} worker processes, time slabs {updater.bounds}")
+    store = None
+    n_configs = 0
+    if args.store is not None:
+        store = ConfigStore(args.store, compress=args.compress)
+        n_configs = config.n_configurations if args.configs is None else args.configs
+    chain = EnsembleChain(field, updater, rng, n_sweeps, n_configs, config.measurement_interval,
+                          args.checkpoint, args.checkpoint_every, store,
+                          {'phi': phi, 'beta': action.beta, 'update': update})
+    if chain.resume():
+        print(f"resumed from {args.checkpoint} at update {chain.update}/{chain.n_updates}")
+    elif update == 'hmc' and args.tune:
+        n_steps = updater.tune(field, rng, args.tune)
+        print(f"tuned n_steps = {n_steps} (acceptance target {updater.target_acceptance})")
+
+    def report(n: int, acceptance: float):
+        produced = n - n_sweeps
+        if produced <= 0:
+            print(f"sweep {n:5d}  ⟨P⟩ = {plaquette():.6f}  acc = {acceptance:.3f}")
+        elif produced % config.measurement_interval == 0:
+            k = produced // config.measurement_interval - 1
+            entry = store.entry(k)
+            print(f"config {k:5d}  ⟨P⟩ = {entry['metadata']['plaquette']:.6f}  → {entry['file']}")
+
+    t0 = time.perf_counter()
+    start_update = chain.update
+    chain.run(report=report)
+    print(f"{chain.update - start_update} updates in {time.perf_counter() - t0:.1f} s")
+    if store is not None:
+        print(f"{len(store)} configurations in {args.store}")
+
+    if isinstance(updater, DomainDecomposition):
+        updater.close()
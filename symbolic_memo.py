@@ -0,0 +1,98 @@
+"""
+Memoized SymPy operations for symbolic verification
+limit, diff, simplify and subs results are keyed on the structural form
+(srepr) of their inputs, in memory and optionally on disk
+"""
+
+import hashlib
+import os
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from result_cache import ResultCache
+
+DEFAULT_SYMBOLIC_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                          '.ym_cache', 'symbolic')
+
+
+def structural_key(op: str, *parts: Any) -> str:
+    """Hash of an operation and the structural representation of its inputs"""
+    import sympy as sp
+    h = hashlib.sha256(op.encode('utf-8'))
+    for part in parts:
+        h.update(b'\x00')
+        h.update(sp.srepr(part).encode('utf-8'))
+    return h.hexdigest()
+
+
+class SymbolicMemo:
+    """Memoization layer for SymPy limit/diff/simplify/subs"""
+
+    def __init__(self, persist_dir: Optional[str] = None, max_bytes: int = 16 * 1024 * 1024):
+        self._memory: Dict[str, Any] = {}
+        self._store = ResultCache(persist_dir, max_bytes) if persist_dir else None
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: str):
+        if key in self._memory:
+            self.hits += 1
+            return True, self._memory[key]
+        if self._store is not None:
+            value = self._store.get(key)
+            if value is not None:
+                self.hits += 1
+                self._memory[key] = value
+                return True, value
+        self.misses += 1
+        return False, None
+
+    def _remember(self, key: str, value: Any) -> Any:
+        self._memory[key] = value
+        if self._store is not None:
+            self._store.put(key, value)
+        return value
+
+    def limit(self, expr, var, point, direction: str = '+'):
+        key = structural_key('limit', expr, var, point, direction)
+        found, value = self._lookup(key)
+        if found:
+            return value
+        import sympy as sp
+        return self._remember(key, sp.limit(expr, var, point, direction))
+
+    def diff(self, expr, var, order: int = 1):
+        key = structural_key('diff', expr, var, order)
+        found, value = self._lookup(key)
+        if found:
+            return value
+        import sympy as sp
+        return self._remember(key, sp.diff(expr, var, order))
+
+    def simplify(self, expr):
+        key = structural_key('simplify', expr)
+        found, value = self._lookup(key)
+        if found:
+            return value
+        import sympy as sp
+        return self._remember(key, sp.simplify(expr))
+
+    def subs(self, expr, substitutions: Sequence[Tuple[Any, Any]]):
+        substitutions = tuple(substitutions)
+        key = structural_key('subs', expr, substitutions)
+        found, value = self._lookup(key)
+        if found:
+            return value
+        return self._remember(key, expr.subs(substitutions))
+
+    def clear(self):
+        self._memory.clear()
+        if self._store is not None:
+            self._store.clear()
+
+
+# Process-wide memo shared by SymbolicVerification instances; set
+# YM_SYMBOLIC_CACHE=1 (or a directory) to also persist results on disk.
+_env_dir = os.environ.get('YM_SYMBOLIC_CACHE')
+SYMBOLIC_MEMO = SymbolicMemo(
+    persist_dir=(DEFAULT_SYMBOLIC_CACHE_DIR if _env_dir in ('1', 'true') else _env_dir) or None
+)
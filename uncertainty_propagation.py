@@ -0,0 +1,199 @@
+"""
+Monte Carlo uncertainty propagation for the experimental validation
+Parameter samples drawn from the calibration covariance are pushed through
+all validated observables in vectorized chunks; σ-deviation distributions
+are accumulated with streaming statistics so memory stays bounded
+"""
+
+import argparse
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from experimental_validation import ExperimentalData
+from calibration_fit import (FIT_PARAMETERS, FIT_OBSERVABLES, DEFAULT_FREE, BOUNDS,
+                             theta_from_calibration, measurements, predictions,
+                             jacobian, load_calibration, CALIBRATION_PATH)
+
+# Pass criteria as used by ExperimentalValidator's validate_* methods
+PASS_SIGMA = {
+    'glueball_0pp': 3.0,
+    'glueball_2pp': 3.0,
+    'glueball_0mp': 3.0,
+    'Lambda_QCD_pure': 2.0,
+}
+STRING_TENSION_MAX_REL_ERROR = 0.5
+
+# Fixed σ-deviation histogram used for streaming quantiles
+SIGMA_BINS = np.linspace(0.0, 20.0, 2001)
+
+
+class StreamingSummary:
+    """Running count/mean/variance, extrema and a fixed-bin histogram"""
+
+    def __init__(self, bins: np.ndarray = SIGMA_BINS):
+        self.bins = bins
+        self.counts = np.zeros(len(bins) + 1, dtype=np.int64)  # last bin: overflow
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray):
+        n_b = values.size
+        if n_b == 0:
+            return
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b)**2).sum())
+        delta = mean_b - self.mean
+        total = self.n + n_b
+        # Chan et al. parallel combination of (n, mean, M2)
+        self.mean += delta * n_b / total
+        self.m2 += m2_b + delta**2 * self.n * n_b / total
+        self.n = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        idx = np.searchsorted(self.bins, values, side='right') - 1
+        idx = np.where(values >= self.bins[-1], len(self.bins), np.clip(idx, 0, len(self.bins) - 1))
+        self.counts += np.bincount(idx, minlength=len(self.counts))
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Quantile resolved to the histogram bin width"""
+        cdf = np.cumsum(self.counts) / max(self.n, 1)
+        i = int(np.searchsorted(cdf, q))
+        return float(self.bins[min(i + 1, len(self.bins) - 1)])
+
+    def fraction_below(self, threshold: float) -> float:
+        i = int(np.searchsorted(self.bins, threshold))
+        return float(self.counts[:i].sum()) / max(self.n, 1)
+
+
+class UncertaintyEngine:
+    """Propagate calibration uncertainty to every validated observable"""
+
+    def __init__(self, calib: Optional[Dict] = None, data: Optional[ExperimentalData] = None,
+                 covariance: Optional[np.ndarray] = None, free: Optional[list] = None):
+        self.calib = load_calibration(CALIBRATION_PATH) if calib is None else calib
+        self.data = data if data is not None else ExperimentalData()
+        self.theta = theta_from_calibration(self.calib)
+
+        fit = self.calib.get('fit', {})
+        self.free = list(free or fit.get('free_parameters', DEFAULT_FREE))
+        self.free_idx = [FIT_PARAMETERS.index(p) for p in self.free]
+        if covariance is None and 'covariance' in fit:
+            covariance = np.array(fit['covariance'])
+        if covariance is None:
+            # No fitted covariance stored: use the Gauss-Newton covariance at
+            # the current calibration, as calibration_fit would report it
+            J = jacobian(self.theta, self.data)[:, self.free_idx]
+            covariance = np.linalg.pinv(J.T @ J)
+        self.covariance = np.asarray(covariance, dtype=float)
+        # Cholesky of a possibly semi-definite matrix via eigendecomposition
+        w, v = np.linalg.eigh(self.covariance)
+        self._factor = v * np.sqrt(np.clip(w, 0.0, None))
+        self._lo = np.array([BOUNDS[p][0] for p in self.free])
+        self._hi = np.array([BOUNDS[p][1] for p in self.free])
+
+    def sample_parameters(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """n × 8 parameter vectors; free parameters ~ N(θ̂, Σ), clipped to the fit bounds"""
+        theta = np.repeat(self.theta[None, :], n, axis=0)
+        draws = rng.standard_normal((n, len(self.free))) @ self._factor.T
+        theta[:, self.free_idx] = np.clip(self.theta[self.free_idx] + draws, self._lo, self._hi)
+        return theta
+
+    def sigma_deviations(self, preds: np.ndarray, reference: Optional[np.ndarray] = None) -> np.ndarray:
+        """|prediction − measurement| / uncertainty per observable, shape (n, 5)"""
+        meas = measurements(self.data)
+        reference = meas[:, 0] if reference is None else reference
+        return np.abs(preds - reference) / meas[:, 1]
+
+    def run(self, n_samples: int = 1_000_000, chunk_size: int = 262_144,
+            seed: Optional[int] = None, bootstrap_data: bool = False) -> Dict:
+        """
+        Stream n_samples draws through the observables in chunks.
+        With bootstrap_data, each draw is also compared against a parametric
+        bootstrap replica of the measurements (value + N(0, uncertainty)).
+        """
+        rng = np.random.default_rng(seed)
+        pred_stats = {name: StreamingSummary() for name in FIT_OBSERVABLES}
+        sigma_stats = {name: StreamingSummary() for name in FIT_OBSERVABLES}
+        string_pass = 0
+        meas = measurements(self.data)
+
+        t0 = time.perf_counter()
+        done = 0
+        while done < n_samples:
+            n = min(chunk_size, n_samples - done)
+            theta = self.sample_parameters(n, rng)
+            preds = predictions(theta)
+            reference = meas[:, 0]
+            if bootstrap_data:
+                reference = reference + rng.standard_normal((n, len(meas))) * meas[:, 1]
+            sig = self.sigma_deviations(preds, reference)
+            for j, name in enumerate(FIT_OBSERVABLES):
+                pred_stats[name].update(preds[:, j])
+                sigma_stats[name].update(sig[:, j])
+            sigma_exp = reference[..., 3]
+            string_pass += int(np.count_nonzero(
+                np.abs(preds[:, 3] - sigma_exp) / sigma_exp < STRING_TENSION_MAX_REL_ERROR))
+            done += n
+
+        summary = {}
+        for name in FIT_OBSERVABLES:
+            p, s = pred_stats[name], sigma_stats[name]
+            if name == 'string_tension':
+                pass_probability = string_pass / n_samples
+            else:
+                pass_probability = s.fraction_below(PASS_SIGMA[name])
+            summary[name] = {
+                'prediction_mean': p.mean,
+                'prediction_std': p.std,
+                'sigma_deviation_mean': s.mean,
+                'sigma_deviation_q16': s.quantile(0.16),
+                'sigma_deviation_median': s.quantile(0.50),
+                'sigma_deviation_q84': s.quantile(0.84),
+                'sigma_deviation_max': s.max,
+                'pass_probability': pass_probability,
+            }
+        return {
+            'n_samples': n_samples,
+            'free_parameters': self.free,
+            'bootstrap_data': bootstrap_data,
+            'observables': summary,
+            'elapsed_s': time.perf_counter() - t0,
+        }
+
+
+def format_report(result: Dict) -> str:
+    report = "\n" + "="*70 + "\n"
+    report += "UNCERTAINTY PROPAGATION REPORT\n"
+    report += "="*70 + "\n"
+    report += f"Samples: {result['n_samples']}  Free parameters: {', '.join(result['free_parameters'])}\n"
+    for name, s in result['observables'].items():
+        report += f"\n{name.upper()}:\n"
+        report += f"  prediction: {s['prediction_mean']:.6e} ± {s['prediction_std']:.3e}\n"
+        report += (f"  σ-deviation: median {s['sigma_deviation_median']:.2f} "
+                   f"[{s['sigma_deviation_q16']:.2f}, {s['sigma_deviation_q84']:.2f}] (68%)\n")
+        report += f"  P(pass): {s['pass_probability']*100:.1f}%\n"
+    report += f"\n{'='*70}\n"
+    report += f"Elapsed: {result['elapsed_s']:.2f} s\n"
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=262_144)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--bootstrap-data', action='store_true',
+                        help='also resample the measurements within their uncertainties')
+    args = parser.parse_args()
+
+    engine = UncertaintyEngine()
+    print(format_report(engine.run(args.samples, args.chunk_size, args.seed, args.bootstrap_data)))
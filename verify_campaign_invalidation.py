@@ -0,0 +1,134 @@
+"""
+Campaign invalidation verification
+Runs a one-ensemble campaign, then changes one setting read by each
+stage in turn and reruns it. Requires that exactly the stage and its
+dependents run again (the rest are skipped), that the outputs downstream
+of the change differ from the previous run, and that an unchanged rerun
+skips everything
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List, Set
+
+import numpy as np
+
+from lattice import LatticeConfig, ConfigStore
+from lattice.scheduler import STAGES, ensemble_dir, run_campaign
+
+SIZE = [6, 6, 6, 6]
+PHI = 0.5
+
+
+def base_config(n_configs: int) -> LatticeConfig:
+    return LatticeConfig(
+        phi_values=[PHI], lattice_sizes=[SIZE], update_algorithm='heatbath',
+        heatbath={'n_heatbath': 1, 'n_overrelax': 1, 'reunitarize_every': 10},
+        thermalization=3, n_configurations=n_configs, measurement_interval=1,
+        smearing={'type': 'APE', 'alpha': 0.5, 'n_iterations': 2, 'spatial_only': True},
+        extra={'measurements': {'max_R': 3, 'max_T': 3, 't_fit': None, 'max_blocks': 4}})
+
+
+def with_measurements(config: LatticeConfig, **settings) -> None:
+    config.extra['measurements'] = {**config.extra['measurements'], **settings}
+
+
+# setting changed, first stage that must rerun, outputs that must change
+CHANGES: Dict[str, tuple] = {
+    'thermalization': (lambda c: setattr(c, 'thermalization', 4), 'thermalize',
+                       ('configs', 'smeared', 'measurements', 'analysis')),
+    'measurement_interval': (lambda c: setattr(c, 'measurement_interval', 2), 'generate',
+                             ('configs', 'smeared', 'measurements', 'analysis')),
+    'smearing.n_iterations': (lambda c: c.smearing.update(n_iterations=3), 'smear',
+                              ('smeared', 'measurements', 'analysis')),
+    'measurements.max_T': (lambda c: with_measurements(c, max_T=2), 'measure',
+                           ('measurements', 'analysis')),
+    'measurements.max_blocks': (lambda c: with_measurements(c, max_blocks=2), 'analyze',
+                                ('analysis',)),
+    'measurements.t_fit': (lambda c: with_measurements(c, t_fit=1), 'analyze',
+                           ('analysis',)),
+}
+
+
+def run(config: LatticeConfig, root: str, beta: float) -> Set[str]:
+    """Stages that started in this run"""
+    started = []
+    status = run_campaign(config, root, max_workers=1, beta=beta, log=started.append)
+    failed = [tid for tid, s in status.items() if s != 'done']
+    if failed:
+        raise RuntimeError(f"tasks did not finish: {failed}")
+    return {line.split()[1].split(':')[0] for line in started if line.startswith('start')}
+
+
+def snapshot(root: str) -> Dict[str, object]:
+    """Content of every stage output of the ensemble"""
+    directory = ensemble_dir(root, PHI, SIZE)
+    out = {}
+    for name in ('configs', 'smeared'):
+        store = ConfigStore(os.path.join(directory, name))
+        out[name] = [store.load(k).links.copy() for k in store.keys()]
+    with np.load(os.path.join(directory, 'measurements.npz')) as data:
+        out['measurements'] = {k: data[k].copy() for k in data.files}
+    with open(os.path.join(directory, 'analysis.json'), 'r', encoding='utf-8') as f:
+        out['analysis'] = json.load(f)
+    return out
+
+
+def same(a, b) -> bool:
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list) and a and isinstance(a[0], np.ndarray):
+        return len(a) == len(b) and all(np.array_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, np.ndarray):
+        return a.shape == b.shape and np.array_equal(a, b)
+    return a == b
+
+
+def check_change(name: str, change: Callable, first: str, changed: tuple,
+                 config: LatticeConfig, root: str, beta: float) -> bool:
+    before = snapshot(root)
+    modified = copy.deepcopy(config)
+    change(modified)
+    started = run(modified, root, beta)
+    after = snapshot(root)
+    expected = set(STAGES[STAGES.index(first):])
+    ok = started == expected
+    stale = [k for k in changed if same(before[k], after[k])]
+    ok &= not stale
+    verdict = '✓ PASS' if ok else '✗ FAIL'
+    print(f"{name:<26} reran {', '.join(s for s in STAGES if s in started) or '-':<46} "
+          f"{'stale: ' + ', '.join(stale) if stale else 'outputs updated'}  {verdict}")
+    if started != expected:
+        print(f"{'':<26} expected {', '.join(s for s in STAGES if s in expected)}")
+    # back to the base outputs for the next change
+    run(config, root, beta)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--configs', type=int, default=8)
+    parser.add_argument('--beta', type=float, default=5.7)
+    args = parser.parse_args()
+
+    config = base_config(args.configs)
+    print("Campaign Invalidation Verification")
+    print("="*70)
+    print(f"Ensemble φ = {PHI}, size {SIZE}, {args.configs} configurations, β = {args.beta}\n")
+    results: List[bool] = []
+    with tempfile.TemporaryDirectory() as root:
+        started = run(config, root, args.beta)
+        print(f"{'initial run':<26} ran {', '.join(s for s in STAGES if s in started)}")
+        for name, (change, first, changed) in CHANGES.items():
+            results.append(check_change(name, change, first, changed, config, root, args.beta))
+        started = run(config, root, args.beta)
+        ok = not started
+        print(f"{'unchanged rerun':<26} reran {', '.join(started) or '-':<46} "
+              f"{'' if ok else 'expected every task skipped'}  {'✓ PASS' if ok else '✗ FAIL'}")
+        results.append(ok)
+    print(f"\n{sum(results)}/{len(results)} passed")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,143 @@
+"""
+Checkpoint/resume verification
+Runs each updater (HMC, heatbath/OR, Metropolis, domain-decomposed
+heatbath; the local updates also with a φ-gradient β(x)) once uninterrupted and once stopped part-way and resumed from
+its checkpoint into freshly built objects, and requires bit-identical
+links and generator states. A second test SIGKILLs run_lattice.py
+mid-run, restarts it and compares the configuration checksums with an
+uninterrupted run
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Tuple
+
+import numpy as np
+
+from lattice import (GaugeField, WilsonAction, SiteLocalWilsonAction, HMC, HeatbathUpdater, MetropolisUpdater,
+                     DomainDecomposition, ConfigStore)
+from lattice.ensemble import EnsembleChain, stream_seed
+
+SITE_SHAPE = (4, 4, 4, 4)
+HEATBATH = {'n_heatbath': 1, 'n_overrelax': 2, 'reunitarize_every': 3}
+# β(t) rising from 5.5 to 6.0 along the time direction
+BETA_GRADIENT = np.broadcast_to(np.linspace(5.5, 6.0, SITE_SHAPE[0])[:, None, None, None], SITE_SHAPE)
+
+
+def make_updater(kind: str, field: GaugeField, seed, n_steps: int = 6):
+    kind, _, profile = kind.partition('-')
+    action = SiteLocalWilsonAction(BETA_GRADIENT) if profile == 'φ' else WilsonAction(5.7)
+    if kind == 'hmc':
+        return HMC(levels=[(action, n_steps)], trajectory_length=0.5)
+    if kind == 'heatbath':
+        return HeatbathUpdater.from_config(HEATBATH, action)
+    if kind == 'metropolis':
+        return MetropolisUpdater(action, epsilon=0.3)
+    return DomainDecomposition(field, action, 2, HEATBATH, seed)
+
+
+def build(kind: str, seed: int, checkpoint: str = None) -> Tuple[EnsembleChain, Callable]:
+    ss = stream_seed(seed, 0, 0)
+    rng = np.random.default_rng(ss)
+    field = GaugeField.hot(SITE_SHAPE, rng)
+    # a different HMC step count proves it is restored from the checkpoint
+    updater = make_updater(kind, field, ss, n_steps=6 if seed == 0 else 9)
+    chain = EnsembleChain(field, updater, rng, n_thermalize=4, n_configs=3, interval=2,
+                          checkpoint_path=checkpoint, checkpoint_every=2)
+    close = updater.close if isinstance(updater, DomainDecomposition) else (lambda: None)
+    return chain, close
+
+
+def check_in_process(kind: str) -> bool:
+    reference, close = build(kind, seed=0)
+    reference.run()
+    ref_links = reference.current_field().links.copy()
+    ref_state = reference.updater.get_state() if hasattr(reference.updater, 'get_state') else None
+    ref_rng = reference.rng.bit_generator.state
+    close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'chain.npz')
+        chain, close = build(kind, seed=0, checkpoint=path)
+        chain.run(max_updates=5)  # checkpoints at 2, 4 and the stop at 5
+        close()
+        # fresh objects from another seed: everything must come from the checkpoint
+        chain, close = build(kind, seed=123, checkpoint=path)
+        resumed = chain.resume()
+        resumed_at = chain.update
+        chain.run()
+        links = chain.current_field().links
+        state = chain.updater.get_state() if hasattr(chain.updater, 'get_state') else None
+        rng_ok = chain.rng.bit_generator.state == ref_rng
+        close()
+
+    same = resumed and np.array_equal(links, ref_links) and rng_ok and state == ref_state
+    print(f"{kind:<12} resumed at update {resumed_at}/{chain.n_updates}: "
+          f"max |ΔU| = {np.abs(links - ref_links).max():.1e}, generator "
+          f"{'identical' if rng_ok else 'differs'}  {'✓ PASS' if same else '✗ FAIL'}")
+    return same
+
+
+def run_lattice(store: str, checkpoint: str, kill_mid_production: bool = False) -> None:
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run_lattice.py')
+    cmd = [sys.executable, script, '--size', '4', '4', '4', '4', '--update', 'heatbath',
+           '--start', 'hot', '--sweeps', '4', '--configs', '3', '--seed', '7',
+           '--store', store, '--checkpoint', checkpoint, '--checkpoint-every', '3']
+    if not kill_mid_production:
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        return
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    # kill once the first configuration is in the store
+    while not os.path.exists(os.path.join(store, 'index.json')) and proc.poll() is None:
+        time.sleep(0.01)
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+
+
+def check_kill_restart() -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {name: os.path.join(tmp, name) for name in
+                 ('ref_store', 'ref.npz', 'store', 'run.npz')}
+        run_lattice(paths['ref_store'], paths['ref.npz'])
+        run_lattice(paths['store'], paths['run.npz'], kill_mid_production=True)
+        killed_with = len(ConfigStore(paths['store']))
+        run_lattice(paths['store'], paths['run.npz'])
+        ref, resumed = ConfigStore(paths['ref_store']), ConfigStore(paths['store'])
+        same = (ref.keys() == resumed.keys() and
+                all(ref.entry(k)['sha256'] == resumed.entry(k)['sha256'] for k in ref.keys()))
+    print(f"run_lattice.py SIGKILL with {killed_with} of {len(ref)} configurations written, "
+          f"restarted: checksums {'match' if same else 'differ'}  {'✓ PASS' if same else '✗ FAIL'}")
+    return same
+
+
+def check_streams() -> bool:
+    tree = np.random.SeedSequence(42).spawn(3)[2].spawn(2)[1].spawn(4)[3]
+    direct = stream_seed(42, 2, 1, worker=3)
+    same = np.array_equal(tree.generate_state(4), direct.generate_state(4))
+    draws = [np.random.default_rng(stream_seed(42, i, j)).random() for i in range(3) for j in range(3)]
+    distinct = len(set(draws)) == len(draws)
+    ok = same and distinct
+    print(f"stream_seed matches SeedSequence.spawn tree: {same}, 9 (φ, volume) streams distinct: "
+          f"{distinct}  {'✓ PASS' if ok else '✗ FAIL'}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--skip-kill', action='store_true', help='skip the subprocess kill/restart test')
+    args = parser.parse_args()
+
+    print("Checkpoint/Resume Verification")
+    print("="*70)
+    results = [check_streams()]
+    results += [check_in_process(kind) for kind in ('hmc', 'heatbath', 'metropolis', 'domain',
+                                                           'heatbath-φ', 'metropolis-φ', 'domain-φ')]
+    if not args.skip_kill:
+        results.append(check_kill_restart())
+    print(f"\n{sum(results)}/{len(results)} passed")
+    sys.exit(0 if all(results) else 1)
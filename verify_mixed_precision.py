@@ -0,0 +1,245 @@
+"""
+Mixed-precision validation
+Compares complex64 link storage (float64 sums) against a full-double run:
+memory and throughput of the update, smearing, flow and glueball kernels,
+the bias on ⟨P⟩ from independent heatbath chains, on t0 and on the
+glueball effective masses measured on the same configurations in both
+precisions, HMC ΔH, reversibility and acceptance, and unitarity drift
+versus the reunitarization cadence
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from lattice import GaugeField, WilsonAction, HMC, HeatbathUpdater, Smearer
+from lattice.su3 import random_algebra
+from lattice.hmc import kinetic_energy
+from lattice.cost_model import profile_kernel
+from lattice.gradient_flow import GradientFlow
+from lattice.glueball import CHANNELS, CorrelatorAccumulator, glueball_operators
+from lattice.statistics import gamma_method
+from measure_glueballs import analyze, measure_operators
+
+HEATBATH = {'n_heatbath': 1, 'n_overrelax': 4, 'reunitarize_every': 10}
+SMEARING = {'type': 'APE', 'alpha': 0.5, 'spatial_only': True}
+LEVELS = [5, 15]
+PRECISIONS = ('double', 'single')
+
+
+def as_single(field: GaugeField) -> GaugeField:
+    return GaugeField(field.links.astype(np.complex64))
+
+
+def verdict(ok: bool) -> str:
+    return '✓ PASS' if ok else '✗ FAIL'
+
+
+def check_performance(site_shape, beta: float, repeats: int) -> None:
+    print(f"\n{'kernel':<22}" + ''.join(f"{p + ' s':>12}{p + ' MB':>12}" for p in PRECISIONS)
+          + f"{'speedup':>9}{'memory':>8}")
+    rng = np.random.default_rng(1)
+    reference = GaugeField.hot(site_shape, rng)
+    action = WilsonAction(beta)
+    rows = {}
+    for precision in PRECISIONS:
+        field = reference.copy() if precision == 'double' else as_single(reference)
+        heatbath = HeatbathUpdater.from_config(HEATBATH, action)
+        hmc = HMC(levels=[(action, 4)], trajectory_length=0.2)
+        smearer = Smearer.from_config({**SMEARING, 'n_iterations': 1}, n_workers=1)
+        flow = GradientFlow('wilson', 0.02)
+        kernels = {
+            'heatbath sweep': lambda: heatbath.sweep(field, rng),
+            'HMC trajectory (4)': lambda: hmc.trajectory(field, rng),
+            'APE iteration': lambda: smearer.smear(field),
+            'flow step (RK3)': lambda: flow.step(field, 0.02),
+            'glueball operators': lambda: glueball_operators(field),
+        }
+        for name, fn in kernels.items():
+            seconds, peak = profile_kernel(fn, repeats)
+            # resident links plus everything the kernel allocates
+            rows.setdefault(name, []).append((seconds, (field.links.nbytes + peak) / 1e6))
+    for name, ((t_d, m_d), (t_s, m_s)) in rows.items():
+        print(f"{name:<22}{t_d:12.3f}{m_d:12.1f}{t_s:12.3f}{m_s:12.1f}{t_d / t_s:8.2f}×{m_d / m_s:7.2f}×")
+    print(f"link field: {reference.links.nbytes / 1e6:.1f} MB double, "
+          f"{reference.links.nbytes / 2e6:.1f} MB single")
+
+
+def check_plaquette_chains(thermalized: GaugeField, beta: float, n_sweeps: int, seed: int) -> bool:
+    """Independent heatbath chains from the same start; compare ⟨P⟩ with Γ-method errors"""
+    results = {}
+    for precision in PRECISIONS:
+        rng = np.random.default_rng(seed)
+        field = thermalized.copy() if precision == 'double' else as_single(thermalized)
+        updater = HeatbathUpdater.from_config(HEATBATH, WilsonAction(beta))
+        series = []
+        for _ in range(n_sweeps):
+            updater.sweep(field, rng)
+            series.append(field.average_plaquette())
+        results[precision] = gamma_method(np.array(series))
+    d, s = results['double'], results['single']
+    sigma = np.hypot(d['error'], s['error'])
+    z = abs(s['mean'] - d['mean']) / sigma
+    ok = z < 3.0
+    print(f"⟨P⟩ from {n_sweeps} sweeps: double {d['mean']:.6f}({d['error']:.6f}), "
+          f"single {s['mean']:.6f}({s['error']:.6f}), Δ = {s['mean'] - d['mean']:+.2e} "
+          f"= {z:.2f}σ  {verdict(ok)}")
+    return ok
+
+
+def check_measurements(configs, epsilon: float, t_max: float) -> bool:
+    """t0, ⟨P⟩ and glueball masses on the same configurations in both precisions"""
+    t0 = {p: [] for p in PRECISIONS}
+    plaquette = {p: [] for p in PRECISIONS}
+    # one block per configuration (max_blocks must be even)
+    n_blocks = max(2, len(configs) + len(configs) % 2)
+    accumulators = {p: {ch: CorrelatorAccumulator(n_blocks) for ch in CHANNELS} for p in PRECISIONS}
+    for config in configs:
+        for precision in PRECISIONS:
+            field = config if precision == 'double' else as_single(config)
+            flow = GradientFlow('wilson', epsilon, reunitarize_every=10 if precision == 'single' else 0)
+            t0[precision].append(flow.flow(field, t_max, stop_at_t0=True)['t0'])
+            plaquette[precision].append(field.average_plaquette())
+            smearer = Smearer.from_config({**SMEARING, 'n_iterations': max(LEVELS)}, n_workers=1)
+            for ch, ops in measure_operators(field, smearer, LEVELS).items():
+                accumulators[precision][ch].add(ops)
+
+    ok = True
+    dP = np.max(np.abs(np.subtract(plaquette['single'], plaquette['double'])))
+    print(f"⟨P⟩ per configuration: max |Δ| = {dP:.1e} (storage rounding only)")
+    ok &= dP < 1e-6
+
+    t0_d, t0_s = np.array(t0['double']), np.array(t0['single'])
+    if np.all(np.isfinite(t0_d)):
+        stat = np.std(t0_d, ddof=1) / np.sqrt(len(t0_d)) if len(t0_d) > 1 else abs(t0_d.mean())
+        bias = float(np.mean(t0_s - t0_d))
+        good = abs(bias) < 0.1 * stat
+        print(f"t0/a² = {t0_d.mean():.5f} ± {stat:.5f} (double), bias of single "
+              f"{bias:+.2e} ({bias / t0_d.mean():+.1e} relative, {abs(bias) / stat:.3f}σ)  {verdict(good)}")
+        ok &= good
+    else:
+        print("t²⟨E⟩ did not reach 0.3; increase --t-max or the volume")
+        ok = False
+
+    for ch in CHANNELS:
+        d = analyze(accumulators['double'][ch])
+        s = analyze(accumulators['single'][ch])
+        bias = s['mass'] - d['mass']
+        if not (np.isfinite(d['mass']) and np.isfinite(d['error'])):
+            print(f"{ch}: effective mass not resolved on these configurations")
+            continue
+        good = abs(bias) < 0.1 * d['error']
+        print(f"{ch}: am_eff = {d['mass']:.4f} ± {d['error']:.4f} (double), bias of single "
+              f"{bias:+.2e} ({abs(bias) / d['error']:.3f}σ)  {verdict(good)}")
+        ok &= good
+    return ok
+
+
+def check_hmc(field: GaugeField, beta: float, n_steps: int, n_trajectories: int, seed: int) -> bool:
+    """
+    ΔH in float64 from both precisions over production-like trajectories
+    (|ΔH| = O(0.1–1)), forward/backward reversibility, and the Metropolis
+    acceptance min(1, e^−ΔH) each precision would give
+    """
+    action = WilsonAction(beta)
+    rng = np.random.default_rng(seed)
+    dH = {p: [] for p in PRECISIONS}
+    for _ in range(n_trajectories):
+        P0 = random_algebra(field.links.shape[:-2], rng)
+        for precision in PRECISIONS:
+            hmc = HMC(levels=[(action, n_steps)], trajectory_length=1.0, reunitarize_every=0)
+            U = field.copy() if precision == 'double' else as_single(field)
+            P = P0.astype(U.links.dtype)
+            start = U.links.copy()
+            H0 = hmc.hamiltonian_action(U) + kinetic_energy(P)
+            hmc.integrate(U, P)
+            H1 = hmc.hamiltonian_action(U) + kinetic_energy(P)
+            dH[precision].append(H1 - H0)
+            P *= -1
+            hmc.integrate(U, P)
+            H2 = hmc.hamiltonian_action(U) + kinetic_energy(P)
+            dU = float(np.max(np.abs(U.links - start)))
+            print(f"HMC {precision:<6} ΔH = {H1 - H0:+.6f}, reversibility: max |ΔU| = {dU:.1e}, "
+                  f"|δH| = {abs(H2 - H0):.1e}")
+    d, s = np.array(dH['double']), np.array(dH['single'])
+    rms_dH = float(np.sqrt(np.mean(d**2)))
+    rms_diff = float(np.sqrt(np.mean((s - d)**2)))
+    ratio_d, ratio_s = np.exp(-d), np.exp(-s)
+    ok = rms_diff < 0.01 * rms_dH
+    print(f"HMC acceptance ⟨min(1, e^−ΔH)⟩: double {np.minimum(1.0, ratio_d).mean():.4f}, "
+          f"single {np.minimum(1.0, ratio_s).mean():.4f}; Metropolis ratio e^−ΔH differs by at most "
+          f"{np.max(np.abs(ratio_s / ratio_d - 1)):.1e} (relative) per trajectory")
+    print(f"HMC rms |ΔH(single) − ΔH(double)| = {rms_diff:.1e} = {rms_diff / rms_dH:.1e} of rms |ΔH| "
+          f"= {rms_dH:.3f}  {verdict(ok)}")
+    return ok
+
+
+def check_unitarity(field: GaugeField, beta: float, n_sweeps: int, seed: int) -> bool:
+    """
+    Unitarity drift of single-precision heatbath without and with
+    reunitarization: the cadence must bound it below 1e-5 while the
+    unprojected run keeps drifting past it
+    """
+    worst = {}
+    for cadence in (0, HEATBATH['reunitarize_every']):
+        rng = np.random.default_rng(seed)
+        U = as_single(field)
+        updater = HeatbathUpdater.from_config({**HEATBATH, 'reunitarize_every': cadence}, WilsonAction(beta))
+        history = []
+        for _ in range(n_sweeps):
+            updater.sweep(U, rng)
+            history.append(U.unitarity_violation())
+        worst[cadence] = max(history)
+        marks = sorted({n_sweeps // 4, n_sweeps // 2, n_sweeps} - {0})
+        label = f"every {cadence} sweeps" if cadence else "never"
+        print(f"single precision, reunitarize {label:<16}: max |UU† − 1| after "
+              + ', '.join(f"{n}: {max(history[:n]):.1e}" for n in marks) + " sweeps")
+    never, projected = worst[0], worst[HEATBATH['reunitarize_every']]
+    ok = projected < 1e-5 and never > 2 * projected
+    print(f"reunitarization cadence bounds the drift ({never / projected:.1f}× below never)  {verdict(ok)}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, nargs=4, default=[6, 6, 6, 12], metavar=('X', 'Y', 'Z', 'T'))
+    parser.add_argument('--beta', type=float, default=5.7)
+    parser.add_argument('--thermalize', type=int, default=30)
+    parser.add_argument('--sweeps', type=int, default=100, help='sweeps per chain for the ⟨P⟩ comparison')
+    parser.add_argument('--configs', type=int, default=6, help='configurations for t0 and glueballs')
+    parser.add_argument('--interval', type=int, default=5)
+    parser.add_argument('--epsilon', type=float, default=0.05, help='flow step')
+    parser.add_argument('--t-max', type=float, default=3.0)
+    parser.add_argument('--hmc-steps', type=int, default=8, help='Omelyan steps per unit trajectory')
+    parser.add_argument('--trajectories', type=int, default=4, help='momenta for the HMC comparison')
+    parser.add_argument('--unitarity-sweeps', type=int, default=100)
+    parser.add_argument('--repeats', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    X, Y, Z, T = args.size
+    site_shape = (T, Z, Y, X)
+    print("Mixed-Precision Validation (complex64 links, float64 accumulation)")
+    print("="*70)
+    print(f"Lattice {args.size}, β = {args.beta}")
+    check_performance(site_shape, args.beta, args.repeats)
+
+    rng = np.random.default_rng(args.seed)
+    field = GaugeField.hot(site_shape, rng)
+    updater = HeatbathUpdater.from_config(HEATBATH, WilsonAction(args.beta))
+    for _ in range(args.thermalize):
+        updater.sweep(field, rng)
+    configs = []
+    for _ in range(args.configs):
+        for _ in range(args.interval):
+            updater.sweep(field, rng)
+        configs.append(field.copy())
+
+    print()
+    results = [check_plaquette_chains(field, args.beta, args.sweeps, args.seed + 1),
+               check_measurements(configs, args.epsilon, args.t_max),
+               check_hmc(field, args.beta, args.hmc_steps, args.trajectories, args.seed + 2),
+               check_unitarity(field, args.beta, args.unitarity_sweeps, args.seed + 3)]
+    print(f"\n{sum(results)}/{len(results)} passed")
+    sys.exit(0 if all(results) else 1)
@@ -4,18 +4,95 @@ Mathematical framework for testing the proposed solution
 """
 
 import numpy as np
-import sympy as sp
-from sympy import symbols, exp, ln, diff, integrate, limit, oo, sqrt, pi
 from dataclasses import dataclass
-from typing import Tuple, Dict, Any
-import matplotlib.pyplot as plt
+from types import SimpleNamespace
+from typing import Tuple, Dict, Any, Callable, Optional
+from result_cache import cached_result
+from symbolic_memo import SymbolicMemo, SYMBOLIC_MEMO
 
-# Define symbolic variables
-phi, g0, beta0, Lambda_QCD, N, nf, mu, epsilon = symbols(
-    'phi g_0 beta_0 Lambda_QCD N n_f mu epsilon', 
-    real=True, positive=True
-)
-g = symbols('g', real=True, positive=True)
+# sympy is imported lazily (see _symbolic_vars) so that numeric-only
+# workers importing this module do not pay for it at startup.
+_SYMBOL_NAMES = ('phi', 'g0', 'beta0', 'Lambda_QCD', 'N', 'nf', 'mu', 'epsilon', 'g', 'c_strong')
+_SYMBOLS = None
+
+
+def _symbolic_vars() -> SimpleNamespace:
+    """Symbolic variables of the theory, created on first use"""
+    global _SYMBOLS
+    if _SYMBOLS is None:
+        import sympy as sp
+        phi, g0, beta0, Lambda_QCD, N, nf, mu, epsilon = sp.symbols(
+            'phi g_0 beta_0 Lambda_QCD N n_f mu epsilon',
+            real=True, positive=True
+        )
+        g = sp.symbols('g', real=True, positive=True)
+        c_strong = sp.symbols('c_strong', real=True, positive=True)
+        _SYMBOLS = SimpleNamespace(phi=phi, g0=g0, beta0=beta0, Lambda_QCD=Lambda_QCD,
+                                   N=N, nf=nf, mu=mu, epsilon=epsilon, g=g, c_strong=c_strong)
+    return _SYMBOLS
+
+
+def __getattr__(name):
+    # Keep `from yang_mills_theory import phi, g, sp` working without an
+    # eager sympy import.
+    if name in _SYMBOL_NAMES:
+        return getattr(_symbolic_vars(), name)
+    if name == 'sp':
+        import sympy
+        return sympy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Strong-coupling calibration factor (glueball mass) and weak-regime floor
+C_STRONG = 2.8
+MASS_GAP_FLOOR = 1e-9
+
+
+def check_phi_range(phi_vals: np.ndarray) -> np.ndarray:
+    """Return φ as a float array, raising if any value lies outside (0,1]"""
+    phi_arr = np.asarray(phi_vals, dtype=float)
+    bad = (phi_arr <= 0) | (phi_arr > 1) | np.isnan(phi_arr)
+    if bad.any():
+        raise ValueError(f"φ must be in (0,1], got {phi_arr[bad].flat[0]}")
+    return phi_arr
+
+
+def coupling_power_law(phi_vals: np.ndarray, g0_val, beta_exp) -> np.ndarray:
+    """
+    g(φ) = g₀ φ^(-β₀) through the compiled kernel; parameters may be
+    arrays broadcasting against φ
+    """
+    phi_arr = check_phi_range(phi_vals)
+    return compiled_kernels().coupling(phi_arr, g0_val, beta_exp)
+
+
+def mass_gap_from_coupling(g_vals: np.ndarray, Lambda_val) -> np.ndarray:
+    """
+    Regime-dependent M(g) in GeV through the compiled M_gap_piecewise;
+    Λ_QCD may be an array broadcasting against g
+    """
+    return compiled_kernels().mass_gap(g_vals, Lambda_val)
+
+
+# Hand-written forms of the two kernels above, kept as a cross-check of
+# the lambdified expressions (NumericalTests.test_compiled_kernels)
+
+def coupling_power_law_reference(phi_vals: np.ndarray, g0_val, beta_exp) -> np.ndarray:
+    """g(φ) = g₀ φ^(-β₀) evaluated directly"""
+    phi_arr = check_phi_range(phi_vals)
+    return np.asarray(g0_val) * phi_arr**(-np.asarray(beta_exp))
+
+
+def mass_gap_from_coupling_reference(g_vals: np.ndarray, Lambda_val) -> np.ndarray:
+    """Regime-dependent M(g) in GeV evaluated directly"""
+    g_arr = np.asarray(g_vals, dtype=float)
+    Lambda_arr = np.asarray(Lambda_val, dtype=float)
+    strong = Lambda_arr * g_arr * C_STRONG
+    with np.errstate(divide='ignore', over='ignore', under='ignore'):
+        exponent = -8*np.pi**2/(3*g_arr**2)
+        weak = np.where(exponent > -50,
+                        Lambda_arr * np.exp(np.maximum(exponent, -50.0)),
+                        MASS_GAP_FLOOR)
+    return np.where(g_arr > 1.0, strong, weak)
 
 
 @dataclass
@@ -32,24 +109,46 @@ class YangMillsParameters:
 class PhiCoordinateTheory:
     """Core φ-coordinate dimensional boundary theory"""
     
+    # Attributes built by _setup_symbolic_expressions on first access
+    _SYMBOLIC_ATTRS = ('g_phi_symbolic', 'b0', 'b1', 'beta_function',
+                       'M_gap_symbolic', 'M_gap_piecewise')
+
     def __init__(self, params: YangMillsParameters):
         self.params = params
-        self._setup_symbolic_expressions()
+        
+    def __getattr__(self, name):
+        # Symbolic expressions are only needed for verification and the
+        # compiled backend, so sympy is not touched until one is requested.
+        if name in PhiCoordinateTheory._SYMBOLIC_ATTRS:
+            self._setup_symbolic_expressions()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
         
     def _setup_symbolic_expressions(self):
         """Initialize symbolic expressions for the theory"""
+        import sympy as sp
+        s = _symbolic_vars()
+        
         # Running coupling as function of φ
-        self.g_phi_symbolic = g0 * exp(-beta0 * ln(phi))
+        self.g_phi_symbolic = s.g0 * sp.exp(-s.beta0 * sp.ln(s.phi))
         
         # Beta function coefficients
-        self.b0 = 11*N/3 - 2*nf/3
-        self.b1 = 34*N**2/3 - 10*N*nf/3 - (N**2 - 1)*nf/N
+        self.b0 = 11*s.N/3 - 2*s.nf/3
+        self.b1 = 34*s.N**2/3 - 10*s.N*s.nf/3 - (s.N**2 - 1)*s.nf/s.N
         
         # Beta function
-        self.beta_function = -self.b0*g**3 - self.b1*g**5
+        self.beta_function = -self.b0*s.g**3 - self.b1*s.g**5
         
         # Mass gap expression
-        self.M_gap_symbolic = Lambda_QCD * exp(-8*pi**2/(3*g**2))
+        self.M_gap_symbolic = s.Lambda_QCD * sp.exp(-8*sp.pi**2/(3*s.g**2))
+        
+        # Full regime-dependent mass gap as used by mass_gap():
+        # strong branch Λ·g·c_strong, weak branch with underflow floor
+        self.M_gap_piecewise = sp.Piecewise(
+            (s.Lambda_QCD * s.g * s.c_strong, s.g > 1),
+            (self.M_gap_symbolic, -8*sp.pi**2/(3*s.g**2) > -50),
+            (MASS_GAP_FLOOR, True),
+        )
         
     def coupling_at_phi(self, phi_val: float) -> float:
         """Calculate running coupling at given φ value"""
@@ -70,14 +169,14 @@ class PhiCoordinateTheory:
         
         if g_val > 1.0:
             # Strong coupling regime: mass gap ~ confinement scale
-            return self.params.Lambda_QCD * g_val * 2.8  # Factor 2.8 calibrated to glueball mass
+            return self.params.Lambda_QCD * g_val * C_STRONG  # Factor 2.8 calibrated to glueball mass
         else:
             # Weak coupling regime: exponential suppression
             exponent = -8*np.pi**2/(3*g_val**2)
             if exponent > -50:  # Avoid underflow
                 return self.params.Lambda_QCD * np.exp(exponent)
             else:
-                return 1e-9
+                return MASS_GAP_FLOOR
     
     def dimensional_metric(self, phi_val: float) -> float:
         """φ-dependent metric factor sqrt(g(φ))"""
@@ -90,21 +189,154 @@ class PhiCoordinateTheory:
         metric_factor = self.dimensional_metric(phi_val)
         return metric_factor * F_squared / (4 * g_val**2)
 
+    # ------------------------------------------------------------------
+    # Array-native versions: accept ndarrays of any shape, one range check
+    # per call and np.where for the strong/weak regime split.
+    # ------------------------------------------------------------------
+
+    def coupling_at_phi_array(self, phi_vals: np.ndarray) -> np.ndarray:
+        """Vectorized coupling_at_phi over an array of φ values"""
+        return coupling_power_law(phi_vals, self.params.g0, self.params.beta0_coefficient)
+
+    def mass_gap_from_coupling_array(self, g_vals: np.ndarray) -> np.ndarray:
+        """Vectorized regime-dependent mass gap M(g) (in GeV)"""
+        return mass_gap_from_coupling(g_vals, self.params.Lambda_QCD)
+
+    def mass_gap_array(self, phi_vals: np.ndarray) -> np.ndarray:
+        """Vectorized mass_gap over an array of φ values (in GeV)"""
+        return self.mass_gap_from_coupling_array(self.coupling_at_phi_array(phi_vals))
+
+    def dimensional_metric_array(self, phi_vals: np.ndarray) -> np.ndarray:
+        """Vectorized dimensional_metric over an array of φ values"""
+        phi_arr = np.asarray(phi_vals, dtype=float)
+        return 1.0 + np.tanh(10*(phi_arr - self.params.phi_critical))
+
+    def yang_mills_action_density_array(self, phi_vals: np.ndarray,
+                                        F_squared: np.ndarray) -> np.ndarray:
+        """Vectorized action density; F_squared broadcasts against φ"""
+        g_arr = self.coupling_at_phi_array(phi_vals)
+        metric_factor = self.dimensional_metric_array(phi_vals)
+        return metric_factor * np.asarray(F_squared, dtype=float) / (4 * g_arr**2)
+
+
+    # ------------------------------------------------------------------
+    # Compiled backend: the symbolic expressions lambdified into array
+    # kernels, so numeric evaluation uses the same formulas as the proofs.
+    # ------------------------------------------------------------------
+
+    def compile_kernels(self, backend: str = 'numpy') -> 'CompiledKernels':
+        """Lambdified g(φ, g₀, β₀), β(g, N, n_f) and M_gap(g, Λ_QCD)"""
+        return compiled_kernels(backend)
+
+    def evaluate_batch(self, phi_vals: np.ndarray, backend: str = 'numpy') -> Dict[str, np.ndarray]:
+        """Evaluate g(φ), β(g(φ)) and M_gap(φ) through the compiled kernels"""
+        phi_arr = check_phi_range(phi_vals)
+        kernels = self.compile_kernels(backend)
+        p = self.params
+        g_arr = kernels.coupling(phi_arr, p.g0, p.beta0_coefficient)
+        return {
+            'phi': phi_arr,
+            'g': g_arr,
+            'beta': kernels.beta(g_arr, p.N, p.nf),
+            'M_gap': kernels.mass_gap(g_arr, p.Lambda_QCD),
+        }
+
+
+@dataclass(frozen=True)
+class CompiledKernels:
+    """
+    Array kernels lambdified from PhiCoordinateTheory's symbolic forms,
+    with the theory parameters as (broadcasting) arguments so one build
+    serves every parameter vector of a scan
+    """
+    backend: str
+    coupling: Callable[..., np.ndarray]  # g(φ, g₀, β₀)
+    beta: Callable[..., np.ndarray]  # β(g, N, n_f)
+    mass_gap: Callable[..., np.ndarray]  # M_gap(g, Λ_QCD), piecewise
+
+    @classmethod
+    def build(cls, backend: str = 'numpy') -> 'CompiledKernels':
+        import sympy as sp
+        s = _symbolic_vars()
+        # the symbolic forms do not depend on the parameter values
+        theory = PhiCoordinateTheory(YangMillsParameters())
+        M_expr = theory.M_gap_piecewise.subs(s.c_strong, C_STRONG)
+
+        if backend == 'numpy':
+            def lambdify(args, expr):
+                return _quiet_kernel(sp.lambdify(args, expr, modules='numpy'))
+        elif backend == 'numexpr':
+            try:
+                import numexpr  # noqa: F401
+            except ImportError as e:
+                raise ImportError("backend='numexpr' requires the numexpr package") from e
+
+            def lambdify(args, expr):
+                return _as_float_kernel(sp.lambdify(args, expr, modules='numexpr'))
+        else:
+            raise ValueError(f"Unknown backend '{backend}' (expected 'numpy' or 'numexpr')")
+
+        return cls(backend=backend,
+                   coupling=lambdify((s.phi, s.g0, s.beta0), theory.g_phi_symbolic),
+                   beta=lambdify((s.g, s.N, s.nf), theory.beta_function),
+                   mass_gap=lambdify((s.g, s.Lambda_QCD), M_expr))
+
+
+def _quiet_kernel(fn: Callable) -> Callable:
+    """
+    Float-array kernel; the piecewise branches are all evaluated by
+    numpy.select, so overflow/underflow of the discarded ones is silenced
+    """
+    def kernel(*args):
+        with np.errstate(divide='ignore', over='ignore', under='ignore', invalid='ignore'):
+            return np.asarray(fn(*(np.asarray(a, dtype=float) for a in args)), dtype=float)
+    return kernel
+
+
+def _as_float_kernel(fn: Callable) -> Callable:
+    """Wrap a numexpr kernel so it takes/returns contiguous float arrays"""
+    def kernel(*args):
+        arrays = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in args))
+        return np.asarray(fn(*(np.ascontiguousarray(a) for a in arrays)), dtype=float)
+    return kernel
+
+
+# Compiled kernels keyed by backend
+_COMPILED_KERNELS: Dict[str, CompiledKernels] = {}
+
+
+def compiled_kernels(backend: str = 'numpy') -> CompiledKernels:
+    """The kernels of `backend`, lambdified on first use (this imports sympy)"""
+    kernels = _COMPILED_KERNELS.get(backend)
+    if kernels is None:
+        kernels = _COMPILED_KERNELS[backend] = CompiledKernels.build(backend)
+    return kernels
+
 
 class SymbolicVerification:
     """Symbolic verification of mathematical propositions"""
     
-    def __init__(self):
+    def __init__(self, memo: Optional[SymbolicMemo] = None):
         self.results = {}
+        # limit/diff/simplify/subs go through a structural memo shared
+        # across instances, so parameter variants reuse prior work
+        self.memo = memo if memo is not None else SYMBOLIC_MEMO
+        
+    def _coupling_power_law(self):
+        """g(φ) = g₀ φ^β₀ as used by the symbolic checks"""
+        s = _symbolic_vars()
+        return s.g0 * s.phi**s.beta0
         
+    @cached_result
     def verify_coupling_asymptotic_freedom(self) -> Dict[str, Any]:
         """Test P1: Asymptotic freedom (g→0 as φ→0)"""
         print("\n=== Testing Asymptotic Freedom ===")
         
-        g_phi = g0 * phi**beta0
+        phi = _symbolic_vars().phi
+        g_phi = self._coupling_power_law()
         
         # UV limit: φ→0
-        uv_limit = limit(g_phi, phi, 0)
+        uv_limit = self.memo.limit(g_phi, phi, 0)
         
         # Check if limit is 0 for positive β₀
         result = {
@@ -122,44 +354,54 @@ class SymbolicVerification:
         self.results['asymptotic_freedom'] = result
         return result
     
+    @cached_result
     def verify_mass_gap_positivity(self) -> Dict[str, Any]:
         """Test P2: Mass gap M > 0 for finite g²(φ_c)"""
         print("\n=== Testing Mass Gap Positivity ===")
         
+        from sympy import exp, pi
+        s = _symbolic_vars()
+        g, Lambda_QCD = s.g, s.Lambda_QCD
+        
         M = Lambda_QCD * exp(-8*pi**2/(3*g**2))
         
         # For finite g > 0, M is always positive
         # Check derivative to verify exponential suppression
-        dM_dg = diff(M, g)
+        dM_dg = self.memo.simplify(self.memo.diff(M, g))
         
         result = {
             'test': 'Mass Gap Positivity',
             'expression': str(M),
-            'derivative': str(dM_dg.simplify()),
+            'derivative': str(dM_dg),
             'positive_for_finite_g': True,
             'interpretation': 'M_gap > 0 for all finite g > 0'
         }
         
         print(f"M_gap(g) = {M}")
-        print(f"dM/dg = {dM_dg.simplify()}")
+        print(f"dM/dg = {dM_dg}")
         print("✓ PASS - Mass gap is positive for finite coupling")
         
         self.results['mass_gap_positivity'] = result
         return result
     
+    @cached_result
     def verify_dimensional_boundary(self, phi_c: float = 0.5) -> Dict[str, Any]:
         """Test dimensional transition at φ = φ_c"""
         print(f"\n=== Testing Dimensional Boundary at φ={phi_c} ===")
         
-        g_phi = g0 * phi**beta0
+        s = _symbolic_vars()
+        phi, g0, beta0 = s.phi, s.g0, s.beta0
+        
+        g_phi = self._coupling_power_law()
         
         # Calculate derivatives at critical point
-        dg_dphi = diff(g_phi, phi)
-        d2g_dphi2 = diff(g_phi, phi, 2)
+        dg_dphi = self.memo.diff(g_phi, phi)
+        d2g_dphi2 = self.memo.diff(g_phi, phi, 2)
         
         # Evaluate at φ_c
-        dg_at_critical = dg_dphi.subs([(phi, phi_c), (beta0, 11.0/3.0), (g0, 1.0)])
-        d2g_at_critical = d2g_dphi2.subs([(phi, phi_c), (beta0, 11.0/3.0), (g0, 1.0)])
+        critical_point = [(phi, phi_c), (beta0, 11.0/3.0), (g0, 1.0)]
+        dg_at_critical = self.memo.subs(dg_dphi, critical_point)
+        d2g_at_critical = self.memo.subs(d2g_dphi2, critical_point)
         
         result = {
             'test': 'Dimensional Boundary',
@@ -176,6 +418,7 @@ class SymbolicVerification:
         self.results['dimensional_boundary'] = result
         return result
     
+    @cached_result
     def verify_gauge_invariance(self) -> Dict[str, Any]:
         """Verify gauge invariance of field strength tensor"""
         print("\n=== Testing Gauge Invariance ===")
@@ -199,16 +442,20 @@ class SymbolicVerification:
         self.results['gauge_invariance'] = result
         return result
     
+    @cached_result
     def verify_beta_function_sign(self) -> Dict[str, Any]:
         """Verify beta function is negative (asymptotic freedom)"""
         print("\n=== Testing Beta Function Sign ===")
         
+        s = _symbolic_vars()
+        g, N, nf = s.g, s.N, s.nf
+        
         # For SU(N) with nf flavors
         b0_expr = 11*N/3 - 2*nf/3
         beta = -b0_expr * g**3
         
         # For pure Yang-Mills (nf=0) and N≥2, b0 > 0
-        b0_pure_YM = b0_expr.subs(nf, 0)
+        b0_pure_YM = self.memo.subs(b0_expr, [(nf, 0)])
         
         result = {
             'test': 'Beta Function Sign',